@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Actualización Incremental de ET₀ y Balance Hídrico por Estación
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Las estaciones reportan a diario: en lugar de recalcular toda la historia,
+cada actualización recibe solo los días nuevos, calcula su ET₀ y continúa
+el balance hídrico desde el agotamiento del último día procesado. ET₀ y
+balance se agregan al almacén (AlmacenResultados) y el estado de la
+estación (última fecha, z, lat, agotamiento y parámetros del balance)
+queda en su tabla estado. El resultado es el mismo que recalcular todo el
+registro de una vez.
+
+Ningún método de METODOS_ET usa días anteriores (ventanas móviles): la ET₀
+de cada día depende solo de sus entradas, y lo único que pasa de un día al
+siguiente es el agotamiento del balance.
+
+El estado se guarda después de los resultados: si una actualización se
+interrumpe, la siguiente vuelve a calcular esos días (las inserciones en
+el almacén reemplazan las filas con la misma clave).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from balance_hidrico import balance_de_registro, validar_parametros_balance
+from control_calidad import depurar
+from ingesta import TAMANO_BLOQUE_DEFECTO, escalares_del_bloque, leer_por_bloques
+from metodos_et import METODOS_ET
+from metricas import medir
+from motor_et0 import VARIABLES_ESCALARES, VARIABLES_SERIE, calcular_et0_serie
+
+
+class ActualizadorIncremental:
+    """Agrega días nuevos a las estaciones de un almacén
+
+    metodos: métodos de ET₀ (todos por defecto). balance (opcional):
+    {metodo, kc, humedad_actual, humedad_cc, humedad_pmp, humedad_riego,
+    profundidad_radicular y opcionalmente regar y precipitacion}, como en
+    calculadora_cli; humedad_actual es la del primer día de cada estación.
+    kc puede ser una curva diaria (serie con índice de fechas) que cubra los
+    días que se agreguen; una columna kc de los días nuevos tiene prioridad.
+    backend, metricas y control_calidad se usan como en procesar_archivo.
+    """
+    
+    def __init__(self, almacen, metodos=None, balance=None, backend="auto", control_calidad="enmascarar",
+                 metricas=None):
+        self.almacen = almacen
+        self.metodos = list(metodos) if metodos is not None else list(METODOS_ET)
+        self.balance = dict(balance) if balance is not None else None
+        self.backend = backend
+        self.control_calidad = control_calidad
+        self.metricas = metricas
+        self.curva_kc = None
+        if self.balance is not None:
+            if self.balance["metodo"] not in self.metodos:
+                raise ValueError(f"El método del balance ({self.balance['metodo']}) no está entre los métodos a calcular")
+            mensajes = validar_parametros_balance(self.balance)
+            if mensajes:
+                raise ValueError(mensajes[0])
+            if isinstance(self.balance["kc"], pd.Series):
+                # La curva no cabe en el estado (JSON): ahí solo queda que el Kc es diario
+                self.curva_kc = self.balance["kc"]
+                self.balance["kc"] = "curva"
+    
+    def estado(self, estacion):
+        """Estado guardado de una estación (None si nunca se ha actualizado)"""
+        return self.almacen.leer_estado(estacion)
+    
+    def reiniciar(self, estacion):
+        """Borrar resultados y estado de una estación (la próxima actualización parte de cero)"""
+        self.almacen.borrar(estacion)
+    
+    def agregar(self, estacion, nuevos, z=None, lat=None, informe_calidad=None):
+        """Procesar los días nuevos de una estación
+
+        nuevos: DataFrame con índice de fechas y columnas de VARIABLES_SERIE
+        (y opcionalmente precipitacion). Los días hasta la última fecha ya
+        procesada se ignoran. z y lat, si no se dan, se toman del estado.
+
+        Retorna (resultados, balance, errores): ET₀ de los días nuevos (un
+        DataFrame como el de calcular_et0_serie), su balance (DataFrame con
+        COLUMNAS_BALANCE, o None sin balance) y los errores por método.
+        """
+        if not isinstance(nuevos.index, pd.DatetimeIndex):
+            raise ValueError("Los días nuevos deben tener índice de fechas")
+        nuevos = nuevos.sort_index()
+        if nuevos.index.has_duplicates:
+            raise ValueError(f"Fechas repetidas en los días nuevos de {estacion}")
+        
+        estado = self.estado(estacion)
+        agotamiento = None
+        if estado is not None:
+            if estado["parametros_balance"] != self.balance:
+                raise ValueError(f"El balance de {estacion} se calculó con otros parámetros; "
+                                 "use reiniciar() y procese de nuevo el registro completo")
+            nuevos = nuevos[nuevos.index > estado["ultima_fecha"]]
+            z = estado["z"] if z is None else z
+            lat = estado["lat"] if lat is None else lat
+            agotamiento = estado["agotamiento"]
+        if nuevos.empty:
+            return pd.DataFrame(index=nuevos.index), None, {}
+        
+        datos = nuevos[[col for col in VARIABLES_SERIE if col in nuevos]]
+        lat_calculo = lat
+        if self.control_calidad is not None:
+            with medir(self.metricas, "validacion", None, len(datos)):
+                datos, lat_calculo = depurar(datos, lat, self.control_calidad, informe_calidad)
+        resultados, errores = calcular_et0_serie(datos, z, lat_calculo, self.metodos, backend=self.backend,
+                                                 metricas=self.metricas)
+        self.almacen.guardar_et0(estacion, resultados.index, resultados)
+        
+        tabla_balance = None
+        if self.balance is not None:
+            metodo = self.balance["metodo"]
+            et0 = resultados[metodo] if metodo in resultados else pd.Series(np.nan, index=nuevos.index)
+            precipitacion = nuevos.get("precipitacion", self.balance.get("precipitacion", 0.0))
+            kc = nuevos.get("kc", self.curva_kc)
+            if kc is None and self.balance["kc"] == "curva":
+                raise ValueError(f"Los días nuevos de {estacion} no traen columna kc y no hay curva de Kc")
+            columnas, agotamiento = balance_de_registro(et0, precipitacion, self.balance, agotamiento, kc=kc)
+            self.almacen.guardar_balance(estacion, metodo, nuevos.index, columnas)
+            tabla_balance = pd.DataFrame(columnas, index=nuevos.index)
+        
+        self.almacen.guardar_estado(estacion, {
+            "ultima_fecha": nuevos.index[-1], "z": z, "lat": lat,
+            "metodo_balance": self.balance["metodo"] if self.balance is not None else None,
+            "agotamiento": agotamiento, "parametros_balance": self.balance,
+        })
+        return resultados, tabla_balance, errores
+
+
+def actualizar_archivo(ruta, actualizador, estacion=None, z=None, lat=None, tamano_bloque=TAMANO_BLOQUE_DEFECTO,
+                       mapeo=None, informe_calidad=None):
+    """Agregar los días nuevos de un archivo de estación, bloque a bloque
+
+    El archivo puede traer toda la historia o solo los días recientes; solo
+    se calculan las fechas posteriores al estado de la estación (estacion
+    es por defecto el nombre del archivo sin extensión). Genera (bloque,
+    resultados, balance, errores) por cada bloque con días nuevos, con el
+    bloque sin z ni lat como en procesar_archivo.
+    """
+    if estacion is None:
+        estacion = os.path.splitext(os.path.basename(ruta))[0]
+    for bloque in leer_por_bloques(ruta, tamano_bloque, mapeo):
+        if bloque.index.name != "fecha":
+            raise ValueError(f"{ruta} no tiene columna de fechas (necesaria en modo incremental)")
+        bloque = bloque.sort_index()
+        estado = actualizador.estado(estacion)
+        if estado is not None:
+            bloque = bloque[bloque.index > estado["ultima_fecha"]]
+            if bloque.empty:
+                continue
+        z_bloque, lat_bloque = escalares_del_bloque(bloque, z, lat)
+        resultados, balance, errores = actualizador.agregar(estacion, bloque, z_bloque, lat_bloque, informe_calidad)
+        yield bloque.drop(columns=[col for col in VARIABLES_ESCALARES if col in bloque]), resultados, balance, errores
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacén Persistente de Resultados (SQLite)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Guarda ET₀ y balance hídrico por estación, método y fecha en un archivo
+SQLite local. Cada tabla tiene clave primaria (estacion, metodo_id, fecha)
+sin rowid, de modo que la clave es también el índice agrupado: las
+consultas por estación y método, o por rango de fechas, leen solo las filas
+pedidas. Las inserciones van en bloque (executemany en una transacción) y
+reemplazan lo que ya existía con la misma clave.
+
+Las fechas se guardan como texto ISO (AAAA-MM-DD). Los NaN se guardan como
+NULL y cuentan como fechas ya calculadas.
+
+La tabla estado guarda, por estación, lo necesario para continuar una
+serie en modo incremental (ver actualizacion_incremental): última fecha
+procesada, z, lat y el agotamiento del suelo al final de ese día.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+RUTA_DEFECTO = os.path.join(os.path.expanduser("~"), ".pyet_suite", "resultados.sqlite")
+
+# Columnas de la tabla de balance (todas opcionales al guardar)
+COLUMNAS_BALANCE = ["et0", "kc", "etc", "precipitacion", "riego", "percolacion", "agotamiento", "humedad"]
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS et0 (
+    estacion TEXT NOT NULL,
+    metodo_id TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    et0 REAL,
+    PRIMARY KEY (estacion, metodo_id, fecha)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS balance (
+    estacion TEXT NOT NULL,
+    metodo_id TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    {", ".join(f"{columna} REAL" for columna in COLUMNAS_BALANCE)},
+    PRIMARY KEY (estacion, metodo_id, fecha)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS estado (
+    estacion TEXT PRIMARY KEY,
+    ultima_fecha TEXT NOT NULL,
+    z REAL,
+    lat REAL,
+    metodo_balance TEXT,
+    agotamiento REAL,
+    parametros_balance TEXT
+) WITHOUT ROWID;
+"""
+
+# Campos del estado incremental de una estación (columnas de la tabla estado)
+CAMPOS_ESTADO = ["ultima_fecha", "z", "lat", "metodo_balance", "agotamiento", "parametros_balance"]
+
+
+def fechas_iso(fechas):
+    """Fechas (DatetimeIndex, datetime64 o texto) como lista de textos AAAA-MM-DD"""
+    return np.datetime_as_string(np.asarray(pd.DatetimeIndex(fechas).values, dtype="datetime64[D]")).tolist()
+
+
+def _valores_sql(valores):
+    """Arreglo float como lista de Python con None en lugar de NaN"""
+    valores = np.asarray(valores, dtype=float)
+    if np.isnan(valores).any():
+        return np.where(np.isnan(valores), None, valores).tolist()
+    return valores.tolist()
+
+
+class AlmacenResultados:
+    """Resultados de ET₀ y balance hídrico en SQLite (seguro entre hilos)"""
+    
+    def __init__(self, ruta=RUTA_DEFECTO):
+        self.ruta = str(ruta)
+        if self.ruta != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        self._conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        self._candado = threading.Lock()
+        with self._candado, self._conexion:
+            # WAL: las consultas no esperan a que termine una corrida por lotes
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(_ESQUEMA)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+    
+    def cerrar(self):
+        with self._candado:
+            self._conexion.close()
+    
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    
+    def guardar_et0(self, estacion, fechas, resultados):
+        """Guardar ET₀ de varios métodos: resultados es {metodo_id: arreglo} o un DataFrame
+
+        Retorna el número de filas (fecha × método) escritas.
+        """
+        fechas = fechas_iso(fechas)
+        filas = 0
+        with self._candado, self._conexion:
+            for metodo_id in resultados:
+                valores = _valores_sql(resultados[metodo_id])
+                self._conexion.executemany(
+                    "INSERT OR REPLACE INTO et0 (estacion, metodo_id, fecha, et0) VALUES (?, ?, ?, ?)",
+                    zip(repeat(estacion), repeat(metodo_id), fechas, valores))
+                filas += len(valores)
+        return filas
+    
+    def guardar_balance(self, estacion, metodo_id, fechas, columnas):
+        """Guardar el balance hídrico diario de una estación: columnas es {nombre: arreglo}
+
+        Los nombres deben estar en COLUMNAS_BALANCE; las que falten quedan NULL.
+        """
+        desconocidas = set(columnas) - set(COLUMNAS_BALANCE)
+        if desconocidas:
+            raise ValueError(f"Columnas de balance desconocidas: {sorted(desconocidas)}. Use {COLUMNAS_BALANCE}")
+        fechas = fechas_iso(fechas)
+        nombres = list(columnas)
+        valores = [_valores_sql(np.broadcast_to(columnas[nombre], (len(fechas),))) for nombre in nombres]
+        with self._candado, self._conexion:
+            self._conexion.executemany(
+                f"INSERT OR REPLACE INTO balance (estacion, metodo_id, fecha, {', '.join(nombres)}) "
+                f"VALUES (?, ?, ?{', ?' * len(nombres)})",
+                zip(repeat(estacion), repeat(metodo_id), fechas, *valores))
+        return len(fechas)
+    
+    def guardar_estado(self, estacion, estado):
+        """Guardar (reemplazar) el estado incremental de una estación
+
+        estado: {ultima_fecha, z, lat, metodo_balance, agotamiento,
+        parametros_balance (dict)}; los que falten quedan NULL.
+        """
+        fila = dict.fromkeys(CAMPOS_ESTADO)
+        fila.update(estado)
+        fila["ultima_fecha"] = fechas_iso([fila["ultima_fecha"]])[0]
+        if fila["parametros_balance"] is not None:
+            fila["parametros_balance"] = json.dumps(fila["parametros_balance"], sort_keys=True)
+        with self._candado, self._conexion:
+            self._conexion.execute(
+                f"INSERT OR REPLACE INTO estado (estacion, {', '.join(CAMPOS_ESTADO)}) "
+                f"VALUES (?{', ?' * len(CAMPOS_ESTADO)})",
+                [estacion] + [fila[campo] for campo in CAMPOS_ESTADO])
+    
+    def borrar(self, estacion, metodos=None):
+        """Borrar los resultados de una estación (todos o solo de algunos métodos)
+
+        Sin metodos también se borra su estado incremental.
+        """
+        with self._candado, self._conexion:
+            if metodos is None:
+                self._conexion.execute("DELETE FROM estado WHERE estacion = ?", (estacion,))
+            for tabla in ("et0", "balance"):
+                if metodos is None:
+                    self._conexion.execute(f"DELETE FROM {tabla} WHERE estacion = ?", (estacion,))
+                else:
+                    self._conexion.executemany(f"DELETE FROM {tabla} WHERE estacion = ? AND metodo_id = ?",
+                                               zip(repeat(estacion), metodos))
+    
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    
+    def _filas(self, consulta, parametros):
+        with self._candado:
+            return self._conexion.execute(consulta, parametros).fetchall()
+    
+    @staticmethod
+    def _filtro(estacion, metodos, desde, hasta):
+        condiciones, parametros = [], []
+        if estacion is not None:
+            condiciones.append("estacion = ?")
+            parametros.append(estacion)
+        if metodos is not None:
+            metodos = list(metodos)
+            condiciones.append(f"metodo_id IN ({', '.join('?' * len(metodos))})")
+            parametros.extend(metodos)
+        if desde is not None:
+            condiciones.append("fecha >= ?")
+            parametros.append(fechas_iso([desde])[0])
+        if hasta is not None:
+            condiciones.append("fecha <= ?")
+            parametros.append(fechas_iso([hasta])[0])
+        return (" WHERE " + " AND ".join(condiciones)) if condiciones else "", parametros
+    
+    def leer_estado(self, estacion):
+        """Estado incremental de una estación (dict con CAMPOS_ESTADO) o None"""
+        filas = self._filas(f"SELECT {', '.join(CAMPOS_ESTADO)} FROM estado WHERE estacion = ?", (estacion,))
+        if not filas:
+            return None
+        estado = dict(zip(CAMPOS_ESTADO, filas[0]))
+        estado["ultima_fecha"] = pd.Timestamp(estado["ultima_fecha"])
+        if estado["parametros_balance"] is not None:
+            estado["parametros_balance"] = json.loads(estado["parametros_balance"])
+        return estado
+    
+    def estaciones(self):
+        """Estaciones con ET₀ guardada"""
+        return [fila[0] for fila in self._filas("SELECT DISTINCT estacion FROM et0 ORDER BY estacion", ())]
+    
+    def consultar_et0(self, estacion, metodos=None, desde=None, hasta=None):
+        """ET₀ guardada de una estación: DataFrame con índice fecha y una columna por método"""
+        filtro, parametros = self._filtro(estacion, metodos, desde, hasta)
+        filas = self._filas(f"SELECT fecha, metodo_id, et0 FROM et0{filtro}", parametros)
+        tabla = pd.DataFrame(filas, columns=["fecha", "metodo_id", "et0"], dtype=object)
+        tabla = tabla.pivot(index="fecha", columns="metodo_id", values="et0").astype(float)
+        tabla.index = pd.DatetimeIndex(tabla.index, name="fecha")
+        tabla.columns.name = None
+        if metodos is not None:
+            tabla = tabla.reindex(columns=list(metodos))
+        return tabla.sort_index()
+    
+    def consultar_balance(self, estacion, metodo_id=None, desde=None, hasta=None):
+        """Balance guardado de una estación: DataFrame con metodo_id, fecha y COLUMNAS_BALANCE"""
+        filtro, parametros = self._filtro(estacion, None if metodo_id is None else [metodo_id], desde, hasta)
+        filas = self._filas(f"SELECT metodo_id, fecha, {', '.join(COLUMNAS_BALANCE)} FROM balance{filtro} "
+                            "ORDER BY metodo_id, fecha", parametros)
+        tabla = pd.DataFrame(filas, columns=["metodo_id", "fecha"] + COLUMNAS_BALANCE)
+        tabla["fecha"] = pd.to_datetime(tabla["fecha"])
+        tabla[COLUMNAS_BALANCE] = tabla[COLUMNAS_BALANCE].astype(float)
+        return tabla
+    
+    def rangos_guardados(self, estacion, metodo_id):
+        """Rangos continuos de días con ET₀ guardada: lista de (inicio, fin) como Timestamp"""
+        fechas = pd.DatetimeIndex([fila[0] for fila in self._filas(
+            "SELECT fecha FROM et0 WHERE estacion = ? AND metodo_id = ? ORDER BY fecha", (estacion, metodo_id))])
+        if len(fechas) == 0:
+            return []
+        cortes = np.flatnonzero(np.diff(fechas.values) != np.timedelta64(1, "D")) + 1
+        return [(tramo[0], tramo[-1]) for tramo in np.split(fechas, cortes)]
+    
+    def pendientes_por_metodo(self, estacion, metodos, fechas):
+        """{metodo_id: máscara booleana de las fechas sin ET₀ guardada para ese método}"""
+        fechas = fechas_iso(fechas)
+        pendientes = {}
+        for metodo_id in metodos:
+            guardadas = self._filas("SELECT fecha FROM et0 WHERE estacion = ? AND metodo_id = ? "
+                                    "AND fecha BETWEEN ? AND ?",
+                                    (estacion, metodo_id, min(fechas), max(fechas))) if fechas else []
+            pendientes[metodo_id] = ~np.isin(fechas, [fila[0] for fila in guardadas])
+        return pendientes
+    
+    def fechas_pendientes(self, estacion, metodos, fechas):
+        """Máscara booleana de las fechas a las que les falta ET₀ de algún método"""
+        pendientes = np.zeros(len(fechas), dtype=bool)
+        for mascara in self.pendientes_por_metodo(estacion, metodos, fechas).values():
+            pendientes |= mascara
+        return pendientes
+    
+    def iterar_et0(self, estacion=None, metodos=None, desde=None, hasta=None, filas_bloque=10_000):
+        """Recorrer la ET₀ guardada en bloques {estacion, metodo_id, fecha, et0} de arreglos"""
+        filtro, parametros = self._filtro(estacion, metodos, desde, hasta)
+        with self._candado:
+            cursor = self._conexion.execute(f"SELECT estacion, metodo_id, fecha, et0 FROM et0{filtro} "
+                                            "ORDER BY estacion, metodo_id, fecha", parametros)
+        while True:
+            # Un bloque por vez y sin retener el candado entre bloques
+            with self._candado:
+                filas = cursor.fetchmany(filas_bloque)
+            if not filas:
+                return
+            estaciones, metodos_bloque, fechas, valores = zip(*filas)
+            yield {
+                "estacion": list(estaciones),
+                "metodo_id": list(metodos_bloque),
+                "fecha": np.array(fechas, dtype="datetime64[D]"),
+                "et0": np.array(valores, dtype=float),
+            }
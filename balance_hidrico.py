@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Balance Hídrico Diario del Suelo por Temporada (modelo de cubeta)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Simula el agotamiento de la zona radicular día a día (FAO-56, capítulo 8)
+para muchos campos a la vez. Cada campo tiene sus propias humedades
+(actual, capacidad de campo, PMP, umbral de riego) y profundidad radicular;
+ET₀, Kc y precipitación pueden ser una serie común (días,) o una por campo
+(campos, días). El bucle recorre los días, y cada paso opera sobre todos
+los campos con operaciones vectorizadas en arreglos preasignados.
+
+Con los mismos datos, el primer día reproduce la recomendación de riego de
+calcular_balance_hidrico de la calculadora.
+"""
+
+from numbers import Real
+
+import numpy as np
+import pandas as pd
+
+
+def laminas_suelo(humedad_cc, humedad_pmp, humedad_riego, profundidad_radicular):
+    """Lámina aprovechable y lámina neta de riego [mm]
+
+    Humedades volumétricas (0-1) y profundidad radicular en cm.
+    """
+    lamina_aprovechable = (humedad_cc - humedad_pmp) * profundidad_radicular * 10
+    lamina_neta = (humedad_cc - humedad_riego) * profundidad_radicular * 10
+    return lamina_aprovechable, lamina_neta
+
+
+def validar_parametros_balance(valores):
+    """Mensajes de los parámetros del balance fuera de rango ([] si son válidos)
+
+    valores: {humedad_actual, humedad_cc, humedad_pmp, humedad_riego: 0-1 y
+    opcionalmente kc}. Kc es un número o una curva diaria: una serie con
+    índice de fechas (las fechas del tramo se toman de ella).
+    """
+    mensajes = [mensaje for nombre, mensaje in (
+        ('humedad_actual', "La humedad actual debe estar entre 0 y 1"),
+        ('humedad_cc', "La capacidad de campo debe estar entre 0 y 1"),
+        ('humedad_pmp', "El punto de marchitez permanente debe estar entre 0 y 1"),
+        ('humedad_riego', "El umbral de riego debe estar entre 0 y 1"),
+    ) if not np.all((0 <= np.asarray(valores[nombre])) & (np.asarray(valores[nombre]) <= 1))]
+    if np.any(np.asarray(valores['humedad_pmp']) >= np.asarray(valores['humedad_cc'])):
+        mensajes.append("El PMP debe ser menor que la capacidad de campo")
+    if 'kc' in valores and not _kc_valido(valores['kc']):
+        mensajes.append("Kc debe ser un número no negativo o una curva diaria (serie con índice de fechas "
+                        f"o columna kc del registro); se recibió {type(valores['kc']).__name__}")
+    return mensajes
+
+
+def _kc_valido(kc):
+    """Kc escalar no negativo o serie de Kc no negativos con índice de fechas"""
+    if isinstance(kc, pd.Series):
+        return (isinstance(kc.index, pd.DatetimeIndex) and pd.api.types.is_numeric_dtype(kc)
+                and bool((kc.dropna() >= 0).all()))
+    return isinstance(kc, Real) and not isinstance(kc, bool) and kc >= 0
+
+
+def balance_puntual(et0, kc, precipitacion, humedad_actual, humedad_cc, humedad_pmp, humedad_riego,
+                    profundidad_radicular):
+    """Balance de un día y recomendación de riego (el cálculo de la calculadora)
+
+    Acepta escalares o arreglos del mismo largo (varias consultas a la vez).
+    Se recomienda regar la lámina neta si la humedad actual está en el
+    umbral de riego o por debajo.
+    """
+    lamina_aprovechable, lamina_neta = laminas_suelo(humedad_cc, humedad_pmp, humedad_riego,
+                                                     profundidad_radicular)
+    etc = kc * et0
+    necesita_riego = np.less_equal(humedad_actual, humedad_riego)
+    return {
+        'et0': et0,
+        'etc': etc,
+        'balance_diario': precipitacion - etc,
+        'lamina_aprovechable': lamina_aprovechable,
+        'lamina_neta': lamina_neta,
+        'deficit_hidrico': lamina_aprovechable - humedad_actual * profundidad_radicular * 10,
+        'necesita_riego': necesita_riego,
+        'lamina_riego': lamina_neta * necesita_riego,
+    }
+
+
+def balance_de_registro(et0, precipitacion, parametros, agotamiento_inicial=None, kc=None):
+    """Balance diario de un campo sobre un tramo de registro; retorna (columnas, agotamiento final)
+
+    parametros: {kc, humedad_actual, humedad_cc, humedad_pmp, humedad_riego,
+    profundidad_radicular y opcionalmente regar}. Con agotamiento_inicial
+    (el agotamiento final del tramo anterior) los tramos se encadenan y
+    equivalen a simular todo el registro de una vez. Los días sin ET₀ (p. ej.
+    filas enmascaradas por el control de calidad) no restan agua y quedan
+    con ET₀ NaN; la precipitación faltante cuenta como 0.
+
+    Kc (kc, si se da, p. ej. la columna kc del registro; si no,
+    parametros['kc']) es un escalar, un arreglo (días,) o una serie; una
+    serie se alinea por fechas con et0 (que entonces debe ser una serie) y
+    debe tener valor en todos los días del tramo.
+    """
+    kc = _kc_del_tramo(parametros['kc'] if kc is None else kc, et0)
+    et0 = np.asarray(et0, dtype=float)
+    precipitacion = np.nan_to_num(np.broadcast_to(np.asarray(precipitacion, dtype=float), et0.shape))
+    salida = simular_temporada(np.nan_to_num(et0), kc, precipitacion, parametros['humedad_actual'],
+                               parametros['humedad_cc'], parametros['humedad_pmp'], parametros['humedad_riego'],
+                               parametros['profundidad_radicular'], regar=parametros.get('regar', True),
+                               agotamiento_inicial=agotamiento_inicial)
+    columnas = {
+        'et0': et0,
+        'kc': kc,
+        'etc': salida['etc'][0],
+        'precipitacion': precipitacion,
+        'riego': salida['riego'][0],
+        'percolacion': salida['percolacion'][0],
+        'agotamiento': salida['agotamiento'][0],
+        'humedad': salida['humedad'][0],
+    }
+    return columnas, float(salida['agotamiento'][0, -1])
+
+
+def _kc_del_tramo(kc, et0):
+    """Kc por día del tramo (días,) a partir de un escalar, un arreglo o una serie"""
+    if isinstance(kc, pd.Series):
+        if not isinstance(et0, pd.Series):
+            raise ValueError("Una curva de Kc (serie) requiere ET₀ como serie con las fechas del tramo")
+        kc = kc.reindex(et0.index)
+    elif not (isinstance(kc, Real) or np.ndim(kc) == 1) or isinstance(kc, bool):
+        raise ValueError(f"Kc debe ser un número o una curva diaria; se recibió {type(kc).__name__}")
+    kc = np.asarray(kc, dtype=float)
+    if kc.ndim == 0:
+        return np.full(len(et0), float(kc))
+    if kc.shape != (len(et0),):
+        raise ValueError(f"La curva de Kc tiene {len(kc)} días y el tramo {len(et0)}")
+    if np.isnan(kc).any():
+        raise ValueError(f"Faltan valores de Kc en {int(np.isnan(kc).sum())} de {len(kc)} días del tramo")
+    return kc
+
+
+def _como_campos_dias(valores, campos, dias, nombre):
+    """Llevar un escalar, serie (días,) o matriz (campos, días) a la forma común"""
+    arreglo = np.asarray(valores, dtype=float)
+    try:
+        return np.broadcast_to(arreglo, (campos, dias))
+    except ValueError:
+        raise ValueError(f"{nombre} debe ser escalar, (días,) = ({dias},) o "
+                         f"(campos, días) = ({campos}, {dias}); se recibió {arreglo.shape}")
+
+
+def simular_temporada(et0, kc, precipitacion, humedad_actual, humedad_cc, humedad_pmp,
+                      humedad_riego, profundidad_radicular, regar=True, dtype=np.float64,
+                      agotamiento_inicial=None):
+    """Balance hídrico diario de una temporada para varios campos
+
+    et0, kc, precipitacion: escalar, (días,) o (campos, días) [mm/día, -, mm/día].
+    humedad_*, profundidad_radicular: escalar o (campos,) [0-1, cm].
+    regar: si es False no se aplica riego (solo se registra el agotamiento).
+    agotamiento_inicial (opcional, escalar o (campos,) [mm]): agotamiento al
+    inicio del primer día, en lugar del que sale de humedad_actual. Con el
+    agotamiento final de una simulación, la siguiente continúa exactamente
+    donde terminó aquella.
+
+    Cada día, si el agotamiento al inicio alcanza la lámina neta (la humedad
+    está en el umbral de riego o por debajo), se riega hasta capacidad de
+    campo. Luego se suma la precipitación y se resta ETc = Kc·ET₀. El agua
+    que sobra a capacidad de campo se pierde por percolación, y el
+    agotamiento no pasa de la lámina aprovechable (PMP).
+
+    Retorna un diccionario con matrices (campos, días): 'etc', 'riego',
+    'percolacion', 'agotamiento' (al final del día) y 'humedad' (al final
+    del día), como vistas traspuestas de matrices día × campo; y por campo: 'lamina_aprovechable', 'lamina_neta',
+    'dias_riego' y 'riego_total'.
+    """
+    humedad_actual, humedad_cc, humedad_pmp, humedad_riego, profundidad_radicular = (
+        np.atleast_1d(np.asarray(v, dtype=float))
+        for v in (humedad_actual, humedad_cc, humedad_pmp, humedad_riego, profundidad_radicular)
+    )
+    if np.any(humedad_pmp >= humedad_cc):
+        raise ValueError("El PMP debe ser menor que la capacidad de campo en todos los campos")
+    
+    formas = [np.shape(v) for v in (et0, kc, precipitacion)]
+    dias = max((forma[-1] for forma in formas if forma), default=1)
+    campos = max([len(humedad_actual), len(humedad_cc), len(humedad_pmp), len(humedad_riego),
+                  len(profundidad_radicular)] + [forma[0] for forma in formas if len(forma) == 2])
+    
+    lamina_aprovechable, lamina_neta = laminas_suelo(humedad_cc, humedad_pmp, humedad_riego,
+                                                     profundidad_radicular)
+    lamina_aprovechable = np.broadcast_to(lamina_aprovechable, (campos,))
+    lamina_neta = np.broadcast_to(lamina_neta, (campos,))
+    mm_por_unidad = np.broadcast_to(profundidad_radicular * 10, (campos,))
+    
+    et0 = _como_campos_dias(et0, campos, dias, "et0")
+    kc = _como_campos_dias(kc, campos, dias, "kc")
+    precipitacion = _como_campos_dias(precipitacion, campos, dias, "precipitacion")
+    
+    # Matrices internas día × campo: cada paso del bucle lee y escribe filas contiguas
+    etc = np.empty((dias, campos), dtype=dtype)
+    np.multiply(kc.T, et0.T, out=etc)
+    lluvia = np.ascontiguousarray(precipitacion.T, dtype=dtype)
+    riego = np.zeros((dias, campos), dtype=dtype)
+    percolacion = np.zeros((dias, campos), dtype=dtype)
+    agotamiento = np.empty((dias, campos), dtype=dtype)
+    
+    # Agotamiento inicial respecto a capacidad de campo
+    if agotamiento_inicial is None:
+        actual = np.clip((humedad_cc - humedad_actual) * profundidad_radicular * 10, 0, lamina_aprovechable)
+    else:
+        actual = np.asarray(agotamiento_inicial, dtype=float)
+    actual = np.array(np.broadcast_to(actual, (campos,)), dtype=dtype)
+    regar_hoy = np.empty(campos, dtype=bool)
+    
+    for d in range(dias):
+        if regar:
+            np.greater_equal(actual, lamina_neta, out=regar_hoy)
+            np.copyto(riego[d], actual, where=regar_hoy)
+            actual[regar_hoy] = 0.0
+        
+        actual += etc[d]
+        actual -= lluvia[d]
+        np.negative(actual, out=percolacion[d])
+        np.maximum(percolacion[d], 0.0, out=percolacion[d])
+        np.clip(actual, 0.0, lamina_aprovechable, out=actual)
+        agotamiento[d] = actual
+    
+    # Vistas (campos, días) de las matrices internas
+    etc, riego, percolacion, agotamiento = etc.T, riego.T, percolacion.T, agotamiento.T
+    return {
+        'etc': etc,
+        'riego': riego,
+        'percolacion': percolacion,
+        'agotamiento': agotamiento,
+        'humedad': np.broadcast_to(humedad_cc, (campos,))[:, None] - agotamiento / mm_por_unidad[:, None],
+        'lamina_aprovechable': lamina_aprovechable,
+        'lamina_neta': lamina_neta,
+        'dias_riego': np.count_nonzero(riego, axis=1),
+        'riego_total': riego.sum(axis=1),
+    }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Arranque en Frío - Calculadora ET₀
+PyET Suite
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Mide, en procesos nuevos (sin caché de módulos), el tiempo de importar
+calculadora_et0 y el de construir la ventana hasta el primer dibujo, y los
+compara con un presupuesto. También verifica que pandas, numpy y pyet no se
+importen al arrancar. Termina con código 1 si se excede el presupuesto.
+
+Uso:
+    python benchmarks/bench_arranque.py [--repeticiones 5] [--salida arranque.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto de arranque (segundos, mediana de las repeticiones)
+PRESUPUESTO_S = {
+    "importar_modulo": 1.0,
+    "construir_ventana": 2.0,
+}
+
+# Librerías que no deben cargarse antes del primer cálculo
+MODULOS_DIFERIDOS = ["pandas", "numpy", "pyet", "xarray"]
+
+SCRIPT_IMPORTAR = """
+import sys, time, json
+t0 = time.perf_counter()
+import calculadora_et0
+t1 = time.perf_counter()
+print(json.dumps({"segundos": t1 - t0,
+                  "cargados": [m for m in %r if m in sys.modules]}))
+""" % (MODULOS_DIFERIDOS,)
+
+SCRIPT_VENTANA = """
+import sys, time, json
+t0 = time.perf_counter()
+import calculadora_et0
+app = calculadora_et0.CalculadoraET0Comparativa()
+app.ventana.update()
+t1 = time.perf_counter()
+app.ventana.destroy()
+print(json.dumps({"segundos": t1 - t0,
+                  "cargados": [m for m in %r if m in sys.modules]}))
+""" % (MODULOS_DIFERIDOS,)
+
+
+def medir(script, repeticiones):
+    """Ejecutar un script en procesos nuevos y reunir los tiempos"""
+    tiempos = []
+    cargados = set()
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, "-c", script], cwd=RAIZ,
+                                 capture_output=True, text=True)
+        if proceso.returncode != 0:
+            return {"error": proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else "fallo"}
+        dato = json.loads(proceso.stdout.strip().splitlines()[-1])
+        tiempos.append(dato["segundos"])
+        cargados.update(dato["cargados"])
+    return {"mediana_s": statistics.median(tiempos), "min_s": min(tiempos),
+            "repeticiones": repeticiones, "modulos_cargados": sorted(cargados)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la calculadora ET₀")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args()
+    
+    resultados = {
+        "importar_modulo": medir(SCRIPT_IMPORTAR, args.repeticiones),
+        "construir_ventana": medir(SCRIPT_VENTANA, args.repeticiones),
+    }
+    
+    excedido = False
+    for caso, dato in resultados.items():
+        if "error" in dato:
+            print(f"⚠️  {caso}: no disponible ({dato['error']})")
+            continue
+        dentro = dato["mediana_s"] <= PRESUPUESTO_S[caso]
+        excedido |= not dentro
+        marca = "✅" if dentro else "❌"
+        print(f"{marca} {caso}: {dato['mediana_s']:.3f} s (presupuesto {PRESUPUESTO_S[caso]:.1f} s)")
+        if dato["modulos_cargados"]:
+            excedido = True
+            print(f"❌ {caso}: se cargaron al arrancar {', '.join(dato['modulos_cargados'])}")
+    
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({"presupuesto_s": PRESUPUESTO_S, "resultados": resultados}, f, indent=2, ensure_ascii=False)
+    
+    return 1 if excedido else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite de Benchmarks de Rendimiento - Calculadora ET₀
+PyET Suite
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Casos medidos:
+- metodo/<id>/<backend>/<filas>: cada método de METODOS_ET con el motor
+  (1, 1k, 100k y 10M filas; pyet solo hasta --max-filas-pyet)
+- calcular_et0_multiple/...: todos los métodos para una fila, como el
+  cálculo de la interfaz (sin ventana, y con ventana si hay pantalla)
+- balance/<campos>x<dias>: balance hídrico por temporada
+- exportacion_csv/<filas>: escritura de resultados a CSV por bloques con
+  exportacion.py (y exportar_csv de la interfaz si hay pantalla)
+- ingesta/csv/<filas>: archivo de estación leído por bloques y calculado
+- ingesta/archivos/<archivos>x<filas>/...: lote de archivos de estación,
+  uno tras otro (procesar_archivo) y leídos a la vez (ingesta_concurrente)
+- control_calidad/<filas>: revisión y enmascarado de entradas con
+  control_calidad.depurar (50 años de datos diarios y 1M filas)
+- tabla/<...>: reconstrucción de la tabla de resultados (requiere pantalla)
+
+Los registros largos son varias estaciones-década apiladas (fechas 2000-2009
+repetidas), ya que un índice diario de 10M días no cabe en datetime64.
+
+Los resultados se guardan en JSON. Con --linea-base se comparan contra una
+corrida anterior y el script termina con código 1 si algún caso es más lento
+que la línea base más la tolerancia.
+
+Uso:
+    python benchmarks/bench_rendimiento.py --salida resultados.json
+    python benchmarks/bench_rendimiento.py --linea-base benchmarks/linea_base.json
+    python benchmarks/bench_rendimiento.py --tamanos 1,1000 --filtro metodo/pm_fao56
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np
+import pandas as pd
+
+from balance_hidrico import simular_temporada
+from metodos_et import METODOS_ET
+from motor_et0 import calcular_et0_serie
+
+VERSION_FORMATO = 1
+TAMANOS_DEFECTO = [1, 1_000, 100_000, 10_000_000]
+MAX_FILAS_PYET_DEFECTO = 100_000
+TOLERANCIA_DEFECTO = 0.25
+# Diferencias menores a este tiempo se consideran ruido de medición
+UMBRAL_RUIDO_S = 0.002
+
+Z_ESTACION = 2640
+LAT_ESTACION = 4.61
+
+
+def registro_sintetico(filas, semilla=0):
+    """Registro diario con variables plausibles (estaciones-década apiladas)"""
+    rng = np.random.default_rng(semilla)
+    decada = pd.date_range("2000-01-01", "2009-12-31", freq="D")
+    fechas = decada[np.arange(filas) % len(decada)]
+    t_min = rng.uniform(5, 20, filas)
+    return pd.DataFrame({
+        "t_min": t_min,
+        "t_max": t_min + rng.uniform(3, 14, filas),
+        "rh_min": rng.uniform(30, 65, filas),
+        "rh_max": rng.uniform(70, 100, filas),
+        "rs": rng.uniform(8, 28, filas),
+        "uz": rng.uniform(0.5, 5, filas),
+    }, index=fechas)
+
+
+def medir(funcion, repeticiones):
+    """Ejecutar funcion varias veces y resumir los tiempos de pared"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return {"mediana_s": statistics.median(tiempos), "min_s": min(tiempos), "repeticiones": repeticiones}
+
+
+def repeticiones_para(filas, repeticiones):
+    """Menos repeticiones en los casos grandes para acotar la duración total"""
+    if filas >= 1_000_000:
+        return 1
+    if filas >= 100_000:
+        return min(repeticiones, 3)
+    return repeticiones
+
+
+# ----------------------------------------------------------------------------
+# Casos sin interfaz gráfica
+# ----------------------------------------------------------------------------
+
+def casos_metodos(tamanos, backends, max_filas_pyet):
+    for filas in tamanos:
+        datos = None
+        for backend in backends:
+            for metodo_id in METODOS_ET:
+                nombre = f"metodo/{metodo_id}/{backend}/{filas}"
+                if backend == "pyet" and filas > max_filas_pyet:
+                    yield nombre, filas, None, f"omitido: pyet por encima de {max_filas_pyet} filas"
+                    continue
+                if datos is None:
+                    datos = registro_sintetico(filas)
+                yield nombre, filas, (lambda d=datos, m=metodo_id, b=backend:
+                                      calcular_et0_serie(d, Z_ESTACION, LAT_ESTACION, [m], backend=b)), None
+        del datos
+
+
+def casos_calculo_interfaz(backends):
+    # El hilo de calcular_et0_multiple corre todos los métodos sobre un registro de una fila
+    datos = registro_sintetico(1)
+    for backend in backends:
+        yield (f"calcular_et0_multiple/sin_ventana/{backend}", 1,
+               lambda b=backend: calcular_et0_serie(datos, Z_ESTACION, LAT_ESTACION, backend=b), None)
+
+
+def casos_balance():
+    rng = np.random.default_rng(1)
+    for campos, dias in [(1, 365), (10_000, 365)]:
+        et0 = rng.uniform(2, 7, dias)
+        kc = np.interp(np.arange(dias), [0, 60, 120, 250, dias], [0.3, 0.3, 1.15, 1.15, 0.5])
+        lluvia = np.where(rng.random((campos, dias)) < 0.2, rng.exponential(10, (campos, dias)), 0.0)
+        humedad = rng.uniform(0.2, 0.35, campos)
+        raices = rng.uniform(30, 100, campos)
+        yield (f"balance/{campos}x{dias}", campos * dias,
+               lambda a=et0, k=kc, p=lluvia, h=humedad, r=raices:
+               simular_temporada(a, k, p, h, 0.35, 0.15, 0.25, r), None)
+
+
+def casos_exportacion(carpeta, tamanos):
+    from exportacion import exportar_resultados
+    
+    for filas in tamanos:
+        datos = registro_sintetico(filas)
+        resultados, _ = calcular_et0_serie(datos, Z_ESTACION, LAT_ESTACION, backend="numpy")
+        tabla = pd.concat([datos, resultados], axis=1)
+        ruta = os.path.join(carpeta, f"exportacion_{filas}.csv")
+        yield (f"exportacion_csv/{filas}", filas,
+               lambda t=tabla, r=ruta: exportar_resultados(r, t, t.index), None)
+
+
+def casos_ingesta(carpeta, tamanos):
+    from ingesta import procesar_archivo
+    
+    for filas in tamanos:
+        ruta = os.path.join(carpeta, f"estacion_{filas}.csv")
+        datos = registro_sintetico(filas)
+        datos.assign(z=Z_ESTACION, lat=LAT_ESTACION).to_csv(ruta, index_label="fecha")
+        yield (f"ingesta/csv/{filas}", filas,
+               lambda r=ruta: sum(len(bloque) for bloque, _, _ in procesar_archivo(r)), None)
+
+
+def casos_ingesta_concurrente(carpeta, archivos, filas):
+    import asyncio
+    
+    from ingesta import procesar_archivo
+    from ingesta_concurrente import procesar_archivos_concurrentes
+    
+    rutas = []
+    for i in range(archivos):
+        ruta = os.path.join(carpeta, f"estacion_lote_{i}.csv")
+        registro_sintetico(filas, semilla=i).to_csv(ruta, index_label="fecha")
+        rutas.append(ruta)
+    
+    def secuencial():
+        return sum(len(bloque) for ruta in rutas
+                   for bloque, _, _ in procesar_archivo(ruta, Z_ESTACION, LAT_ESTACION))
+    
+    async def concurrente():
+        filas_leidas = 0
+        async for _, bloque, _, _ in procesar_archivos_concurrentes(rutas, Z_ESTACION, LAT_ESTACION):
+            filas_leidas += len(bloque) if bloque is not None else 0
+        return filas_leidas
+    
+    nombre = f"ingesta/archivos/{archivos}x{filas}"
+    yield f"{nombre}/secuencial", archivos * filas, secuencial, None
+    yield f"{nombre}/concurrente", archivos * filas, lambda: asyncio.run(concurrente()), None
+
+
+def casos_control_calidad(tamanos):
+    from control_calidad import depurar
+    
+    for filas in tamanos:
+        datos = registro_sintetico(filas)
+        # Un 1 % de filas con temperaturas invertidas y radiación negativa
+        malas = np.arange(0, filas, 100)
+        temperaturas = [datos.columns.get_loc("t_min"), datos.columns.get_loc("t_max")]
+        datos.iloc[malas, temperaturas] = datos.iloc[malas, temperaturas[::-1]].to_numpy()
+        datos.iloc[malas, datos.columns.get_loc("rs")] = -1.0
+        yield (f"control_calidad/{filas}", filas,
+               lambda d=datos: depurar(d, LAT_ESTACION), None)
+
+
+# ----------------------------------------------------------------------------
+# Casos con interfaz gráfica (requieren customtkinter y una pantalla)
+# ----------------------------------------------------------------------------
+
+def crear_aplicacion():
+    """Construir la ventana de la calculadora, o retornar el motivo si no es posible"""
+    try:
+        import calculadora_et0
+        app = calculadora_et0.CalculadoraET0Comparativa()
+        app.ventana.update()
+        return app, None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def esperar_calculo(app):
+    """Atender la ventana hasta que termine el hilo de cálculo en segundo plano"""
+    while app.hilo_fondo is not None and app.hilo_fondo.is_alive():
+        app.ventana.update()
+        time.sleep(0.005)
+    # Último paso: procesar la cola y mostrar resultados
+    for _ in range(5):
+        app.ventana.update()
+        time.sleep(0.06)
+
+
+def casos_interfaz(carpeta):
+    app, motivo = crear_aplicacion()
+    nombres = ["calcular_et0_multiple/ventana", "exportacion_csv/interfaz", "tabla/reconstruir/21",
+               "tabla/reconstruir/210000", "tabla/desplazar/210000"]
+    if app is None:
+        for nombre in nombres:
+            yield nombre, 0, None, f"no disponible: {motivo}"
+        return
+    
+    import calculadora_et0
+    from fuente_resultados import FuenteResultadosET0
+    
+    # Datos del clima templado continental de README_TEST_SUITE.md
+    entradas = {"t_min": 8, "t_max": 19, "rh_min": 45, "rh_max": 85, "rs": 18.5, "uz": 2.1,
+                "z": Z_ESTACION, "lat": LAT_ESTACION}
+    
+    def calcular_todos():
+        app.metodos_seleccionados = list(METODOS_ET.keys())
+        app.actualizar_tabla_variables_multiple()
+        for var_name, entry in app.variables.items():
+            entry.delete(0, "end")
+            entry.insert(0, str(entradas[var_name]))
+        app.calcular_et0_multiple()
+        esperar_calculo(app)
+    
+    yield "calcular_et0_multiple/ventana", 1, calcular_todos, None
+    
+    ruta = os.path.join(carpeta, "exportacion_interfaz.csv")
+    
+    def exportar():
+        dialogo, aviso = calculadora_et0.filedialog.asksaveasfilename, calculadora_et0.messagebox.showinfo
+        calculadora_et0.filedialog.asksaveasfilename = lambda **kwargs: ruta
+        calculadora_et0.messagebox.showinfo = lambda *args, **kwargs: None
+        try:
+            app.exportar_csv()
+        finally:
+            calculadora_et0.filedialog.asksaveasfilename, calculadora_et0.messagebox.showinfo = dialogo, aviso
+    
+    yield "exportacion_csv/interfaz", len(METODOS_ET), exportar, None
+    
+    def nombre(metodo_id):
+        return METODOS_ET[metodo_id]["nombre"]
+    
+    escalares = [(metodo_id, 4.0 + i / 10) for i, metodo_id in enumerate(METODOS_ET)]
+    series = [(metodo_id, pd.Series(np.full(10_000, 4.0 + i / 10),
+                                    index=pd.date_range("2000-01-01", periods=10_000)))
+              for i, metodo_id in enumerate(METODOS_ET)]
+    
+    def reconstruir(resultados):
+        app.tabla_resultados.mostrar(FuenteResultadosET0(resultados, [], nombre, app.obtener_categoria_metodo))
+        app.ventana.update_idletasks()
+    
+    def desplazar():
+        for _ in range(100):
+            app.tabla_resultados.desplazar(1)
+        app.ventana.update_idletasks()
+    
+    yield "tabla/reconstruir/21", len(escalares), lambda: reconstruir(escalares), None
+    yield "tabla/reconstruir/210000", 210_000, lambda: reconstruir(series), None
+    yield "tabla/desplazar/210000", 210_000, desplazar, None
+    
+    app.ventana.destroy()
+
+
+# ----------------------------------------------------------------------------
+# Línea base
+# ----------------------------------------------------------------------------
+
+def describir_entorno():
+    entorno = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+    try:
+        import pyet
+        entorno["pyet"] = pyet.__version__
+    except ImportError:
+        entorno["pyet"] = None
+    return entorno
+
+
+def comparar_con_linea_base(resultados, linea_base, tolerancia):
+    """Listar los casos más lentos que la línea base (más la tolerancia)"""
+    regresiones = []
+    for nombre, actual in resultados["casos"].items():
+        base = linea_base.get("casos", {}).get(nombre)
+        if not base or "mediana_s" not in base or "mediana_s" not in actual:
+            continue
+        razon = actual["mediana_s"] / base["mediana_s"] if base["mediana_s"] > 0 else float("inf")
+        if razon > 1 + tolerancia and actual["mediana_s"] - base["mediana_s"] > UMBRAL_RUIDO_S:
+            regresiones.append((nombre, base["mediana_s"], actual["mediana_s"], razon))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de la calculadora ET₀")
+    parser.add_argument("--tamanos", default=",".join(str(t) for t in TAMANOS_DEFECTO),
+                        help="Filas por caso de método, separadas por comas")
+    parser.add_argument("--backends", default="numpy,pyet", help="Backends del motor a medir")
+    parser.add_argument("--max-filas-pyet", type=int, default=MAX_FILAS_PYET_DEFECTO)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--filtro", default="", help="Medir solo los casos cuyo nombre contenga este texto")
+    parser.add_argument("--sin-interfaz", action="store_true", help="Omitir los casos que abren la ventana")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--linea-base", help="JSON de una corrida anterior contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_DEFECTO,
+                        help="Aumento relativo permitido sobre la línea base (0.25 = 25 %%)")
+    args = parser.parse_args()
+    
+    tamanos = [int(t) for t in args.tamanos.split(",") if t]
+    backends = [b for b in args.backends.split(",") if b]
+    
+    resultados = {
+        "version_formato": VERSION_FORMATO,
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "entorno": describir_entorno(),
+        "casos": {},
+    }
+    
+    with tempfile.TemporaryDirectory() as carpeta:
+        grupos = [
+            casos_metodos(tamanos, backends, args.max_filas_pyet),
+            casos_calculo_interfaz(backends),
+            casos_balance(),
+            casos_exportacion(carpeta, [1_000, 100_000]),
+            casos_ingesta(carpeta, [100_000]),
+            casos_ingesta_concurrente(carpeta, 100, 3_650),
+            casos_control_calidad([18_262, 1_000_000]),
+        ]
+        if not args.sin_interfaz:
+            grupos.append(casos_interfaz(carpeta))
+        
+        for grupo in grupos:
+            for nombre, filas, funcion, motivo in grupo:
+                if args.filtro not in nombre:
+                    continue
+                if funcion is None:
+                    resultados["casos"][nombre] = {"filas": filas, "estado": motivo}
+                    print(f"⚠️  {nombre}: {motivo}")
+                    continue
+                try:
+                    dato = medir(funcion, repeticiones_para(filas, args.repeticiones))
+                except Exception as e:
+                    resultados["casos"][nombre] = {"filas": filas, "estado": f"error: {e}"}
+                    print(f"❌ {nombre}: {e}")
+                    continue
+                resultados["casos"][nombre] = {"filas": filas, **dato}
+                print(f"✅ {nombre}: {dato['mediana_s'] * 1000:.2f} ms")
+    
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n📁 Resultados guardados en {args.salida}")
+    
+    if args.linea_base:
+        with open(args.linea_base, encoding="utf-8") as f:
+            linea_base = json.load(f)
+        regresiones = comparar_con_linea_base(resultados, linea_base, args.tolerancia)
+        if regresiones:
+            print(f"\n❌ {len(regresiones)} casos más lentos que la línea base (+{args.tolerancia:.0%}):")
+            for nombre, base, actual, razon in regresiones:
+                print(f"   {nombre}: {base * 1000:.2f} ms -> {actual * 1000:.2f} ms (x{razon:.2f})")
+            return 1
+        print(f"\n✅ Sin regresiones respecto a {args.linea_base}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché en Disco de Resultados ET₀ por Contenido
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Guarda el resultado de cada método sobre cada bloque de entrada en un
+archivo .npy cuyo nombre es un hash de:
+
+    (huella del bloque de entrada, metodo_id, descripción pyet del método
+     en METODOS_ET, versión de pyet, backend y versión de los núcleos NumPy)
+
+Si cualquiera de esas partes cambia, la clave cambia y el método se
+recalcula; el resto de los métodos se sigue leyendo del caché. La huella
+del bloque cubre los valores de las columnas, las fechas, z, lat y la tabla
+de radiación.
+
+El tamaño total se limita con desalojo LRU: cada lectura actualiza la fecha
+de modificación del archivo y, al pasar del límite, se borran primero los
+menos usados. Las escrituras son atómicas (archivo temporal + os.replace),
+así que varios procesos pueden compartir el mismo directorio.
+
+MemoriaLRU es la versión en RAM para cálculos puntuales (la calculadora):
+guarda pocos valores por (metodo_id, entradas redondeadas) y no toca disco.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+DIRECTORIO_DEFECTO = os.path.join(os.path.expanduser("~"), ".pyet_suite", "cache_et0")
+LIMITE_BYTES_DEFECTO = 512 * 1024**2
+
+CAPACIDAD_MEMORIA_DEFECTO = 1024
+DECIMALES_MEMORIA = 6
+
+
+@lru_cache(maxsize=1)
+def version_pyet():
+    """Versión de pyet instalada (sin importarlo), o "sin pyet" """
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("pyet")
+    except PackageNotFoundError:
+        return "sin pyet"
+
+
+def huella_entrada(columnas, fechas=None, z=None, lat=None, tabla_radiacion=None):
+    """Hash del bloque de entrada de una corrida
+
+    columnas: {nombre: arreglo}; fechas: DatetimeIndex o None (registro sin
+    fechas). z, lat y la malla de tabla_radiacion también forman parte.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for nombre in sorted(columnas):
+        h.update(nombre.encode("utf-8"))
+        h.update(np.ascontiguousarray(columnas[nombre], dtype=np.float64).tobytes())
+    if fechas is not None:
+        h.update(np.asarray(fechas, dtype="datetime64[D]").tobytes())
+    else:
+        h.update(b"sin fechas")
+    escalares = (z, lat)
+    if tabla_radiacion is not None:
+        escalares += (tabla_radiacion.paso_grados, tabla_radiacion.lat_min, tabla_radiacion.lat_max)
+    h.update(repr(escalares).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CacheDiscoET0:
+    """Caché en disco, por contenido, de resultados ET₀ con límite de tamaño (LRU)"""
+    
+    def __init__(self, directorio=DIRECTORIO_DEFECTO, limite_bytes=LIMITE_BYTES_DEFECTO):
+        self.directorio = str(directorio)
+        self.limite_bytes = limite_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(self.directorio, exist_ok=True)
+        self._tamano = sum(tamano for _, tamano, _ in self._entradas())
+    
+    def clave(self, huella, metodo_id, backend, parametros=None):
+        """Clave de un resultado: huella de entrada + método + parámetros + versiones"""
+        from metodos_et import METODOS_ET
+        from nucleos_numpy import VERSION_NUCLEOS
+        
+        if parametros is None:
+            # Función y claves *_pyet: todo lo que decide la llamada a pyet
+            parametros = {nombre: valor for nombre, valor in METODOS_ET.get(metodo_id, {}).items()
+                          if nombre == "funcion" or nombre.endswith("_pyet")}
+        partes = [huella, metodo_id, json.dumps(parametros, sort_keys=True, default=str),
+                  version_pyet(), backend, VERSION_NUCLEOS if backend == "numpy" else ""]
+        return hashlib.blake2b("\x1f".join(partes).encode("utf-8"), digest_size=20).hexdigest()
+    
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave[:2], clave + ".npy")
+    
+    def obtener(self, clave):
+        """Resultado guardado (arreglo float) o None si no está"""
+        ruta = self._ruta(clave)
+        try:
+            valores = np.load(ruta, allow_pickle=False)
+            os.utime(ruta)  # marcar como usado recientemente
+        except (OSError, ValueError):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return valores
+    
+    def guardar(self, clave, valores):
+        """Guardar un resultado y desalojar los menos usados si se pasa del límite
+
+        Un error de disco no interrumpe el cálculo: el resultado simplemente
+        no queda en caché (retorna False).
+        """
+        ruta = self._ruta(clave)
+        temporal = None
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(ruta))
+            with os.fdopen(descriptor, "wb") as f:
+                np.save(f, np.asarray(valores, dtype=np.float64), allow_pickle=False)
+            nuevo = os.path.getsize(temporal)
+            # Al reemplazar una clave ya guardada, su tamaño anterior deja de contar
+            try:
+                anterior = os.path.getsize(ruta)
+            except OSError:
+                anterior = 0
+            os.replace(temporal, ruta)
+            self._tamano += nuevo - anterior
+        except OSError:
+            if temporal is not None and os.path.exists(temporal):
+                os.remove(temporal)
+            return False
+        if self._tamano > self.limite_bytes:
+            self.desalojar()
+        return True
+    
+    def _entradas(self):
+        """(ruta, tamaño, última modificación) de cada resultado guardado"""
+        for raiz, _, archivos in os.walk(self.directorio):
+            for archivo in archivos:
+                if archivo.endswith(".npy"):
+                    ruta = os.path.join(raiz, archivo)
+                    try:
+                        estado = os.stat(ruta)
+                    except OSError:
+                        continue
+                    yield ruta, estado.st_size, estado.st_mtime
+    
+    def desalojar(self, limite_bytes=None):
+        """Borrar los resultados menos usados hasta quedar bajo el límite"""
+        limite = self.limite_bytes if limite_bytes is None else limite_bytes
+        entradas = sorted(self._entradas(), key=lambda entrada: entrada[2])
+        total = sum(tamano for _, tamano, _ in entradas)
+        for ruta, tamano, _ in entradas:
+            if total <= limite:
+                break
+            try:
+                os.remove(ruta)
+                total -= tamano
+            except OSError:
+                pass
+        self._tamano = total
+    
+    @property
+    def tamano_bytes(self):
+        return self._tamano
+    
+    def limpiar(self):
+        """Borrar todo el contenido del caché"""
+        self.desalojar(limite_bytes=0)
+
+
+def clave_memoria(metodo_id, valores, decimales=DECIMALES_MEMORIA):
+    """Clave (metodo_id, entradas redondeadas) de un cálculo puntual
+
+    valores: {variable: valor}. Se usan todas las entradas y no solo los
+    requerimientos del método, porque algunos métodos cambian de fórmula
+    según las variables disponibles (p. ej. haude usa t_max si existe).
+    """
+    return metodo_id, tuple(sorted((var, round(float(valor), decimales)) for var, valor in valores.items()))
+
+
+class MemoriaLRU:
+    """Memoria acotada en RAM de resultados puntuales (LRU, segura entre hilos)"""
+    
+    def __init__(self, capacidad=CAPACIDAD_MEMORIA_DEFECTO):
+        if capacidad < 1:
+            raise ValueError("capacidad debe ser al menos 1")
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._valores = OrderedDict()
+        self._candado = threading.Lock()
+    
+    def __len__(self):
+        return len(self._valores)
+    
+    def obtener(self, clave):
+        """Valor guardado o None; un acierto lo marca como usado recientemente"""
+        with self._candado:
+            try:
+                self._valores.move_to_end(clave)
+            except KeyError:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+            return self._valores[clave]
+    
+    def guardar(self, clave, valor):
+        """Guardar un valor y olvidar el menos usado si se pasa de la capacidad"""
+        with self._candado:
+            self._valores[clave] = valor
+            self._valores.move_to_end(clave)
+            while len(self._valores) > self.capacidad:
+                self._valores.popitem(last=False)
+    
+    def limpiar(self):
+        with self._candado:
+            self._valores.clear()
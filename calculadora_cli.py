@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calculadora ET₀ en Línea de Comandos (corridas por lotes sin pantalla)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Calcula la comparación de métodos ET₀ y, opcionalmente, el balance hídrico
+diario para uno o varios archivos de estación, sin abrir la ventana. Solo
+usa los módulos del núcleo (nunca importa tkinter ni customtkinter), de
+modo que arranca rápido y con poca memoria en servidores sin pantalla,
+p. ej. desde cron.
+
+Cada archivo se lee por bloques (ingesta.procesar_archivo) y se escribe en
+la carpeta de salida como <estacion>_et0.<formato> y, con balance,
+<estacion>_balance.<formato>. Con varios procesos cada archivo se procesa
+en un proceso distinto.
+
+Con "historial" (ruta SQLite de AlmacenResultados) las fechas ya guardadas
+no se recalculan. Con "incremental" además se continúa la serie de cada
+estación desde su estado (actualizacion_incremental): solo se calculan los
+días posteriores al último procesado, el balance sigue desde el
+agotamiento guardado y las salidas contienen solo los días nuevos.
+
+Con "lectores" los archivos se leen a la vez (ingesta_concurrente, con
+asyncio) mientras "procesos" hilos calculan los bloques ya leídos; sirve
+para lotes de cientos de archivos, en los que leer detiene el cálculo.
+
+La configuración es un JSON con las claves de CONFIGURACION_DEFECTO; las
+opciones de la línea de comandos tienen prioridad sobre el archivo:
+
+    {
+        "metodos": ["pm_fao56", "hargreaves"],
+        "tamano_bloque": 50000,
+        "procesos": 4,
+        "formato": "parquet",
+        "salida": "resultados",
+        "balance": {"metodo": "pm_fao56", "kc": 1.05, "humedad_actual": 0.30,
+                    "humedad_cc": 0.35, "humedad_pmp": 0.15, "humedad_riego": 0.25,
+                    "profundidad_radicular": 40}
+    }
+
+Uso:
+    python calculadora_cli.py estacion_1.csv estacion_2.csv --config lote.json
+    python calculadora_cli.py datos/*.csv --metodos pm_fao56,hargreaves --procesos 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
+
+from balance_hidrico import balance_de_registro, validar_parametros_balance
+from control_calidad import MODOS, InformeCalidad
+from exportacion import FORMATOS, EscritorResultados
+from ingesta import TAMANO_BLOQUE_DEFECTO, procesar_archivo
+from metodos_et import METODOS_ET
+from metricas import Metricas
+from motor_et0 import BACKENDS
+
+CONFIGURACION_DEFECTO = {
+    "metodos": None,                # None: todos los de METODOS_ET
+    "tamano_bloque": TAMANO_BLOQUE_DEFECTO,
+    "procesos": 1,
+    "formato": "csv",
+    "salida": ".",
+    "backend": "auto",
+    "control_calidad": "enmascarar",
+    "decimales": None,
+    "z": None,
+    "lat": None,
+    "mapeo": None,                  # {columna_archivo: requerimiento}
+    "cache": None,                  # carpeta de CacheDiscoET0 (None: sin caché)
+    "metricas": None,               # ruta .json o .csv de la traza de la corrida
+    "balance": None,                # ver PARAMETROS_BALANCE
+    "historial": None,              # ruta SQLite de AlmacenResultados
+    "incremental": False,           # agregar solo días nuevos (requiere historial)
+    "lectores": None,               # archivos leídos a la vez (None: uno por proceso)
+}
+
+# Parámetros obligatorios del balance (además de "metodo", el ET₀ que se usa);
+# opcionales: "precipitacion" (mm/día si el archivo no trae la columna) y "regar".
+# Si el archivo trae una columna kc (curva del cultivo), se usa en lugar de "kc"
+PARAMETROS_BALANCE = ("kc", "humedad_actual", "humedad_cc", "humedad_pmp", "humedad_riego",
+                      "profundidad_radicular")
+
+
+def cargar_configuracion(ruta=None, **cambios):
+    """Configuración de la corrida: valores por defecto, archivo JSON y cambios
+
+    Los cambios con valor None se ignoran (opciones no dadas en la línea de
+    comandos). Lanza ValueError si alguna clave o valor no es válido.
+    """
+    configuracion = dict(CONFIGURACION_DEFECTO)
+    if ruta is not None:
+        with open(ruta, encoding="utf-8") as f:
+            configuracion.update(json.load(f))
+    configuracion.update({clave: valor for clave, valor in cambios.items() if valor is not None})
+    
+    desconocidas = set(configuracion) - set(CONFIGURACION_DEFECTO)
+    if desconocidas:
+        raise ValueError(f"Claves de configuración desconocidas: {sorted(desconocidas)}")
+    if configuracion["formato"] not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {configuracion['formato']}. Use uno de {FORMATOS}")
+    if configuracion["backend"] not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {configuracion['backend']}. Use uno de {BACKENDS}")
+    if configuracion["control_calidad"] is not None and configuracion["control_calidad"] not in MODOS:
+        raise ValueError(f"Control de calidad desconocido: {configuracion['control_calidad']}. Use uno de {MODOS}")
+    if int(configuracion["procesos"]) < 1 or int(configuracion["tamano_bloque"]) < 1:
+        raise ValueError("procesos y tamano_bloque deben ser al menos 1")
+    if configuracion["incremental"] and not configuracion["historial"]:
+        raise ValueError("El modo incremental requiere 'historial' (archivo SQLite con el estado de las estaciones)")
+    if configuracion["lectores"] is not None:
+        if int(configuracion["lectores"]) < 1:
+            raise ValueError("lectores debe ser al menos 1")
+        if configuracion["historial"]:
+            raise ValueError("La lectura concurrente (lectores) no admite 'historial' ni el modo incremental")
+    
+    metodos = configuracion["metodos"]
+    if metodos is not None:
+        desconocidos = [metodo_id for metodo_id in metodos if metodo_id not in METODOS_ET]
+        if desconocidos:
+            raise ValueError(f"Métodos desconocidos: {desconocidos}")
+    
+    balance = configuracion["balance"]
+    if balance is not None:
+        faltantes = [nombre for nombre in ("metodo",) + PARAMETROS_BALANCE if nombre not in balance]
+        if faltantes:
+            raise ValueError(f"Faltan parámetros del balance: {faltantes}")
+        if balance["metodo"] not in (metodos or METODOS_ET):
+            raise ValueError(f"El método del balance ({balance['metodo']}) no está entre los métodos a calcular")
+        mensajes = validar_parametros_balance(balance)
+        if mensajes:
+            raise ValueError(mensajes[0])
+    return configuracion
+
+
+class _SalidaEstacion:
+    """Archivos de salida y resumen de una estación a medida que llegan sus bloques"""
+    
+    def __init__(self, ruta, configuracion, informe):
+        self.ruta = ruta
+        self.configuracion = configuracion
+        self.informe = informe
+        self.metodos = configuracion["metodos"] or list(METODOS_ET)
+        self.balance = configuracion["balance"]
+        estacion = os.path.splitext(os.path.basename(ruta))[0]
+        extension = ".parquet" if configuracion["formato"] == "parquet" else ".csv"
+        self.resumen = {"estacion": estacion, "archivo": ruta, "filas": 0, "errores": {}, "error": None,
+                        "salida_et0": os.path.join(configuracion["salida"], f"{estacion}_et0{extension}"),
+                        "salida_balance": None}
+        if self.balance is not None:
+            self.resumen["salida_balance"] = os.path.join(configuracion["salida"], f"{estacion}_balance{extension}")
+        self.pila = ExitStack()
+        self.escritor = self.escritor_balance = None
+        self.agotamiento = None
+        self.inicio = time.perf_counter()
+    
+    def escribir(self, bloque, resultados, tabla_balance, errores, metricas):
+        """Escribir un bloque (en el orden del archivo) y su balance"""
+        # Las salidas se crean con el primer bloque: un archivo ilegible no deja salidas vacías
+        if self.escritor is None:
+            metadatos = {"archivo_estacion": self.ruta, "metodos": self.metodos, "z": self.configuracion["z"],
+                         "lat": self.configuracion["lat"]}
+            opciones = {"formato": self.configuracion["formato"], "decimales": self.configuracion["decimales"]}
+            self.escritor = self.pila.enter_context(EscritorResultados(self.resumen["salida_et0"], metadatos,
+                                                                       **opciones))
+            if self.balance is not None:
+                self.escritor_balance = self.pila.enter_context(EscritorResultados(
+                    self.resumen["salida_balance"], {"archivo_estacion": self.ruta, "balance": self.balance},
+                    **opciones))
+        
+        fechas = bloque.index if bloque.index.name == "fecha" else None
+        resultados = resultados.reindex(columns=self.metodos)
+        with metricas.medir("exportacion", filas=len(bloque)):
+            self.escritor.escribir({**bloque, **resultados}, fechas)
+            if self.escritor_balance is not None:
+                if tabla_balance is None:
+                    precipitacion = bloque.get("precipitacion", self.balance.get("precipitacion", 0.0))
+                    tabla_balance, self.agotamiento = balance_de_registro(
+                        resultados[self.balance["metodo"]], precipitacion, self.balance, self.agotamiento,
+                        kc=bloque.get("kc"))
+                self.escritor_balance.escribir(tabla_balance, fechas)
+        self.resumen["filas"] += len(bloque)
+        self.resumen["errores"].update(errores)
+        self.escritor.metadatos["errores"] = self.resumen["errores"]
+        self.escritor.metadatos["control_calidad"] = self.informe.resumen()
+    
+    def terminar(self, error=None):
+        """Cerrar las salidas; retorna el resumen"""
+        try:
+            self.pila.close()
+        except Exception as e:
+            error = error or f"{type(e).__name__}: {e}"
+        if error is not None and self.resumen["error"] is None:
+            self.resumen["error"] = error
+        self.resumen["segundos"] = time.perf_counter() - self.inicio
+        self.resumen["control_calidad"] = self.informe.resumen()
+        return self.resumen
+
+
+def procesar_estacion(ruta, configuracion):
+    """Calcular y exportar una estación; retorna un resumen (dict serializable)
+
+    Un error no se propaga: queda en resumen["error"], para que una
+    estación mala no detenga el resto del lote.
+    """
+    metricas = Metricas()
+    informe = InformeCalidad()
+    salida = _SalidaEstacion(ruta, configuracion, informe)
+    estacion = salida.resumen["estacion"]
+    metodos = salida.metodos
+    
+    cache = None
+    if configuracion["cache"]:
+        from cache_et0 import CacheDiscoET0
+        cache = CacheDiscoET0(configuracion["cache"])
+    
+    error = None
+    try:
+        almacen = None
+        if configuracion["historial"]:
+            from almacen_resultados import AlmacenResultados
+            almacen = salida.pila.enter_context(AlmacenResultados(configuracion["historial"]))
+        
+        # (bloque, resultados, balance o None, errores) por bloque
+        if configuracion["incremental"]:
+            from actualizacion_incremental import ActualizadorIncremental, actualizar_archivo
+            actualizador = ActualizadorIncremental(almacen, metodos, configuracion["balance"],
+                                                   configuracion["backend"], configuracion["control_calidad"],
+                                                   metricas)
+            bloques = actualizar_archivo(ruta, actualizador, estacion, configuracion["z"], configuracion["lat"],
+                                         int(configuracion["tamano_bloque"]), configuracion["mapeo"], informe)
+        else:
+            bloques = ((bloque, resultados, None, errores) for bloque, resultados, errores in procesar_archivo(
+                ruta, configuracion["z"], configuracion["lat"], metodos, int(configuracion["tamano_bloque"]),
+                configuracion["mapeo"], backend=configuracion["backend"], metricas=metricas, almacen=almacen,
+                cache=cache, control_calidad=configuracion["control_calidad"], informe_calidad=informe))
+        
+        for bloque, resultados, tabla_balance, errores in bloques:
+            salida.escribir(bloque, resultados, tabla_balance, errores, metricas)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    
+    resumen = salida.terminar(error)
+    resumen["metricas"] = metricas.registros
+    return resumen
+
+
+async def _procesar_concurrente(archivos, configuracion, metricas):
+    """Como procesar_estacion para todos los archivos, con ingesta_concurrente
+
+    Los archivos se leen a la vez ("lectores") y sus bloques se calculan en
+    "procesos" hilos; cada bloque se escribe en cuanto llega.
+    """
+    from ingesta_concurrente import procesar_archivos_concurrentes
+    
+    cache = None
+    if configuracion["cache"]:
+        from cache_et0 import CacheDiscoET0
+        cache = CacheDiscoET0(configuracion["cache"])
+    
+    archivos = list(dict.fromkeys(archivos))
+    informes = {ruta: InformeCalidad() for ruta in archivos}
+    salidas = {}
+    resumenes = {}
+    bloques = procesar_archivos_concurrentes(
+        archivos, configuracion["z"], configuracion["lat"], configuracion["metodos"],
+        int(configuracion["tamano_bloque"]), configuracion["mapeo"], backend=configuracion["backend"],
+        metricas=metricas, cache=cache, control_calidad=configuracion["control_calidad"], informe_calidad=informes,
+        lectores=int(configuracion["lectores"]), trabajadores=int(configuracion["procesos"]))
+    async for ruta, bloque, resultados, errores in bloques:
+        salida = salidas.get(ruta)
+        if salida is None:
+            salida = salidas[ruta] = _SalidaEstacion(ruta, configuracion, informes[ruta])
+        if bloque is None:
+            # Fin del archivo (errores es el error del archivo, o None)
+            resumenes[ruta] = salida.terminar(errores)
+            resumenes[ruta]["metricas"] = []
+            del salidas[ruta]
+        elif salida.resumen["error"] is None:
+            try:
+                salida.escribir(bloque, resultados, None, errores, metricas)
+            except Exception as e:
+                salida.resumen["error"] = f"{type(e).__name__}: {e}"
+    return [resumenes[ruta] for ruta in archivos]
+
+
+def ejecutar(archivos, configuracion, metricas=None):
+    """Procesar varios archivos de estación; retorna la lista de resúmenes
+
+    Con configuracion["procesos"] > 1 los archivos se reparten entre
+    procesos; con configuracion["lectores"] se leen a la vez con
+    ingesta_concurrente y "procesos" es el número de hilos de cálculo.
+    metricas (Metricas, opcional) reúne las trazas de todos.
+    """
+    os.makedirs(configuracion["salida"], exist_ok=True)
+    procesos = min(int(configuracion["procesos"]), len(archivos))
+    if configuracion["lectores"]:
+        resumenes = asyncio.run(_procesar_concurrente(archivos, configuracion,
+                                                      metricas if metricas is not None else Metricas()))
+    elif procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            resumenes = list(ejecutor.map(procesar_estacion, archivos, repeat(configuracion)))
+    else:
+        resumenes = [procesar_estacion(ruta, configuracion) for ruta in archivos]
+    
+    for resumen in resumenes:
+        registros = resumen.pop("metricas")
+        if metricas is not None:
+            metricas.extender(registros)
+    return resumenes
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Calculadora ET₀ por lotes sin interfaz gráfica")
+    parser.add_argument("archivos", nargs="+", help="Archivos de estación (CSV o Parquet)")
+    parser.add_argument("--config", help="Archivo JSON de configuración")
+    parser.add_argument("--metodos", help="Métodos separados por comas (por defecto todos)")
+    parser.add_argument("--tamano-bloque", type=int, help="Filas leídas por bloque")
+    parser.add_argument("--procesos", type=int, help="Archivos procesados a la vez")
+    parser.add_argument("--formato", choices=FORMATOS, help="Formato de salida")
+    parser.add_argument("--salida", help="Carpeta de salida")
+    parser.add_argument("--backend", choices=BACKENDS, help="Backend del motor")
+    parser.add_argument("--z", type=float, help="Elevación [m] (si el archivo no la trae)")
+    parser.add_argument("--lat", type=float, help="Latitud [°] (si el archivo no la trae)")
+    parser.add_argument("--metricas", help="Ruta .json o .csv para la traza de tiempos")
+    parser.add_argument("--historial", help="Archivo SQLite con los resultados y el estado de las estaciones")
+    parser.add_argument("--incremental", action="store_true", default=None,
+                        help="Calcular solo los días posteriores al último procesado de cada estación")
+    parser.add_argument("--lectores", type=int,
+                        help="Archivos leídos a la vez (asyncio); --procesos pasa a ser hilos de cálculo")
+    return parser
+
+
+def main(argumentos=None):
+    args = crear_parser().parse_args(argumentos)
+    metodos = [m for m in args.metodos.split(",") if m] if args.metodos else None
+    try:
+        configuracion = cargar_configuracion(
+            args.config, metodos=metodos, tamano_bloque=args.tamano_bloque, procesos=args.procesos,
+            formato=args.formato, salida=args.salida, backend=args.backend, z=args.z, lat=args.lat,
+            metricas=args.metricas, historial=args.historial, incremental=args.incremental,
+            lectores=args.lectores)
+    except (OSError, ValueError) as e:
+        print(f"❌ Configuración inválida: {e}", file=sys.stderr)
+        return 2
+    
+    metricas = Metricas()
+    resumenes = ejecutar(args.archivos, configuracion, metricas)
+    for resumen in resumenes:
+        if resumen["error"] is not None:
+            print(f"❌ {resumen['estacion']}: {resumen['error']}", file=sys.stderr)
+            continue
+        texto = f"✅ {resumen['estacion']}: {resumen['filas']} filas en {resumen['segundos']:.2f} s"
+        if resumen["errores"]:
+            texto += f" ({len(resumen['errores'])} métodos con errores)"
+        if resumen["control_calidad"]["filas_con_problemas"]:
+            texto += f" ({resumen['control_calidad']['filas_con_problemas']} filas con control de calidad)"
+        print(texto)
+    
+    if configuracion["metricas"]:
+        metricas.exportar(configuracion["metricas"])
+    return 1 if any(resumen["error"] is not None for resumen in resumenes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
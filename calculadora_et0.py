@@ -26,9 +26,19 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, scrolledtext
 import csv
 import datetime
-import pandas as pd
+import importlib.util
 import os
 import sys
+import threading
+import queue
+
+from fuente_resultados import FuenteResultadosET0
+from metodos_et import METODOS_ET
+from metricas import Metricas
+from tabla_virtual import TablaVirtual
+
+# Estación con la que se guardan en el historial los cálculos hechos en la ventana
+ESTACION_CALCULADORA = "calculadora"
 
 # Configuración del tema de customtkinter
 ctk.set_appearance_mode("light")
@@ -48,165 +58,23 @@ class CalculadoraET0Comparativa:
         self.metodo_balance = "pm_fao56"  # Método para balance hídrico
         self.resultado_balance = None
         
-        # MÉTODOS CORREGIDOS Y COMPLETOS - 20 MÉTODOS OFICIALES PyET
-        self.metodos_et = {
-            # 🏆 MÉTODOS PENMAN-MONTEITH (Datos completos - máxima precisión)
-            "pm_fao56": {
-                "nombre": "FAO-56 Penman-Monteith",
-                "funcion": "pm_fao56",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
-                "descripcion": "🏆 Estándar internacional FAO-56. Máxima precisión (rs=70 s/m)",
-                "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"]
-            },
-            "penman": {
-                "nombre": "Penman Original (1948)",
-                "funcion": "penman",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
-                "descripcion": "🏆 Método Penman original clásico. Base histórica PM",
-                "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"]
-            },
-            "pm": {
-                "nombre": "Penman-Monteith Genérico",
-                "funcion": "pm",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
-                "descripcion": "🏆 PM genérico configurable. Investigación avanzada",
-                "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"]
-            },
-            "pm_asce": {
-                "nombre": "ASCE Penman-Monteith",
-                "funcion": "pm_asce",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
-                "descripcion": "🏆 ASCE estándar americano. etype='os' (pasto) / 'rs' (alfalfa)",
-                "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"]
-            },
-            "kimberly_penman": {
-                "nombre": "Kimberly-Penman",
-                "funcion": "kimberly_penman",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
-                "descripcion": "🏆 Variante Penman con corrección estacional de viento",
-                "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"]
-            },
-            "thom_oliver": {
-                "nombre": "Thom-Oliver",
-                "funcion": "thom_oliver",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
-                "descripcion": "🏆 Variante PM con resistencias superficiales variables",
-                "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"]
-            },
-            
-            # ☀️ MÉTODOS BASADOS EN RADIACIÓN (Sin viento/humedad)
-            "priestley_taylor": {
-                "nombre": "Priestley-Taylor",
-                "funcion": "priestley_taylor",
-                "requerimientos": ["t_min", "t_max", "rs", "z", "lat"],
-                "descripcion": "☀️ Alpha=1.26. Ideal para zonas húmedas (humedad opcional)",
-                "parametros_pyet": ["tmean", "rs", "elevation", "lat", "tmax", "tmin"]
-            },
-            "makkink": {
-                "nombre": "Makkink",
-                "funcion": "makkink",
-                "requerimientos": ["t_min", "t_max", "rs", "z"],
-                "descripcion": "☀️ Método holandés. Climas templados europeos",
-                "parametros_pyet": ["tmean", "rs", "elevation"]
-            },
-            "makkink_knmi": {
-                "nombre": "Makkink KNMI",
-                "funcion": "makkink_knmi",
-                "requerimientos": ["t_min", "t_max", "rs"],
-                "descripcion": "☀️ Versión oficial instituto meteorológico holandés",
-                "parametros_pyet": ["tmean", "rs"]
-            },
-            "jensen_haise": {
-                "nombre": "Jensen-Haise",
-                "funcion": "jensen_haise", 
-                "requerimientos": ["t_min", "t_max", "rs"],
-                "descripcion": "☀️ Optimizado para zonas áridas/riego. Oeste EE.UU.",
-                "parametros_pyet": ["tmean", "rs"]
-            },
-            "abtew": {
-                "nombre": "Abtew",
-                "funcion": "abtew",
-                "requerimientos": ["t_min", "t_max", "rs"],
-                "descripcion": "☀️ Simplificado para regiones tropicales. K=0.53",
-                "parametros_pyet": ["tmean", "rs"]
-            },
-            
-            # 🌡️ MÉTODOS SIMPLES (Solo temperatura)
-            "hargreaves": {
-                "nombre": "Hargreaves",
-                "funcion": "hargreaves",
-                "requerimientos": ["t_min", "t_max", "lat"],
-                "descripcion": "🌡️ Solo temperatura. Más robusto para datos limitados",
-                "parametros_pyet": ["tmean", "tmax", "tmin", "lat"]
-            },
-            "mcguinness_bordne": {
-                "nombre": "McGuinness-Bordne",
-                "funcion": "mcguinness_bordne",
-                "requerimientos": ["t_min", "t_max", "lat"],
-                "descripcion": "🌡️ Basado en temperatura y radiación extraterrestre",
-                "parametros_pyet": ["tmean", "lat"]
-            },
-            "hamon": {
-                "nombre": "Hamon",
-                "funcion": "hamon",
-                "requerimientos": ["t_min", "t_max", "lat"],
-                "descripcion": "🌡️ Muy simple. Solo temperatura y ubicación",
-                "parametros_pyet": ["tmean", "lat"]
-            },
-            "oudin": {
-                "nombre": "Oudin",
-                "funcion": "oudin",
-                "requerimientos": ["t_min", "t_max", "lat"],
-                "descripcion": "🌡️ Francés simplificado. Formula: Ra*(T+5)/(λ*100)",
-                "parametros_pyet": ["tmean", "lat"]
-            },
-            "linacre": {
-                "nombre": "Linacre",
-                "funcion": "linacre",
-                "requerimientos": ["t_min", "t_max", "z", "lat"],
-                "descripcion": "🗻 Australiano. Incluye corrección por altitud (lat en grados)",
-                "parametros_pyet": ["tmean", "tmax", "tmin", "elevation", "lat"]
-            },
-            
-            # 💧 MÉTODOS CON HUMEDAD
-            "turc": {
-                "nombre": "Turc",
-                "funcion": "turc",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs"],
-                "descripcion": "💧 Incluye corrección por humedad <50%. Regiones húmedas",
-                "parametros_pyet": ["tmean", "rs", "rh"]
-            },
-            "romanenko": {
-                "nombre": "Romanenko",
-                "funcion": "romanenko",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max"],
-                "descripcion": "💧 Fórmula rusa: 4.5*(1+T/25)²*(1-ea/es)",
-                "parametros_pyet": ["tmean", "rh", "tmax", "tmin"]
-            },
-            "haude": {
-                "nombre": "Haude",
-                "funcion": "haude",
-                "requerimientos": ["t_max", "rh_min"],
-                "descripcion": "💨 Alemán muy simple. Solo T_max y RH_min",
-                "parametros_pyet": ["tmean", "rh"]
-            },
-            
-            # 🔬 MÉTODOS ESPECIALIZADOS
-            "fao_24": {
-                "nombre": "FAO-24 Radiation",
-                "funcion": "fao_24",
-                "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z"],
-                "descripcion": "📊 FAO-24 con corrección radiativa y viento",
-                "parametros_pyet": ["tmean", "wind", "rs", "rh", "elevation"]
-            },
-            "blaney_criddle": {
-                "nombre": "Blaney-Criddle",
-                "funcion": "blaney_criddle",
-                "requerimientos": ["t_min", "t_max", "lat"],
-                "descripcion": "🌾 Clásico para riego. Basado en horas de luz y temperatura",
-                "parametros_pyet": ["tmean", "lat"]
-            }
-        }
+        # Cálculo en segundo plano (hilo de trabajo + cola de eventos)
+        self.hilo_fondo = None
+        self.cancelar_fondo = None
+        self.tarea_fondo = 0  # Número de la tarea actual: los eventos de tareas anteriores se descartan
+        self.cola_fondo = None
+        self.metodos_corrida = []
+        
+        # Tiempos y fallas por método y etapa (menú Archivo → Guardar métricas)
+        self.metricas = Metricas()
+        
+        # Historial de resultados en SQLite, caché en disco y memoria de cálculos puntuales (al primer uso)
+        self.almacen = None
+        self.cache = None
+        self.memoria = None
+        
+        # MÉTODOS CORREGIDOS Y COMPLETOS - 20 MÉTODOS OFICIALES PyET (ver motor_et0)
+        self.metodos_et = METODOS_ET
         
         # Verificar si pyet está disponible
         self.pyet_disponible = self.verificar_pyet()
@@ -214,12 +82,8 @@ class CalculadoraET0Comparativa:
         self.crear_interfaz()
         
     def verificar_pyet(self):
-        """Verificar si la librería pyet está instalada"""
-        try:
-            import pyet
-            return True
-        except ImportError:
-            return False
+        """Verificar si la librería pyet está instalada (sin importarla todavía)"""
+        return importlib.util.find_spec("pyet") is not None
     
     def crear_interfaz(self):
         """Crear todos los elementos de la interfaz"""
@@ -230,8 +94,34 @@ class CalculadoraET0Comparativa:
         self.crear_botones()
         self.crear_resultados_comparativos()
         self.crear_selector_balance()
-        self.crear_tabla_balance_hidrico()
-        self.crear_documentacion()
+        
+        # Secciones fuera de pantalla: se construyen la primera vez que se abren
+        self.crear_seccion_diferida("💧 Balance Hídrico", self.crear_tabla_balance_hidrico)
+        self.crear_seccion_diferida("📚 Documentación", self.crear_documentacion)
+    
+    def crear_seccion_diferida(self, titulo, constructor):
+        """Crear un contenedor plegable cuyo contenido se construye al abrirlo"""
+        contenedor = ctk.CTkFrame(self.frame_principal, fg_color="transparent")
+        contenedor.pack(fill="x", padx=20, pady=(10, 0))
+        cuerpo = ctk.CTkFrame(contenedor, fg_color="transparent")
+        estado = {"construida": False, "visible": False}
+        
+        def alternar():
+            if not estado["construida"]:
+                constructor(cuerpo)
+                estado["construida"] = True
+            if estado["visible"]:
+                cuerpo.pack_forget()
+                boton.configure(text=f"▶ {titulo}")
+            else:
+                cuerpo.pack(fill="both", expand=True)
+                boton.configure(text=f"▼ {titulo}")
+            estado["visible"] = not estado["visible"]
+        
+        boton = ctk.CTkButton(contenedor, text=f"▶ {titulo}", command=alternar,
+                              height=32, anchor="w",
+                              font=ctk.CTkFont(size=14, weight="bold"))
+        boton.pack(fill="x")
         
     def crear_menu(self):
         """Crear barra de menú"""
@@ -241,7 +131,10 @@ class CalculadoraET0Comparativa:
         # Menú Archivo
         menu_archivo = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Archivo", menu=menu_archivo)
+        menu_archivo.add_command(label="Procesar archivo de estación...", command=self.procesar_archivo_estacion)
         menu_archivo.add_command(label="Exportar CSV", command=self.exportar_csv)
+        menu_archivo.add_command(label="Exportar historial guardado...", command=self.exportar_historial)
+        menu_archivo.add_command(label="Guardar métricas de rendimiento...", command=self.guardar_metricas)
         menu_archivo.add_separator()
         menu_archivo.add_command(label="Salir", command=self.ventana.quit)
         
@@ -346,7 +239,7 @@ class CalculadoraET0Comparativa:
     def seleccionar_metodos_pm(self):
         """Seleccionar métodos Penman-Monteith"""
         metodos_pm = ["pm_fao56", "penman", "pm", "pm_asce", "kimberly_penman", "thom_oliver"]
-        self.limpiar_seleccion_metodos()
+        self.desmarcar_metodos()
         for metodo in metodos_pm:
             if metodo in self.checkboxes_metodos:
                 self.checkboxes_metodos[metodo].set(True)
@@ -355,7 +248,7 @@ class CalculadoraET0Comparativa:
     def seleccionar_metodos_radiacion(self):
         """Seleccionar métodos basados en radiación"""
         metodos_rad = ["priestley_taylor", "makkink", "makkink_knmi", "jensen_haise", "abtew"]
-        self.limpiar_seleccion_metodos()
+        self.desmarcar_metodos()
         for metodo in metodos_rad:
             if metodo in self.checkboxes_metodos:
                 self.checkboxes_metodos[metodo].set(True)
@@ -364,7 +257,7 @@ class CalculadoraET0Comparativa:
     def seleccionar_metodos_temperatura(self):
         """Seleccionar métodos basados en temperatura"""
         metodos_temp = ["hargreaves", "mcguinness_bordne", "hamon", "oudin", "linacre"]
-        self.limpiar_seleccion_metodos()
+        self.desmarcar_metodos()
         for metodo in metodos_temp:
             if metodo in self.checkboxes_metodos:
                 self.checkboxes_metodos[metodo].set(True)
@@ -373,16 +266,20 @@ class CalculadoraET0Comparativa:
     def seleccionar_metodos_humedad(self):
         """Seleccionar métodos que incluyen humedad"""
         metodos_hum = ["turc", "romanenko", "haude"]
-        self.limpiar_seleccion_metodos()
+        self.desmarcar_metodos()
         for metodo in metodos_hum:
             if metodo in self.checkboxes_metodos:
                 self.checkboxes_metodos[metodo].set(True)
         self.actualizar_metodos_seleccionados()
     
-    def limpiar_seleccion_metodos(self):
-        """Limpiar selección de métodos"""
+    def desmarcar_metodos(self):
+        """Desmarcar todas las casillas sin actualizar todavía la interfaz"""
         for var in self.checkboxes_metodos.values():
             var.set(False)
+    
+    def limpiar_seleccion_metodos(self):
+        """Limpiar selección de métodos"""
+        self.desmarcar_metodos()
         self.actualizar_metodos_seleccionados()
     
     def actualizar_metodos_seleccionados(self):
@@ -403,21 +300,20 @@ class CalculadoraET0Comparativa:
         
         self.label_seleccionados.configure(text=texto)
         
+        # Un cálculo en curso ya no corresponde a la nueva selección
+        self.cancelar_tarea_fondo()
+        
         # Actualizar tabla de variables según los métodos seleccionados
         self.actualizar_tabla_variables_multiple()
         
         # Limpiar resultados de forma segura
         self.resultados_et0.clear()
         try:
-            if hasattr(self, 'frame_tabla_resultados') and self.frame_tabla_resultados.winfo_exists():
-                for widget in self.frame_tabla_resultados.winfo_children():
-                    try:
-                        if widget.winfo_exists():
-                            widget.destroy()
-                    except:
-                        pass
+            if hasattr(self, 'tabla_resultados'):
+                self.tabla_resultados.limpiar()
+                self.label_stats_resultados.configure(text="")
         except Exception as e:
-            print(f"Error limpiando widgets: {e}")
+            print(f"Error limpiando resultados: {e}")
     
     def crear_tabla_variables(self):
         """Crear la tabla para variables meteorológicas"""
@@ -432,71 +328,92 @@ class CalculadoraET0Comparativa:
         self.frame_variables = ctk.CTkFrame(self.frame_tabla)
         self.frame_variables.pack(fill="x", padx=10, pady=10)
         
+        self.label_info_variables = ctk.CTkLabel(self.frame_variables, text="",
+                                                font=ctk.CTkFont(size=12, weight="bold"))
+        self.label_info_variables.pack(pady=5)
+        
+        # Variables
+        self.variables_info = {
+            "t_min": ("Temperatura Mínima", "°C"),
+            "t_max": ("Temperatura Máxima", "°C"),
+            "rh_min": ("Humedad Relativa Mínima", "%"),
+            "rh_max": ("Humedad Relativa Máxima", "%"),
+            "rs": ("Radiación Solar", "MJ/m²/día"),
+            "uz": ("Velocidad del Viento", "m/s"),
+            "z": ("Altitud", "m"),
+            "lat": ("Latitud", "grados")
+        }
+        self.filas_variables = {}  # var_name -> frame de la fila
+        self.valores_recordados = {}  # Valores de filas retiradas, para restaurarlos
+        
         self.actualizar_tabla_variables_multiple()
     
     def actualizar_tabla_variables_multiple(self):
-        """Actualizar tabla de variables para métodos múltiples"""
-        for widget in self.frame_variables.winfo_children():
-            widget.destroy()
-        
-        self.variables.clear()
-        
-        if not self.metodos_seleccionados:
-            label_info = ctk.CTkLabel(self.frame_variables, 
-                                     text="Seleccione al menos un método para ver las variables requeridas",
-                                     font=ctk.CTkFont(size=12))
-            label_info.pack(pady=20)
-            return
+        """Actualizar tabla de variables para métodos múltiples
         
+        Solo se agregan o quitan las filas de las variables que cambiaron; las
+        filas que siguen siendo necesarias conservan lo que el usuario escribió.
+        """
         # Determinar todas las variables necesarias
         variables_necesarias = set()
         for metodo in self.metodos_seleccionados:
             variables_necesarias.update(self.metodos_et[metodo]["requerimientos"])
+        variables_necesarias &= set(self.variables_info)
+        
+        actuales = set(self.filas_variables)
         
-        variables_necesarias = sorted(list(variables_necesarias))
+        # Quitar filas que ya no se requieren (recordando su valor)
+        for var_name in actuales - variables_necesarias:
+            self.valores_recordados[var_name] = self.variables[var_name].get()
+            self.filas_variables.pop(var_name).destroy()
+            del self.variables[var_name]
+        
+        # Agregar filas nuevas en su posición ordenada
+        for var_name in sorted(variables_necesarias - actuales):
+            siguiente = next((self.filas_variables[v] for v in sorted(self.filas_variables) if v > var_name), None)
+            self.crear_fila_variable(var_name, antes_de=siguiente)
+        self.variables = {var_name: self.variables[var_name] for var_name in sorted(self.variables)}
         
         # Info de métodos y variables
-        info_text = f"Métodos: {len(self.metodos_seleccionados)} | Variables requeridas: {len(variables_necesarias)}"
-        label_info = ctk.CTkLabel(self.frame_variables, text=info_text,
-                                 font=ctk.CTkFont(size=12, weight="bold"))
-        label_info.pack(pady=5)
+        if not self.metodos_seleccionados:
+            self.label_info_variables.configure(
+                text="Seleccione al menos un método para ver las variables requeridas",
+                font=ctk.CTkFont(size=12))
+        else:
+            info_text = f"Métodos: {len(self.metodos_seleccionados)} | Variables requeridas: {len(variables_necesarias)}"
+            self.label_info_variables.configure(text=info_text, font=ctk.CTkFont(size=12, weight="bold"))
+    
+    def crear_fila_variable(self, var_name, antes_de=None):
+        """Crear la fila de entrada de una variable meteorológica"""
+        descripcion, unidad = self.variables_info[var_name]
         
-        # Variables
-        variables_info = {
-            "t_min": ("Temperatura Mínima", "°C"),
-            "t_max": ("Temperatura Máxima", "°C"),
-            "rh_min": ("Humedad Relativa Mínima", "%"),
-            "rh_max": ("Humedad Relativa Máxima", "%"),
-            "rs": ("Radiación Solar", "MJ/m²/día"),
-            "uz": ("Velocidad del Viento", "m/s"),
-            "z": ("Altitud", "m"),
-            "lat": ("Latitud", "grados")
-        }
+        frame_var = ctk.CTkFrame(self.frame_variables)
+        if antes_de is not None:
+            frame_var.pack(fill="x", padx=5, pady=2, before=antes_de)
+        else:
+            frame_var.pack(fill="x", padx=5, pady=2)
         
-        for var_name in variables_necesarias:
-            if var_name in variables_info:
-                descripcion, unidad = variables_info[var_name]
-                
-                frame_var = ctk.CTkFrame(self.frame_variables)
-                frame_var.pack(fill="x", padx=5, pady=2)
-                
-                label_var = ctk.CTkLabel(frame_var, text=f"{var_name}:",
-                                        font=ctk.CTkFont(size=11, weight="bold"),
-                                        width=100)
-                label_var.pack(side="left", padx=5, pady=5)
-                
-                label_desc = ctk.CTkLabel(frame_var, text=descripcion,
-                                         font=ctk.CTkFont(size=11), width=200)
-                label_desc.pack(side="left", padx=5, pady=5)
-                
-                entry_valor = ctk.CTkEntry(frame_var, placeholder_text=f"Valor en {unidad}",
-                                          font=ctk.CTkFont(size=11), width=120)
-                entry_valor.pack(side="left", padx=5, pady=5)
-                self.variables[var_name] = entry_valor
-                
-                label_unidad = ctk.CTkLabel(frame_var, text=unidad,
-                                           font=ctk.CTkFont(size=11), width=80)
-                label_unidad.pack(side="left", padx=5, pady=5)
+        label_var = ctk.CTkLabel(frame_var, text=f"{var_name}:",
+                                font=ctk.CTkFont(size=11, weight="bold"),
+                                width=100)
+        label_var.pack(side="left", padx=5, pady=5)
+        
+        label_desc = ctk.CTkLabel(frame_var, text=descripcion,
+                                 font=ctk.CTkFont(size=11), width=200)
+        label_desc.pack(side="left", padx=5, pady=5)
+        
+        entry_valor = ctk.CTkEntry(frame_var, placeholder_text=f"Valor en {unidad}",
+                                  font=ctk.CTkFont(size=11), width=120)
+        entry_valor.pack(side="left", padx=5, pady=5)
+        if self.valores_recordados.get(var_name):
+            entry_valor.insert(0, self.valores_recordados[var_name])
+        self.variables[var_name] = entry_valor
+        
+        label_unidad = ctk.CTkLabel(frame_var, text=unidad,
+                                   font=ctk.CTkFont(size=11), width=80)
+        label_unidad.pack(side="left", padx=5, pady=5)
+        
+        self.filas_variables[var_name] = frame_var
     
     def crear_botones(self):
         """Crear botones de acción"""
@@ -510,6 +427,14 @@ class CalculadoraET0Comparativa:
                                          font=ctk.CTkFont(size=14, weight="bold"))
         self.btn_calcular.pack(side="left", padx=10, pady=10)
         
+        self.btn_cancelar = ctk.CTkButton(frame_botones, 
+                                         text="⏹️ Cancelar",
+                                         command=self.cancelar_tarea_fondo,
+                                         state="disabled",
+                                         height=40,
+                                         font=ctk.CTkFont(size=14))
+        self.btn_cancelar.pack(side="left", padx=10, pady=10)
+        
         btn_limpiar = ctk.CTkButton(frame_botones, 
                                    text="🗑️ Limpiar",
                                    command=self.limpiar_campos,
@@ -530,6 +455,18 @@ class CalculadoraET0Comparativa:
                                        text_color="red",
                                        font=ctk.CTkFont(size=12))
             mensaje_pyet.pack(pady=5)
+        
+        # Progreso del cálculo en segundo plano
+        frame_progreso = ctk.CTkFrame(self.frame_principal)
+        frame_progreso.pack(fill="x", padx=20, pady=(0, 10))
+        
+        self.barra_progreso = ctk.CTkProgressBar(frame_progreso)
+        self.barra_progreso.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+        self.barra_progreso.set(0)
+        
+        self.label_progreso = ctk.CTkLabel(frame_progreso, text="Listo",
+                                          font=ctk.CTkFont(size=12), width=300)
+        self.label_progreso.pack(side="left", padx=10, pady=10)
     
     def crear_resultados_comparativos(self):
         """Crear sección de resultados comparativos"""
@@ -541,8 +478,15 @@ class CalculadoraET0Comparativa:
                                         font=ctk.CTkFont(size=16, weight="bold"))
         titulo_resultados.pack(pady=10)
         
-        self.frame_tabla_resultados = ctk.CTkScrollableFrame(self.frame_resultados, height=300)
-        self.frame_tabla_resultados.pack(fill="both", expand=True, padx=10, pady=10)
+        # Tabla virtualizada: filas fijas que se reutilizan al desplazarse
+        self.tabla_resultados = TablaVirtual(self.frame_resultados, filas_visibles=12)
+        self.tabla_resultados.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tabla_resultados.limpiar()
+        
+        self.label_stats_resultados = ctk.CTkLabel(self.frame_resultados, text="",
+                                                  font=ctk.CTkFont(size=12, weight="bold"),
+                                                  text_color="blue")
+        self.label_stats_resultados.pack(pady=5)
         
         self.label_estado_resultados = ctk.CTkLabel(self.frame_resultados,
                                                    text="Seleccione métodos y calcule ET₀ para ver resultados",
@@ -585,11 +529,11 @@ class CalculadoraET0Comparativa:
                                                 text_color="blue")
         self.label_metodo_balance.pack(pady=5)
     
-    def crear_tabla_balance_hidrico(self):
+    def crear_tabla_balance_hidrico(self, contenedor):
         """Crear la tabla para balance hídrico"""
         # Frame para balance hídrico
-        self.frame_balance = ctk.CTkFrame(self.frame_principal)
-        self.frame_balance.pack(fill="x", padx=20, pady=10)
+        self.frame_balance = ctk.CTkFrame(contenedor)
+        self.frame_balance.pack(fill="x", pady=10)
         
         # Título de la sección
         titulo_balance = ctk.CTkLabel(self.frame_balance, 
@@ -701,8 +645,6 @@ class CalculadoraET0Comparativa:
     def calcular_et0_multiple(self):
         """Calcular ET₀ para múltiples métodos seleccionados"""
         try:
-            print("🔍 DEBUG: Iniciando cálculo ET₀...")
-            
             if not self.pyet_disponible:
                 messagebox.showerror("Error", 
                                    "La librería 'pyet' no está instalada.\n\n"
@@ -714,336 +656,385 @@ class CalculadoraET0Comparativa:
                 messagebox.showerror("Error", "Seleccione al menos un método para calcular")
                 return
             
-            # Advertencia para muchos métodos
-            if len(self.metodos_seleccionados) > 15:
-                from tkinter import messagebox as mb
-                respuesta = mb.askyesno("Advertencia", 
-                                      f"Seleccionó {len(self.metodos_seleccionados)} métodos. "
-                                      "Esto puede tomar tiempo y usar mucha memoria.\n\n"
-                                      "¿Desea continuar?")
-                if not respuesta:
-                    return
-            
-            print(f"🔍 DEBUG: Métodos seleccionados: {self.metodos_seleccionados}")
-            print(f"🔍 DEBUG: Variables disponibles: {list(self.variables.keys())}")
-            
             # Obtener valores de las entradas
             valores = {}
-            for var_name, entry in self.variables.items():
-                valor_str = entry.get().strip()
-                print(f"🔍 DEBUG: {var_name} = '{valor_str}'")
-                
-                if not valor_str:
-                    messagebox.showerror("Error", f"Por favor ingrese un valor para {var_name}")
-                    return
-                
-                try:
-                    valores[var_name] = float(valor_str)
-                except ValueError:
-                    messagebox.showerror("Error", f"Valor inválido para {var_name}: {valor_str}")
-                    return
+            with self.metricas.medir("lectura", filas=1) as medicion:
+                for var_name, entry in self.variables.items():
+                    valor_str = entry.get().strip()
+                    
+                    if not valor_str:
+                        medicion["error"] = f"Sin valor para {var_name}"
+                        messagebox.showerror("Error", f"Por favor ingrese un valor para {var_name}")
+                        return
+                    
+                    try:
+                        valores[var_name] = float(valor_str)
+                    except ValueError:
+                        medicion["error"] = f"Valor inválido para {var_name}: {valor_str}"
+                        messagebox.showerror("Error", f"Valor inválido para {var_name}: {valor_str}")
+                        return
             
             # Validar rangos lógicos
-            if not self.validar_valores(valores):
-                return
+            with self.metricas.medir("validacion", filas=1) as medicion:
+                if not self.validar_valores(valores):
+                    medicion["error"] = "Valores fuera de rango"
+                    return
             
-            # Calcular ET₀ para cada método seleccionado
-            import pyet
+            if self.tarea_fondo_en_curso():
+                messagebox.showwarning("Advertencia", "Ya hay un cálculo en curso")
+                return
             
+            # Calcular ET₀ en segundo plano para no congelar la ventana
+            metodos = list(self.metodos_seleccionados)
+            self.metodos_corrida = metodos
             self.resultados_et0.clear()
-            resultados_exitosos = []
-            errores = []
-            
-            for metodo_id in self.metodos_seleccionados:
-                try:
-                    resultado = self.calcular_metodo_individual(metodo_id, valores, pyet)
-                    if resultado is not None:
-                        self.resultados_et0[metodo_id] = resultado
-                        resultados_exitosos.append((metodo_id, resultado))
-                    else:
-                        errores.append((metodo_id, "Resultado None"))
-                except Exception as e:
-                    error_msg = str(e)
-                    errores.append((metodo_id, error_msg))
-                    print(f"Error en {metodo_id}: {error_msg}")
+            self.resultados_exitosos_corrida = []
+            self.errores_corrida = []
+            
+            # Los métodos ya calculados con estas entradas se muestran sin pasar por el hilo
+            from cache_et0 import clave_memoria
+            
+            memoria = self.obtener_memoria()
+            claves_memoria = {metodo_id: clave_memoria(metodo_id, valores) for metodo_id in metodos}
+            pendientes = []
+            for metodo_id in metodos:
+                resultado = memoria.obtener(claves_memoria[metodo_id])
+                if resultado is None:
+                    pendientes.append(metodo_id)
+                else:
+                    self.al_completar_metodo(metodo_id, resultado, None,
+                                             len(metodos) - len(pendientes), len(metodos))
+            if not pendientes:
+                self.al_terminar_calculo(False, None)
+                return
+            ya_listos = len(metodos) - len(pendientes)
             
-            # Mostrar resultados
-            self.mostrar_resultados_comparativos(resultados_exitosos, errores)
+            cache = self.obtener_cache()
             
-            # Actualizar selector de balance
-            self.actualizar_selector_balance()
+            def trabajo(publicar, cancelado):
+                from cache_et0 import huella_entrada
+                
+                # Los métodos ya calculados con estas mismas entradas se leen del caché
+                huella = huella_entrada({var: [valor] for var, valor in valores.items() if var not in ("z", "lat")},
+                                        None, valores.get("z"), valores.get("lat"))
+                intermedios = None
+                
+                for i, metodo_id in enumerate(pendientes, ya_listos + 1):
+                    if cancelado.is_set():
+                        return
+                    clave = cache.clave(huella, metodo_id, "interfaz")
+                    guardado = cache.obtener(clave)
+                    if guardado is not None:
+                        memoria.guardar(claves_memoria[metodo_id], float(guardado[0]))
+                        publicar(metodo_id, float(guardado[0]), None, i, len(metodos))
+                        continue
+                    
+                    if intermedios is None:
+                        # pyet (y pandas) se importan en el primer cálculo, fuera del hilo de la ventana
+                        import pyet
+                        
+                        # Variables intermedias compartidas por los métodos de esta corrida
+                        with self.metricas.medir("calculo", filas=1):
+                            intermedios = self.preparar_intermedios(valores, pyet)
+                    
+                    with self.metricas.medir("calculo", metodo_id, filas=1) as medicion:
+                        try:
+                            resultado = self.calcular_metodo_individual(metodo_id, valores, pyet, intermedios)
+                            error = None if resultado is not None else "Resultado None"
+                        except Exception as e:
+                            resultado, error = None, str(e)
+                        medicion["error"] = error
+                    if error is None:
+                        memoria.guardar(claves_memoria[metodo_id], resultado)
+                        cache.guardar(clave, [resultado])
+                    publicar(metodo_id, resultado, error, i, len(metodos))
+            
+            self.iniciar_tarea_fondo(trabajo, self.al_completar_metodo, self.al_terminar_calculo,
+                                     f"⏳ Calculando {len(pendientes)} de {len(metodos)} métodos...")
             
         except Exception as e:
             messagebox.showerror("Error", f"Error general en el cálculo:\n{str(e)}")
-            print(f"Error general: {str(e)}")
     
-    def calcular_metodo_individual(self, metodo_id, valores, pyet):
-        """Calcular ET₀ para un método individual"""
-        try:
-            # Crear fecha dummy
-            fecha = pd.date_range('2023-01-01', periods=1, freq='D')
-            
-            # Preparar argumentos básicos
-            argumentos = {}
-            
-            # Temperatura media
-            if 't_min' in valores and 't_max' in valores:
-                tmean = (valores['t_max'] + valores['t_min']) / 2
-                argumentos['tmean'] = pd.Series([tmean], index=fecha)
-                argumentos['tmax'] = pd.Series([valores['t_max']], index=fecha)
-                argumentos['tmin'] = pd.Series([valores['t_min']], index=fecha)
-            
-            # Humedad relativa
-            if 'rh_min' in valores and 'rh_max' in valores:
-                argumentos['rhmax'] = pd.Series([valores['rh_max']], index=fecha)
-                argumentos['rhmin'] = pd.Series([valores['rh_min']], index=fecha)
-                argumentos['rh'] = pd.Series([(valores['rh_max'] + valores['rh_min']) / 2], index=fecha)
-            elif 'rh_min' in valores:
-                argumentos['rh'] = pd.Series([valores['rh_min']], index=fecha)
-            
-            # Radiación solar
-            if 'rs' in valores:
-                argumentos['rs'] = pd.Series([valores['rs']], index=fecha)
-            
-            # Viento
-            if 'uz' in valores:
-                argumentos['wind'] = pd.Series([valores['uz']], index=fecha)
-            
-            # Elevación
-            if 'z' in valores:
-                argumentos['elevation'] = valores['z']
-            
-            # Latitud
-            if 'lat' in valores:
-                argumentos['lat'] = valores['lat']
-                import math
-                argumentos['lat_rad'] = math.radians(valores['lat'])
-            
-            # Obtener función PyET
-            funcion_pyet = getattr(pyet, self.metodos_et[metodo_id]['funcion'])
-            
-            # Ejecutar según método específico
-            if metodo_id == 'hargreaves':
-                et0_result = funcion_pyet(
-                    tmin=argumentos['tmin'],
-                    tmax=argumentos['tmax'],
-                    tmean=argumentos['tmean'],
-                    lat=argumentos['lat_rad']
-                )
-            elif metodo_id in ['hamon', 'mcguinness_bordne', 'oudin', 'blaney_criddle']:
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    lat=argumentos['lat_rad']
-                )
-            elif metodo_id == 'haude':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmax'] if 't_max' in valores else argumentos['tmean'],
-                    rh=argumentos['rh']
-                )
-            elif metodo_id == 'turc':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    rs=argumentos['rs'],
-                    rh=argumentos['rh']
-                )
-            elif metodo_id == 'romanenko':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    rh=argumentos['rh'],
-                    tmax=argumentos['tmax'],
-                    tmin=argumentos['tmin']
-                )
-            elif metodo_id == 'linacre':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    elevation=argumentos['elevation'],
-                    lat=argumentos['lat_rad'],
-                    tmax=argumentos['tmax'],
-                    tmin=argumentos['tmin']
-                )
-            elif metodo_id in ['abtew', 'jensen_haise', 'makkink_knmi']:
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    rs=argumentos['rs']
-                )
-            elif metodo_id == 'makkink':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    rs=argumentos['rs'],
-                    elevation=argumentos['elevation']
-                )
-            elif metodo_id == 'fao_24':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    wind=argumentos['wind'],
-                    rs=argumentos['rs'],
-                    rh=argumentos['rh'],
-                    elevation=argumentos['elevation']
-                )
-            elif metodo_id == 'priestley_taylor':
-                # Priestley-Taylor con manejo especial
-                if 'rhmax' in argumentos and 'rhmin' in argumentos:
-                    et0_result = funcion_pyet(
-                        tmean=argumentos['tmean'],
-                        rs=argumentos['rs'],
-                        elevation=argumentos['elevation'],
-                        lat=argumentos['lat_rad'],
-                        tmax=argumentos['tmax'],
-                        tmin=argumentos['tmin'],
-                        rhmax=argumentos['rhmax'],
-                        rhmin=argumentos['rhmin']
-                    )
-                else:
-                    et0_result = funcion_pyet(
-                        tmean=argumentos['tmean'],
-                        rs=argumentos['rs'],
-                        elevation=argumentos['elevation'],
-                        lat=argumentos['lat_rad'],
-                        tmax=argumentos['tmax'],
-                        tmin=argumentos['tmin'],
-                        rh=pd.Series([65.0], index=argumentos['tmean'].index)
-                    )
-            elif metodo_id == 'pm_asce':
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    wind=argumentos['wind'],
-                    rs=argumentos['rs'],
-                    rhmax=argumentos['rhmax'],
-                    rhmin=argumentos['rhmin'],
-                    elevation=argumentos['elevation'],
-                    lat=argumentos['lat_rad'],
-                    tmax=argumentos['tmax'],
-                    tmin=argumentos['tmin'],
-                    etype="os"
-                )
-            else:
-                # Métodos PM estándar
-                et0_result = funcion_pyet(
-                    tmean=argumentos['tmean'],
-                    wind=argumentos['wind'],
-                    rs=argumentos['rs'],
-                    rhmax=argumentos['rhmax'],
-                    rhmin=argumentos['rhmin'],
-                    elevation=argumentos['elevation'],
-                    lat=argumentos['lat_rad'],
-                    tmax=argumentos['tmax'],
-                    tmin=argumentos['tmin']
-                )
-            
-            return round(et0_result.iloc[0], 3)
-            
-        except Exception as e:
-            raise e
+    def iniciar_tarea_fondo(self, trabajo, al_evento, al_terminar, texto_estado):
+        """Ejecutar un trabajo en un hilo y entregar sus eventos al hilo de la ventana
+        
+        El trabajo recibe publicar(*evento) y un threading.Event de cancelación.
+        Los eventos se encolan y se atienden con ventana.after, de modo que los
+        widgets solo se modifican desde el hilo principal de Tk.
+        
+        Una tarea cancelada que aún no termina no impide iniciar otra: la nueva
+        la reemplaza y lo que la cancelada publique después se descarta.
+        """
+        if self.tarea_fondo_en_curso():
+            messagebox.showwarning("Advertencia", "Ya hay un cálculo en curso")
+            return False
+        
+        self.tarea_fondo += 1
+        tarea = self.tarea_fondo
+        self.cancelar_fondo = threading.Event()
+        self.cola_fondo = queue.Queue()
+        cola, cancelado = self.cola_fondo, self.cancelar_fondo
+        
+        def hilo():
+            try:
+                trabajo(lambda *evento: cola.put(("evento", evento)), cancelado)
+                cola.put(("fin", None))
+            except Exception as e:
+                cola.put(("fin", str(e)))
+        
+        self.btn_calcular.configure(state="disabled")
+        self.btn_cancelar.configure(state="normal")
+        # La barra puede seguir en modo indeterminado si se reemplazó un procesamiento de archivo
+        self.barra_progreso.stop()
+        self.barra_progreso.configure(mode="determinate")
+        self.barra_progreso.set(0)
+        self.label_progreso.configure(text=texto_estado)
+        
+        self.hilo_fondo = threading.Thread(target=hilo, daemon=True)
+        self.hilo_fondo.start()
+        self.ventana.after(50, self.atender_eventos_fondo, tarea, cola, cancelado, al_evento, al_terminar)
+        return True
     
-    def mostrar_resultados_comparativos(self, resultados_exitosos, errores):
-        """Mostrar resultados en tabla comparativa"""
-        try:
-            # Limpiar tabla anterior de forma segura
-            if hasattr(self, 'frame_tabla_resultados') and self.frame_tabla_resultados.winfo_exists():
-                for widget in self.frame_tabla_resultados.winfo_children():
-                    try:
-                        if widget.winfo_exists():
-                            widget.destroy()
-                    except:
-                        pass
-            
-            if not resultados_exitosos and not errores:
-                label_sin_datos = ctk.CTkLabel(self.frame_tabla_resultados,
-                                              text="No hay resultados para mostrar",
-                                              font=ctk.CTkFont(size=12))
-                label_sin_datos.pack(pady=20)
-                return
-        except Exception as e:
-            print(f"Error limpiando tabla: {e}")
+    def tarea_fondo_en_curso(self):
+        """Hay una tarea en segundo plano corriendo que no se ha cancelado"""
+        return (self.hilo_fondo is not None and self.hilo_fondo.is_alive()
+                and not self.cancelar_fondo.is_set())
+    
+    def atender_eventos_fondo(self, tarea, cola, cancelado, al_evento, al_terminar):
+        """Procesar en el hilo de Tk los eventos publicados por el hilo de cálculo"""
+        if tarea != self.tarea_fondo:
+            # Tarea cancelada y reemplazada por otra: ni sus eventos ni su fin se muestran
+            return
+        
+        while True:
+            try:
+                tipo, contenido = cola.get_nowait()
+            except queue.Empty:
+                break
+            
+            if tipo == "evento":
+                # Tras cancelar se descartan los eventos que aún lleguen del hilo
+                if not cancelado.is_set():
+                    al_evento(*contenido)
+                continue
+            
+            # Fin del trabajo (contenido = mensaje de error o None)
+            self.btn_calcular.configure(state="normal")
+            self.btn_cancelar.configure(state="disabled")
+            al_terminar(cancelado.is_set(), contenido)
             return
         
+        self.ventana.after(50, self.atender_eventos_fondo, tarea, cola, cancelado, al_evento, al_terminar)
+    
+    def cancelar_tarea_fondo(self):
+        """Solicitar la cancelación del cálculo en curso (se puede iniciar otro enseguida)"""
+        if self.tarea_fondo_en_curso():
+            self.cancelar_fondo.set()
+            self.btn_calcular.configure(state="normal")
+            self.btn_cancelar.configure(state="disabled")
+            self.label_progreso.configure(text="⏹️ Cancelando...")
+    
+    def al_completar_metodo(self, metodo_id, resultado, error, completados, total):
+        """Registrar el resultado de un método terminado en segundo plano"""
+        if error is None:
+            self.resultados_et0[metodo_id] = resultado
+            self.resultados_exitosos_corrida.append((metodo_id, resultado))
+        else:
+            self.errores_corrida.append((metodo_id, error))
+        
+        self.barra_progreso.set(completados / total)
+        self.label_progreso.configure(text=f"⏳ {completados}/{total}: {self.metodos_et[metodo_id]['nombre']}")
+    
+    def al_terminar_calculo(self, cancelado, error):
+        """Mostrar los resultados (completos o parciales) al terminar el cálculo"""
+        if error is not None:
+            messagebox.showerror("Error", f"Error general en el cálculo:\n{error}")
+        
+        # Cancelado por un cambio de selección: los resultados ya no aplican
+        if cancelado and self.metodos_corrida != self.metodos_seleccionados:
+            self.label_progreso.configure(text="⏹️ Cálculo cancelado")
+            return
+        
+        self.label_progreso.configure(text="⏹️ Cálculo cancelado (resultados parciales)" if cancelado
+                                      else "✅ Cálculo terminado")
+        
+        # Los métodos tomados de la memoria llegan primero: mostrar en el orden de la selección
+        orden = {metodo_id: i for i, metodo_id in enumerate(self.metodos_corrida)}
+        self.resultados_exitosos_corrida.sort(key=lambda par: orden[par[0]])
+        self.errores_corrida.sort(key=lambda par: orden[par[0]])
+        
+        # Mostrar resultados
+        self.mostrar_resultados_comparativos(self.resultados_exitosos_corrida, self.errores_corrida)
+        
+        # Actualizar selector de balance
+        self.actualizar_selector_balance()
+        
+        # Guardar en el historial con la fecha de hoy
+        if self.resultados_exitosos_corrida:
+            self.guardar_en_historial(lambda almacen: almacen.guardar_et0(
+                ESTACION_CALCULADORA, [datetime.date.today()],
+                {metodo_id: [resultado] for metodo_id, resultado in self.resultados_exitosos_corrida}))
+    
+    def obtener_almacen(self):
+        """Abrir el historial de resultados (SQLite) la primera vez que se necesita"""
+        if self.almacen is None:
+            from almacen_resultados import AlmacenResultados
+            self.almacen = AlmacenResultados()
+        return self.almacen
+    
+    def obtener_cache(self):
+        """Abrir el caché de resultados en disco la primera vez que se necesita"""
+        if self.cache is None:
+            from cache_et0 import CacheDiscoET0
+            self.cache = CacheDiscoET0()
+        return self.cache
+    
+    def obtener_memoria(self):
+        """Crear la memoria de cálculos puntuales la primera vez que se necesita"""
+        if self.memoria is None:
+            from cache_et0 import MemoriaLRU
+            self.memoria = MemoriaLRU()
+        return self.memoria
+    
+    def guardar_en_historial(self, guardar):
+        """Ejecutar guardar(almacen); un fallo del historial no interrumpe el cálculo"""
         try:
-            # Encabezados
-            frame_header = ctk.CTkFrame(self.frame_tabla_resultados)
-            frame_header.pack(fill="x", padx=5, pady=5)
-            
-            headers = ["#", "Método", "ET₀ (mm/día)", "Estado", "Categoría"]
-            for i, header in enumerate(headers):
-                label = ctk.CTkLabel(frame_header, text=header,
-                                    font=ctk.CTkFont(size=12, weight="bold"))
-                label.grid(row=0, column=i, padx=5, pady=5, sticky="ew")
-            
-            # Configurar pesos de columnas
-            for i in range(len(headers)):
-                frame_header.grid_columnconfigure(i, weight=1)
+            guardar(self.obtener_almacen())
         except Exception as e:
-            print(f"Error creando encabezados: {e}")
+            messagebox.showwarning("Advertencia", f"No se pudo guardar en el historial:\n{str(e)}")
+    
+    def procesar_archivo_estacion(self):
+        """Calcular ET₀ por bloques para un archivo de estación completo (en segundo plano)"""
+        if not self.pyet_disponible:
+            messagebox.showerror("Error", "La librería 'pyet' no está instalada.\n\npip install pyet")
+            return
+        if not self.metodos_seleccionados:
+            messagebox.showerror("Error", "Seleccione al menos un método para calcular")
             return
         
-        # Resultados exitosos
-        for idx, (metodo_id, resultado) in enumerate(resultados_exitosos, 1):
-            frame_fila = ctk.CTkFrame(self.frame_tabla_resultados)
-            frame_fila.pack(fill="x", padx=5, pady=2)
-            
-            # Determinar categoría
-            categoria = self.obtener_categoria_metodo(metodo_id)
-            
-            # Datos de la fila
-            datos = [
-                str(idx),
-                self.metodos_et[metodo_id]['nombre'][:30] + "..." if len(self.metodos_et[metodo_id]['nombre']) > 30 else self.metodos_et[metodo_id]['nombre'],
-                f"{resultado:.3f}",
-                "✅ Exitoso",
-                categoria
-            ]
-            
-            for i, dato in enumerate(datos):
-                color_texto = "green" if i == 3 else "black"
-                label = ctk.CTkLabel(frame_fila, text=dato,
-                                    font=ctk.CTkFont(size=11),
-                                    text_color=color_texto)
-                label.grid(row=0, column=i, padx=5, pady=3, sticky="ew")
-            
-            # Configurar pesos
-            for i in range(len(datos)):
-                frame_fila.grid_columnconfigure(i, weight=1)
-        
-        # Errores
-        for idx, (metodo_id, error) in enumerate(errores, len(resultados_exitosos) + 1):
-            frame_fila = ctk.CTkFrame(self.frame_tabla_resultados)
-            frame_fila.pack(fill="x", padx=5, pady=2)
-            
-            categoria = self.obtener_categoria_metodo(metodo_id)
-            
-            datos = [
-                str(idx),
-                self.metodos_et[metodo_id]['nombre'][:30] + "..." if len(self.metodos_et[metodo_id]['nombre']) > 30 else self.metodos_et[metodo_id]['nombre'],
-                "Error",
-                f"❌ {error[:20]}...",
-                categoria
-            ]
-            
-            for i, dato in enumerate(datos):
-                color_texto = "red" if i >= 2 else "black"
-                label = ctk.CTkLabel(frame_fila, text=dato,
-                                    font=ctk.CTkFont(size=11),
-                                    text_color=color_texto)
-                label.grid(row=0, column=i, padx=5, pady=3, sticky="ew")
-            
-            for i in range(len(datos)):
-                frame_fila.grid_columnconfigure(i, weight=1)
+        entrada = filedialog.askopenfilename(
+            filetypes=[("Archivos de estación", "*.csv *.txt *.parquet"), ("Todos", "*.*")],
+            title="Seleccionar archivo de estación"
+        )
+        if not entrada:
+            return
+        salida = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("Archivos CSV", "*.csv"), ("Parquet comprimido", "*.parquet")],
+            title="Guardar ET₀ de la estación como CSV"
+        )
+        if not salida:
+            return
+        
+        # z y lat de la tabla si se ingresaron; si no, se toman del archivo
+        escalares = {}
+        for var_name in ("z", "lat"):
+            entry = self.variables.get(var_name)
+            if entry is not None and entry.get().strip():
+                try:
+                    escalares[var_name] = float(entry.get().strip())
+                except ValueError:
+                    messagebox.showerror("Error", f"Valor inválido para {var_name}: {entry.get()}")
+                    return
+        
+        metodos = list(self.metodos_seleccionados)
+        almacen = self.obtener_almacen()
+        cache = self.obtener_cache()
+        
+        from control_calidad import InformeCalidad
+        informe = InformeCalidad()
+        
+        def trabajo(publicar, cancelado):
+            from exportacion import EscritorResultados
+            from ingesta import procesar_archivo
+            
+            filas = 0
+            metadatos = {"archivo_estacion": entrada, "metodos": metodos, **escalares}
+            with EscritorResultados(salida, metadatos) as escritor:
+                for bloque, resultados, errores in procesar_archivo(entrada, escalares.get("z"),
+                                                                    escalares.get("lat"), metodos,
+                                                                    metricas=self.metricas, almacen=almacen,
+                                                                    cache=cache, informe_calidad=informe):
+                    if cancelado.is_set():
+                        return
+                    # Todas las columnas de métodos en cada bloque (NaN si el método falló)
+                    with self.metricas.medir("exportacion", filas=len(bloque)):
+                        escritor.escribir({**bloque, **resultados.reindex(columns=metodos)},
+                                          bloque.index if bloque.index.name == "fecha" else None)
+                    filas += len(bloque)
+                    escritor.metadatos.setdefault("errores", {}).update(errores)
+                    escritor.metadatos["control_calidad"] = informe.resumen()
+                    publicar(filas, errores)
+        
+        def al_bloque(filas, errores):
+            texto = f"⏳ {filas} filas procesadas"
+            if errores:
+                texto += f" ({len(errores)} métodos con errores)"
+            self.label_progreso.configure(text=texto)
+        
+        def al_terminar(cancelado, error):
+            self.barra_progreso.stop()
+            self.barra_progreso.configure(mode="determinate")
+            if error is not None:
+                messagebox.showerror("Error", f"Error procesando el archivo:\n{error}")
+                self.label_progreso.configure(text="❌ Error en el procesamiento")
+            elif cancelado:
+                self.label_progreso.configure(text="⏹️ Procesamiento cancelado (archivo parcial)")
+            else:
+                self.barra_progreso.set(1)
+                self.label_progreso.configure(text="✅ Archivo procesado")
+                mensaje = f"ET₀ de la estación exportada a:\n{salida}"
+                if informe.filas_con_problemas:
+                    mensaje += (f"\n\nControl de calidad: {informe.filas_con_problemas} de {informe.filas} "
+                                "filas con valores fuera de rango (enmascarados)")
+                messagebox.showinfo("Éxito", mensaje)
+        
+        # Sin total conocido de filas: barra en modo indeterminado
+        if self.iniciar_tarea_fondo(trabajo, al_bloque, al_terminar, f"⏳ Procesando {os.path.basename(entrada)}..."):
+            self.barra_progreso.configure(mode="indeterminate")
+            self.barra_progreso.start()
+    
+    def preparar_intermedios(self, valores, pyet):
+        """Preparar argumentos y cache de variables intermedias para una corrida"""
+        import pandas as pd
+        from motor_et0 import VARIABLES_SERIE, CacheIntermedios, preparar_argumentos
+        
+        # Registro de una sola fila para el motor vectorizado
+        datos = pd.DataFrame({var: [valores[var]] for var in VARIABLES_SERIE if var in valores})
+        argumentos = preparar_argumentos(datos, valores.get('z'), valores.get('lat'))
+        return CacheIntermedios(argumentos, pyet)
+    
+    def calcular_metodo_individual(self, metodo_id, valores, pyet, intermedios=None):
+        """Calcular ET₀ para un método individual"""
+        from motor_et0 import ejecutar_metodo
+        
+        if intermedios is None:
+            intermedios = self.preparar_intermedios(valores, pyet)
+        et0_result = ejecutar_metodo(metodo_id, intermedios.argumentos, pyet, intermedios)
+        return round(et0_result.iloc[0], 3)
+    
+    def mostrar_resultados_comparativos(self, resultados_exitosos, errores):
+        """Mostrar resultados en tabla comparativa"""
+        with self.metricas.medir("dibujo") as medicion:
+            try:
+                # Las filas se generan bajo demanda a partir de los arreglos de resultados
+                fuente = FuenteResultadosET0(resultados_exitosos, errores,
+                                             lambda metodo_id: self.metodos_et[metodo_id]['nombre'],
+                                             self.obtener_categoria_metodo)
+                medicion["filas"] = len(fuente)
+                self.tabla_resultados.mostrar(fuente)
+            except Exception as e:
+                medicion["error"] = f"Error mostrando tabla: {e}"
+                return
         
         # Estadísticas
-        if resultados_exitosos:
-            frame_stats = ctk.CTkFrame(self.frame_tabla_resultados)
-            frame_stats.pack(fill="x", padx=5, pady=10)
-            
-            resultados_valores = [r[1] for r in resultados_exitosos]
-            promedio = sum(resultados_valores) / len(resultados_valores)
-            minimo = min(resultados_valores)
-            maximo = max(resultados_valores)
-            
+        estadisticas = fuente.estadisticas()
+        if estadisticas is not None:
+            promedio, minimo, maximo = estadisticas
             stats_text = f"📊 Estadísticas: Promedio={promedio:.3f} | Mín={minimo:.3f} | Máx={maximo:.3f} | Métodos exitosos={len(resultados_exitosos)}/{len(self.metodos_seleccionados)}"
-            
-            label_stats = ctk.CTkLabel(frame_stats, text=stats_text,
-                                      font=ctk.CTkFont(size=12, weight="bold"),
-                                      text_color="blue")
-            label_stats.pack(pady=5)
+            self.label_stats_resultados.configure(text=stats_text)
+        else:
+            self.label_stats_resultados.configure(text="")
         
         # Actualizar estado
         if resultados_exitosos:
@@ -1051,7 +1042,7 @@ class CalculadoraET0Comparativa:
                 text=f"✅ {len(resultados_exitosos)} métodos calculados exitosamente, {len(errores)} con errores",
                 text_color="green"
             )
-        else:
+        elif errores:
             self.label_estado_resultados.configure(
                 text=f"❌ Todos los métodos fallaron ({len(errores)} errores)",
                 text_color="red"
@@ -1113,45 +1104,13 @@ class CalculadoraET0Comparativa:
     
     def validar_valores(self, valores):
         """Validar que los valores estén en rangos lógicos según las variables disponibles"""
-        # Validaciones básicas de temperatura si están disponibles
-        if 't_min' in valores and 't_max' in valores:
-            if valores['t_min'] >= valores['t_max']:
-                messagebox.showerror("Error", "La temperatura mínima debe ser menor que la máxima")
-                return False
-        
-        # Validaciones de humedad relativa si están disponibles    
-        if 'rh_min' in valores and 'rh_max' in valores:
-            if valores['rh_min'] >= valores['rh_max']:
-                messagebox.showerror("Error", "La humedad relativa mínima debe ser menor que la máxima")
-                return False
-            
-            if not (0 <= valores['rh_min'] <= 100) or not (0 <= valores['rh_max'] <= 100):
-                messagebox.showerror("Error", "La humedad relativa debe estar entre 0 y 100%")
-                return False
-        elif 'rh_min' in valores:
-            if not (0 <= valores['rh_min'] <= 100):
-                messagebox.showerror("Error", "La humedad relativa debe estar entre 0 y 100%")
-                return False
-        elif 'rh_max' in valores:
-            if not (0 <= valores['rh_max'] <= 100):
-                messagebox.showerror("Error", "La humedad relativa debe estar entre 0 y 100%")
-                return False
-            
-        # Validación de radiación solar si está disponible
-        if 'rs' in valores and valores['rs'] < 0:
-            messagebox.showerror("Error", "La radiación solar no puede ser negativa")
-            return False
-            
-        # Validación de velocidad del viento si está disponible
-        if 'uz' in valores and valores['uz'] < 0:
-            messagebox.showerror("Error", "La velocidad del viento no puede ser negativa")
-            return False
-            
-        # Validación de latitud si está disponible
-        if 'lat' in valores and not (-90 <= valores['lat'] <= 90):
-            messagebox.showerror("Error", "La latitud debe estar entre -90 y 90 grados")
+        from control_calidad import revisar
+        
+        # Mismas reglas que el control de calidad de las corridas por lotes
+        mensajes = revisar(valores).mensajes()
+        if mensajes:
+            messagebox.showerror("Error", mensajes[0])
             return False
-            
         return True
     
     def calcular_balance_hidrico(self):
@@ -1178,41 +1137,29 @@ class CalculadoraET0Comparativa:
                         messagebox.showerror("Error", f"Valor inválido para {var_name}: {valor_str}")
                         return
             
-            # Validaciones específicas del balance
-            if not (0 <= valores_balance['humedad_actual'] <= 1):
-                messagebox.showerror("Error", "La humedad actual debe estar entre 0 y 1")
-                return
-            if not (0 <= valores_balance['humedad_cc'] <= 1):
-                messagebox.showerror("Error", "La capacidad de campo debe estar entre 0 y 1")
-                return
-            if not (0 <= valores_balance['humedad_pmp'] <= 1):
-                messagebox.showerror("Error", "El punto de marchitez permanente debe estar entre 0 y 1")
-                return
-            if not (0 <= valores_balance['humedad_riego'] <= 1):
-                messagebox.showerror("Error", "El umbral de riego debe estar entre 0 y 1")
-                return
+            from balance_hidrico import balance_puntual, validar_parametros_balance
             
-            if valores_balance['humedad_pmp'] >= valores_balance['humedad_cc']:
-                messagebox.showerror("Error", "El PMP debe ser menor que la capacidad de campo")
+            # Validaciones específicas del balance
+            mensajes = validar_parametros_balance(valores_balance)
+            if mensajes:
+                messagebox.showerror("Error", mensajes[0])
                 return
             
             # Obtener ET₀ del método seleccionado
             et0 = self.resultados_et0[self.metodo_balance]
             
-            # Cálculos del balance
-            lamina_aprovechable = (valores_balance['humedad_cc'] - valores_balance['humedad_pmp']) * valores_balance['profundidad_radicular'] * 10
-            lamina_neta = (valores_balance['humedad_cc'] - valores_balance['humedad_riego']) * valores_balance['profundidad_radicular'] * 10
-            etc = valores_balance['kc'] * et0
-            deficit_hidrico = lamina_aprovechable - (valores_balance['humedad_actual'] * valores_balance['profundidad_radicular'] * 10)
-            balance_diario = valores_balance['precipitacion'] - etc
-            
-            # Determinar recomendación
-            if valores_balance['humedad_actual'] <= valores_balance['humedad_riego']:
-                necesita_riego = True
-                lamina_riego = lamina_neta
-            else:
-                necesita_riego = False
-                lamina_riego = 0
+            # Cálculos del balance y recomendación
+            balance = balance_puntual(et0, valores_balance['kc'], valores_balance['precipitacion'],
+                                      valores_balance['humedad_actual'], valores_balance['humedad_cc'],
+                                      valores_balance['humedad_pmp'], valores_balance['humedad_riego'],
+                                      valores_balance['profundidad_radicular'])
+            etc = balance['etc']
+            balance_diario = balance['balance_diario']
+            lamina_aprovechable = balance['lamina_aprovechable']
+            lamina_neta = balance['lamina_neta']
+            deficit_hidrico = balance['deficit_hidrico']
+            necesita_riego = bool(balance['necesita_riego'])
+            lamina_riego = float(balance['lamina_riego'])
             
             # Crear resultado del balance
             resultado_texto = f"""
@@ -1257,6 +1204,18 @@ class CalculadoraET0Comparativa:
                 'lamina_riego': lamina_riego
             }
             
+            self.guardar_en_historial(lambda almacen: almacen.guardar_balance(
+                ESTACION_CALCULADORA, self.metodo_balance, [datetime.date.today()], {
+                    'et0': et0,
+                    'kc': valores_balance['kc'],
+                    'etc': etc,
+                    'precipitacion': valores_balance['precipitacion'],
+                    'riego': lamina_riego,
+                    'agotamiento': (valores_balance['humedad_cc'] - valores_balance['humedad_actual'])
+                                   * valores_balance['profundidad_radicular'] * 10,
+                    'humedad': valores_balance['humedad_actual'],
+                }))
+            
         except Exception as e:
             messagebox.showerror("Error", f"Error en el cálculo del balance hídrico:\n{str(e)}")
     
@@ -1302,8 +1261,10 @@ class CalculadoraET0Comparativa:
                 datos_export['metodo_et0'] = [self.metodos_et[self.metodo_balance]['nombre']]
                 datos_export['fecha_calculo'] = [datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
                 
-                df = pd.DataFrame(datos_export)
-                df.to_csv(archivo, index=False, encoding='utf-8')
+                with self.metricas.medir("exportacion", filas=1):
+                    import pandas as pd
+                    df = pd.DataFrame(datos_export)
+                    df.to_csv(archivo, index=False, encoding='utf-8')
                 
                 messagebox.showinfo("Éxito", f"Balance hídrico exportado exitosamente a:\n{archivo}")
                 
@@ -1320,18 +1281,15 @@ class CalculadoraET0Comparativa:
                         entry.delete(0, 'end')
                 except:
                     pass
+            self.valores_recordados.clear()
             
             self.resultados_et0.clear()
             
             # Limpiar tabla de resultados de forma segura
             try:
-                if hasattr(self, 'frame_tabla_resultados') and self.frame_tabla_resultados.winfo_exists():
-                    for widget in self.frame_tabla_resultados.winfo_children():
-                        try:
-                            if widget.winfo_exists():
-                                widget.destroy()
-                        except:
-                            pass
+                if hasattr(self, 'tabla_resultados'):
+                    self.tabla_resultados.limpiar()
+                    self.label_stats_resultados.configure(text="")
             except:
                 pass
             
@@ -1357,6 +1315,37 @@ class CalculadoraET0Comparativa:
         except Exception as e:
             print(f"Error limpiando campos: {e}")
     
+    def guardar_metricas(self):
+        """Guardar la traza de métricas (tiempo, filas y fallas por método y etapa)"""
+        if not self.metricas.registros:
+            messagebox.showwarning("Advertencia", "Aún no hay métricas registradas. Calcule ET₀ primero")
+            return
+        
+        archivo = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Traza JSON", "*.json"), ("Traza CSV", "*.csv")],
+            title="Guardar métricas de rendimiento"
+        )
+        if not archivo:
+            return
+        
+        try:
+            self.metricas.exportar(archivo)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar métricas:\n{str(e)}")
+            return
+        
+        lineas = []
+        for grupo in self.metricas.metodos_mas_lentos():
+            if grupo['metodo'] not in self.metodos_et:
+                continue
+            linea = f"• {self.metodos_et[grupo['metodo']]['nombre']}: {grupo['segundos_total'] * 1000:.1f} ms"
+            if grupo['fallas']:
+                linea += f" ({grupo['fallas']} fallas)"
+            lineas.append(linea)
+        lentos = "\n".join(lineas)
+        messagebox.showinfo("Éxito", f"Métricas guardadas en:\n{archivo}\n\nMétodos más lentos:\n{lentos}")
+    
     def exportar_csv(self):
         """Exportar resultados comparativos a CSV"""
         if not self.resultados_et0:
@@ -1366,40 +1355,66 @@ class CalculadoraET0Comparativa:
         try:
             archivo = filedialog.asksaveasfilename(
                 defaultextension=".csv",
-                filetypes=[("Archivos CSV", "*.csv")],
+                filetypes=[("Archivos CSV", "*.csv"), ("Parquet comprimido", "*.parquet")],
                 title="Guardar resultados comparativos como CSV"
             )
             
             if archivo:
-                datos_export = []
+                from exportacion import exportar_resultados
                 
-                # Variables meteorológicas
-                variables_met = {}
-                for var_name, entry in self.variables.items():
-                    variables_met[var_name] = entry.get()
+                # Variables meteorológicas y fecha: una sola vez, como metadatos
+                metadatos = {
+                    'variables': {var_name: entry.get() for var_name, entry in self.variables.items()},
+                    'fecha_calculo': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                }
                 
-                # Resultados por método
-                for metodo_id, resultado in self.resultados_et0.items():
-                    fila = variables_met.copy()
-                    fila['metodo_id'] = metodo_id
-                    fila['metodo_nombre'] = self.metodos_et[metodo_id]['nombre']
-                    fila['categoria'] = self.obtener_categoria_metodo(metodo_id)
-                    fila['et0_mm_dia'] = resultado
-                    fila['fecha_calculo'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    datos_export.append(fila)
+                # Resultados por método, como columnas
+                metodos = list(self.resultados_et0)
+                columnas = {
+                    'metodo_id': metodos,
+                    'metodo_nombre': [self.metodos_et[metodo_id]['nombre'] for metodo_id in metodos],
+                    'categoria': [self.obtener_categoria_metodo(metodo_id) for metodo_id in metodos],
+                    'et0_mm_dia': [float(self.resultados_et0[metodo_id]) for metodo_id in metodos],
+                }
                 
-                df = pd.DataFrame(datos_export)
-                df.to_csv(archivo, index=False, encoding='utf-8')
+                with self.metricas.medir("exportacion", filas=len(metodos)):
+                    exportar_resultados(archivo, columnas, metadatos=metadatos)
                 
                 messagebox.showinfo("Éxito", f"Resultados exportados exitosamente a:\n{archivo}")
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error al exportar CSV:\n{str(e)}")
     
-    def crear_documentacion(self):
+    def exportar_historial(self):
+        """Exportar toda la ET₀ guardada en el historial (estación, método, fecha, ET₀)"""
+        try:
+            archivo = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("Archivos CSV", "*.csv"), ("Parquet comprimido", "*.parquet")],
+                title="Exportar historial de resultados"
+            )
+            if not archivo:
+                return
+            
+            from exportacion import EscritorResultados
+            
+            almacen = self.obtener_almacen()
+            with self.metricas.medir("exportacion") as medicion:
+                with EscritorResultados(archivo, {"historial": almacen.ruta},
+                                        encabezado=["estacion", "metodo_id", "fecha", "et0"]) as escritor:
+                    for bloque in almacen.iterar_et0():
+                        escritor.escribir(bloque)
+                medicion["filas"] = escritor.filas
+            
+            messagebox.showinfo("Éxito", f"{escritor.filas} resultados exportados a:\n{archivo}")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al exportar el historial:\n{str(e)}")
+    
+    def crear_documentacion(self, contenedor):
         """Crear sección de documentación"""
-        frame_doc = ctk.CTkFrame(self.frame_principal)
-        frame_doc.pack(fill="both", expand=True, padx=20, pady=10)
+        frame_doc = ctk.CTkFrame(contenedor)
+        frame_doc.pack(fill="both", expand=True, pady=10)
         
         titulo_doc = ctk.CTkLabel(frame_doc, 
                                  text="📚 Documentación - Sistema Comparativo",
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Control de Calidad Vectorizado de los Datos de Entrada
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Revisa todas las filas de un registro en una sola pasada (comparaciones
+sobre arreglos, sin bucles por fila) y produce una matriz booleana
+filas × reglas con las filas que incumplen cada regla:
+
+    temperatura_invertida   t_min >= t_max
+    humedad_invertida       rh_min >= rh_max
+    humedad_fuera_de_rango  rh_min o rh_max fuera de 0-100 %
+    radiacion_negativa      rs < 0
+    viento_negativo         uz < 0
+    latitud_invalida        lat fuera de -90..90
+    radiacion_fuera_de_rango  rs >= 100 MJ/m²/día (p. ej. W/m² por error)
+    humedad_en_fraccion     rh_min o rh_max entre 0 y 1 (fracción en lugar de %)
+
+Los valores faltantes (NaN) no se marcan. Las filas marcadas se enmascaran
+(las variables de la regla pasan a NaN) o se reparan antes de llegar a los
+métodos, de modo que un dato malo no detiene una corrida por lotes.
+
+pyet y los núcleos NumPy rechazan el arreglo completo si alguna radiación
+llega a 100 MJ/m²/día o si la humedad máxima no pasa de 1 (REGLAS_DE_ARREGLO):
+sin esas dos reglas, una sola fila mala haría fallar el método en todo el
+registro.
+"""
+
+import threading
+
+import numpy as np
+
+# regla -> (mensaje, variables que la regla invalida)
+REGLAS = {
+    "temperatura_invertida": ("La temperatura mínima debe ser menor que la máxima", ("t_min", "t_max")),
+    "humedad_invertida": ("La humedad relativa mínima debe ser menor que la máxima", ("rh_min", "rh_max")),
+    "humedad_fuera_de_rango": ("La humedad relativa debe estar entre 0 y 100%", ("rh_min", "rh_max")),
+    "radiacion_negativa": ("La radiación solar no puede ser negativa", ("rs",)),
+    "viento_negativo": ("La velocidad del viento no puede ser negativa", ("uz",)),
+    "latitud_invalida": ("La latitud debe estar entre -90 y 90 grados", ("lat",)),
+    "radiacion_fuera_de_rango": ("La radiación solar debe ser menor que 100 MJ/m²/día", ("rs",)),
+    "humedad_en_fraccion": ("La humedad relativa debe estar en porcentaje (mayor que 1 %)", ("rh_min", "rh_max")),
+}
+
+# Reglas que pyet y los núcleos NumPy revisan sobre todo el arreglo de una variable
+REGLAS_DE_ARREGLO = ("radiacion_fuera_de_rango", "humedad_en_fraccion")
+
+MODOS = ("enmascarar", "reparar")
+
+
+def _resumen(filas, filas_con_problemas, conteos):
+    return {
+        "filas": int(filas),
+        "filas_con_problemas": int(filas_con_problemas),
+        "reglas": {regla: {"mensaje": REGLAS[regla][0], "filas": int(conteos[regla])} for regla in REGLAS},
+    }
+
+
+class ControlCalidad:
+    """Resultado de revisar un registro: matriz booleana filas × reglas"""
+    
+    def __init__(self, banderas):
+        self.reglas = tuple(REGLAS)
+        self.banderas = banderas
+    
+    def __len__(self):
+        return len(self.banderas)
+    
+    def columna(self, regla):
+        """Máscara de las filas que incumplen una regla"""
+        return self.banderas[:, self.reglas.index(regla)]
+    
+    @property
+    def filas_con_problemas(self):
+        return self.banderas.any(axis=1)
+    
+    def conteos(self):
+        """{regla: número de filas que la incumplen}"""
+        return dict(zip(self.reglas, self.banderas.sum(axis=0).tolist()))
+    
+    def mensajes(self):
+        """Mensajes de las reglas incumplidas, en el orden de REGLAS"""
+        return [REGLAS[regla][0] for regla, filas in self.conteos().items() if filas]
+    
+    def resumen(self):
+        """{filas, filas_con_problemas, reglas: {regla: {mensaje, filas}}}"""
+        return _resumen(len(self), self.filas_con_problemas.sum(), self.conteos())
+
+
+class InformeCalidad:
+    """Suma de varias revisiones (p. ej. los bloques de un archivo o varias estaciones; seguro entre hilos)"""
+    
+    def __init__(self):
+        self.filas = 0
+        self.filas_con_problemas = 0
+        self.conteos_reglas = dict.fromkeys(REGLAS, 0)
+        self._candado = threading.Lock()
+    
+    def agregar(self, control):
+        conteos = control.conteos()
+        with self._candado:
+            self.filas += len(control)
+            self.filas_con_problemas += int(control.filas_con_problemas.sum())
+            for regla, filas in conteos.items():
+                self.conteos_reglas[regla] += filas
+    
+    def resumen(self):
+        return _resumen(self.filas, self.filas_con_problemas, self.conteos_reglas)
+
+
+def _columna(datos, nombre, filas):
+    """Columna como arreglo float de largo filas (los escalares se repiten), o None"""
+    if nombre not in datos:
+        return None
+    return np.broadcast_to(np.asarray(datos[nombre], dtype=float), (filas,))
+
+
+def latitud_valida(lat):
+    """Si una latitud escalar está en -90..90 (None cuenta como válida)"""
+    return lat is None or bool(-90 <= lat <= 90)
+
+
+def revisar(datos, lat=None):
+    """Revisar todas las filas de un registro en una pasada
+
+    datos: DataFrame o {variable: arreglo o escalar} con nombres de
+    requerimientos (t_min, t_max, rh_min, rh_max, rs, uz y opcionalmente
+    lat). lat escalar (opcional) se revisa para todas las filas.
+    """
+    filas = len(datos) if hasattr(datos, "columns") else max(
+        (np.size(valor) for valor in datos.values()), default=1)
+    banderas = np.zeros((filas, len(REGLAS)), dtype=bool)
+    columna = {nombre: _columna(datos, nombre, filas) for nombre in ("t_min", "t_max", "rh_min", "rh_max",
+                                                                    "rs", "uz", "lat")}
+    if lat is not None:
+        columna["lat"] = np.broadcast_to(np.asarray(lat, dtype=float), (filas,))
+    
+    with np.errstate(invalid="ignore"):
+        if columna["t_min"] is not None and columna["t_max"] is not None:
+            banderas[:, 0] = columna["t_min"] >= columna["t_max"]
+        if columna["rh_min"] is not None and columna["rh_max"] is not None:
+            banderas[:, 1] = columna["rh_min"] >= columna["rh_max"]
+        for nombre in ("rh_min", "rh_max"):
+            if columna[nombre] is not None:
+                banderas[:, 2] |= (columna[nombre] < 0) | (columna[nombre] > 100)
+                banderas[:, 7] |= (columna[nombre] >= 0) & (columna[nombre] <= 1)
+        if columna["rs"] is not None:
+            banderas[:, 3] = columna["rs"] < 0
+            banderas[:, 6] = columna["rs"] >= 100
+        if columna["uz"] is not None:
+            banderas[:, 4] = columna["uz"] < 0
+        if columna["lat"] is not None:
+            banderas[:, 5] = (columna["lat"] < -90) | (columna["lat"] > 90)
+    return ControlCalidad(banderas)
+
+
+def corregir(datos, control, modo="enmascarar"):
+    """Copia de datos (DataFrame) sin filas malas que lleguen a los métodos
+
+    "enmascarar": las variables de cada regla incumplida pasan a NaN en esas
+    filas. "reparar": la humedad en fracción pasa a porcentaje, se
+    intercambian mínimos y máximos invertidos, la humedad se recorta a
+    0-100 % y rs/uz negativos pasan a 0; lo que no se puede reparar (mínimo
+    igual al máximo, latitud, radiación de 100 MJ/m²/día o más, humedad
+    nula) se enmascara.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconocido: {modo}. Use uno de {MODOS}")
+    if not control.banderas.any():
+        return datos
+    datos = datos.copy()
+    
+    def enmascarar(regla, mascara=None):
+        filas = control.columna(regla) if mascara is None else mascara
+        for variable in REGLAS[regla][1]:
+            if variable in datos:
+                datos.loc[filas, variable] = np.nan
+    
+    if modo == "enmascarar":
+        for regla in REGLAS:
+            enmascarar(regla)
+        return datos
+    
+    # Reparar: primero las unidades y los rangos, luego los pares invertidos
+    en_fraccion = control.columna("humedad_en_fraccion")
+    for variable in ("rh_min", "rh_max"):
+        if variable in datos:
+            fraccion = en_fraccion & (datos[variable] <= 1).to_numpy()
+            datos.loc[fraccion, variable] *= 100
+            datos[variable] = datos[variable].clip(0, 100)
+    for variable in ("rs", "uz"):
+        if variable in datos:
+            datos[variable] = datos[variable].clip(lower=0)
+    for regla, (minimo, maximo) in (("temperatura_invertida", ("t_min", "t_max")),
+                                    ("humedad_invertida", ("rh_min", "rh_max"))):
+        if minimo in datos and maximo in datos:
+            bajo, alto = datos[minimo].to_numpy(), datos[maximo].to_numpy()
+            invertidas = bajo > alto
+            datos[minimo], datos[maximo] = np.where(invertidas, alto, bajo), np.where(invertidas, bajo, alto)
+            enmascarar(regla, (datos[minimo] == datos[maximo]).to_numpy())
+    enmascarar("latitud_invalida")
+    enmascarar("radiacion_fuera_de_rango")
+    # Humedad nula en una fila marcada: ni en fracción ni en % es utilizable
+    nula = np.zeros(len(datos), dtype=bool)
+    for variable in ("rh_min", "rh_max"):
+        if variable in datos:
+            nula |= en_fraccion & (datos[variable] <= 1).to_numpy()
+    enmascarar("humedad_en_fraccion", nula)
+    return datos
+
+
+def depurar(datos, lat=None, modo="enmascarar", informe=None):
+    """Revisar y corregir un registro antes del cálculo; retorna (datos, lat)
+
+    Una latitud escalar inválida se descarta (None): los métodos que la
+    necesitan quedan sin calcular en lugar de recibir un valor imposible.
+    informe (InformeCalidad, opcional) acumula la revisión.
+    """
+    control = revisar(datos, lat)
+    if informe is not None:
+        informe.agregar(control)
+    if not latitud_valida(lat):
+        lat = None
+    return corregir(datos, control, modo), lat
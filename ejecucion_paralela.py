@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ejecución Paralela de ET₀ por Estación o por Método
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Reparte el cálculo entre procesos (uno por núcleo). Los registros de cada
+estación se publican en memoria compartida y los procesos escriben sus
+resultados directamente en otra matriz compartida, de modo que ni las
+entradas ni las salidas se serializan con pickle; solo viajan descriptores
+pequeños y los mensajes de error. Los resultados se devuelven con la misma
+estructura que resultados_et0 (metodo_id -> resultado), uno por estación.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from control_calidad import depurar
+from metricas import Metricas, medir
+from motor_et0 import METODOS_ET, VARIABLES_SERIE, calcular_et0_serie
+
+PARTICIONES = ("auto", "estacion", "metodo")
+
+
+class ArregloCompartido:
+    """Arreglo NumPy respaldado por un bloque de memoria compartida"""
+    
+    def __init__(self, forma, dtype, nombre=None):
+        self.forma = tuple(forma)
+        self.dtype = np.dtype(dtype)
+        tamano = max(int(np.prod(self.forma)) * self.dtype.itemsize, 1)
+        if nombre is None:
+            self.memoria = shared_memory.SharedMemory(create=True, size=tamano)
+            self.propietario = True
+        else:
+            self.memoria = shared_memory.SharedMemory(name=nombre)
+            self.propietario = False
+        self.arreglo = np.ndarray(self.forma, dtype=self.dtype, buffer=self.memoria.buf)
+    
+    @classmethod
+    def desde(cls, valores):
+        """Copiar un arreglo existente a memoria compartida"""
+        compartido = cls(valores.shape, valores.dtype)
+        compartido.arreglo[...] = valores
+        return compartido
+    
+    @property
+    def descriptor(self):
+        """Datos mínimos (y serializables) para adjuntarse desde otro proceso"""
+        return (self.memoria.name, self.forma, self.dtype.str)
+    
+    @classmethod
+    def adjuntar(cls, descriptor):
+        nombre, forma, dtype = descriptor
+        return cls(forma, dtype, nombre=nombre)
+    
+    def cerrar(self):
+        """Liberar la vista local (y el bloque, si este proceso lo creó)"""
+        self.arreglo = None
+        self.memoria.close()
+        if self.propietario:
+            self.memoria.unlink()
+
+
+def _calcular_en_memoria(valores, fechas, columnas, z, lat, metodos, salida, posiciones, backend,
+                         metricas=None, cache=None):
+    """Calcular los métodos de una tarea y escribirlos en la matriz de salida"""
+    datos = pd.DataFrame({col: valores[i] for i, col in enumerate(columnas)},
+                         index=pd.DatetimeIndex(fechas.astype("datetime64[ns]")))
+    resultados, errores = calcular_et0_serie(datos, z, lat, metodos, backend=backend, metricas=metricas,
+                                             cache=cache)
+    for metodo_id in resultados:
+        salida[posiciones[metodo_id]] = resultados[metodo_id].to_numpy()
+    return errores
+
+
+def _tarea_en_proceso(tarea):
+    """Punto de entrada en el proceso trabajador: adjuntar, calcular, soltar"""
+    desc_valores, desc_fechas, desc_salida, columnas, z, lat, metodos, posiciones, backend, medicion, cache = tarea
+    # Las métricas del proceso trabajador viajan de vuelta como lista de registros
+    metricas = Metricas(memoria=medicion == "memoria") if medicion else None
+    valores = ArregloCompartido.adjuntar(desc_valores)
+    fechas = ArregloCompartido.adjuntar(desc_fechas)
+    salida = ArregloCompartido.adjuntar(desc_salida)
+    try:
+        errores = _calcular_en_memoria(valores.arreglo, fechas.arreglo, columnas, z, lat,
+                                       metodos, salida.arreglo, posiciones, backend, metricas, cache)
+        return errores, metricas.registros if metricas is not None else []
+    finally:
+        valores.cerrar()
+        fechas.cerrar()
+        salida.cerrar()
+
+
+def _repartir(lista, partes):
+    """Dividir una lista en 'partes' grupos contiguos de tamaño similar"""
+    partes = max(1, min(partes, len(lista)))
+    limites = np.linspace(0, len(lista), partes + 1).astype(int)
+    return [lista[limites[i]:limites[i + 1]] for i in range(partes)]
+
+
+def calcular_estaciones_en_paralelo(estaciones, metodos=None, procesos=None, particion="auto",
+                                    backend="auto", metricas=None, cache=None, control_calidad="enmascarar",
+                                    informe_calidad=None):
+    """Calcular ET₀ para varias estaciones repartiendo el trabajo entre procesos
+
+    estaciones: {nombre: (registro DataFrame, z, lat)} con columnas de VARIABLES_SERIE.
+    particion: "estacion" (una tarea por estación), "metodo" (cada estación se
+    divide en grupos de métodos) o "auto" (por método si hay menos estaciones
+    que procesos). backend y cache (CacheDiscoET0, compartido en disco) se
+    pasan a calcular_et0_serie en cada proceso; con metricas (Metricas) se
+    reúnen los registros de todos los procesos. control_calidad e
+    informe_calidad se aplican a cada registro antes de publicarlo, como en
+    ingesta.procesar_archivo.
+
+    Retorna (resultados, errores): {nombre: {metodo_id: pd.Series}} y
+    {nombre: {metodo_id: mensaje}}.
+    """
+    if particion not in PARTICIONES:
+        raise ValueError(f"Partición desconocida: {particion}. Use una de {PARTICIONES}")
+    if metodos is None:
+        metodos = list(METODOS_ET.keys())
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    if particion == "auto":
+        particion = "metodo" if len(estaciones) < procesos else "estacion"
+    
+    grupos_por_estacion = max(1, procesos // max(len(estaciones), 1)) if particion == "metodo" else 1
+    posiciones = {metodo_id: i for i, metodo_id in enumerate(metodos)}
+    medicion = None if metricas is None else ("memoria" if metricas.memoria else "tiempo")
+    
+    compartidos = {}
+    tareas = []
+    try:
+        # Publicar cada registro (variables × días) y reservar su matriz de salida
+        for nombre, (registro, z, lat) in estaciones.items():
+            columnas = [col for col in VARIABLES_SERIE if col in registro]
+            if control_calidad is not None:
+                with medir(metricas, "validacion", None, len(registro)):
+                    registro, lat = depurar(registro[columnas], lat, control_calidad, informe_calidad)
+            valores = ArregloCompartido.desde(
+                np.ascontiguousarray(registro[columnas].to_numpy(dtype=float).T))
+            fechas = ArregloCompartido.desde(
+                pd.DatetimeIndex(registro.index if isinstance(registro.index, pd.DatetimeIndex)
+                                 else pd.date_range('2023-01-01', periods=len(registro), freq='D'))
+                .to_numpy(dtype="datetime64[ns]").view(np.int64))
+            salida = ArregloCompartido((len(metodos), len(registro)), np.float64)
+            salida.arreglo[...] = np.nan
+            compartidos[nombre] = (valores, fechas, salida)
+            
+            for grupo in _repartir(metodos, grupos_por_estacion):
+                tareas.append((nombre, (valores.descriptor, fechas.descriptor, salida.descriptor,
+                                        columnas, z, lat, grupo, posiciones, backend, medicion, cache)))
+        
+        errores = {nombre: {} for nombre in estaciones}
+        with ProcessPoolExecutor(max_workers=min(procesos, len(tareas)) or 1) as ejecutor:
+            futuros = [(nombre, ejecutor.submit(_tarea_en_proceso, tarea)) for nombre, tarea in tareas]
+            for nombre, futuro in futuros:
+                errores_tarea, registros = futuro.result()
+                errores[nombre].update(errores_tarea)
+                if metricas is not None:
+                    metricas.extender(registros)
+        
+        # Reunir en la estructura de resultados_et0
+        resultados = {}
+        for nombre, (registro, _, _) in estaciones.items():
+            salida = compartidos[nombre][2].arreglo
+            resultados[nombre] = {
+                metodo_id: pd.Series(salida[posiciones[metodo_id]].copy(), index=registro.index)
+                for metodo_id in metodos if metodo_id not in errores[nombre]
+            }
+        return resultados, errores
+    finally:
+        for arreglos in compartidos.values():
+            for arreglo in arreglos:
+                arreglo.cerrar()
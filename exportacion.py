@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exportación por Bloques de Resultados (CSV / Parquet)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Escribe columnas de resultados (arreglos, Series o DataFrames) directamente
+a CSV o a Parquet comprimido, en bloques de tamaño fijo: la memoria usada
+depende del tamaño del bloque y no del número de filas. No se crea un dict
+por fila ni un DataFrame completo.
+
+Los metadatos (entradas, métodos, fecha de exportación...) se escriben una
+sola vez: en CSV, en un archivo JSON al lado (<nombre>.metadatos.json); en
+Parquet, dentro del esquema del archivo (clave "pyet_suite").
+"""
+
+import datetime
+import json
+import os
+
+import numpy as np
+
+FORMATOS = ("csv", "parquet")
+FILAS_BLOQUE_DEFECTO = 10_000
+CLAVE_METADATOS_PARQUET = b"pyet_suite"
+
+
+def ruta_metadatos(ruta):
+    """Ruta del archivo JSON de metadatos que acompaña a un CSV"""
+    return os.path.splitext(ruta)[0] + ".metadatos.json"
+
+
+def _texto_csv(valor):
+    """Texto de una celda, entre comillas si contiene separadores o comillas"""
+    texto = str(valor)
+    if any(caracter in texto for caracter in ',"\n\r'):
+        return '"' + texto.replace('"', '""') + '"'
+    return texto
+
+
+def _columna_fechas(valores):
+    """Fechas como texto ISO (solo la fecha si todas son a medianoche)"""
+    valores = np.asarray(valores, dtype="datetime64[ns]")
+    diarias = bool(np.all(valores.astype("datetime64[D]") == valores))
+    return np.datetime_as_string(valores, unit="D" if diarias else "s")
+
+
+class EscritorResultados:
+    """Escritor por bloques de resultados a CSV o Parquet
+
+    Uso:
+        with EscritorResultados("et0.csv", metadatos={...}) as escritor:
+            for bloque in ...:
+                escritor.escribir({"fecha": fechas, "pm_fao56": et0, ...})
+
+    El formato sale de la extensión (.csv, .parquet/.pq) salvo que se
+    indique. Las columnas del primer bloque fijan el encabezado, salvo que
+    se den en encabezado (lista de nombres, con el del índice si lo hay);
+    con encabezado, cerrar sin haber escrito ningún bloque deja un archivo
+    sin filas (en Parquet, columnas float64) y sin él lanza ValueError.
+    decimales (opcional) fija los decimales de las columnas numéricas en
+    CSV; sin él se escribe la representación exacta más corta de cada
+    valor. Parquet
+    requiere pyarrow y usa la compresión indicada (zstd por defecto).
+    """
+    
+    def __init__(self, ruta, metadatos=None, formato=None, compresion="zstd", decimales=None,
+                 filas_bloque=FILAS_BLOQUE_DEFECTO, encabezado=None):
+        if formato is None:
+            formato = "parquet" if os.path.splitext(str(ruta))[1].lower() in (".parquet", ".pq") else "csv"
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato}. Use uno de {FORMATOS}")
+        if filas_bloque < 1:
+            raise ValueError("filas_bloque debe ser al menos 1")
+        
+        self.ruta = str(ruta)
+        self.formato = formato
+        self.compresion = compresion
+        self.decimales = decimales
+        self.filas_bloque = filas_bloque
+        self.metadatos = dict(metadatos or {})
+        self.columnas = None if encabezado is None else [str(nombre) for nombre in encabezado]
+        self.filas = 0
+        self._iniciado = False
+        self._cerrado = False
+        self._archivo = None
+        self._escritor_parquet = None
+        self._formatos = None
+        self._formato_fila = None
+        
+        if formato == "parquet":
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError("La escritura de Parquet requiere 'pyarrow'.\n\n"
+                                  "Para instalarla, ejecute en su terminal:\n"
+                                  "pip install pyarrow")
+            self._pa = pyarrow
+            self._pq = pyarrow.parquet
+        else:
+            self._archivo = open(self.ruta, "w", newline="", encoding="utf-8")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        try:
+            self.cerrar()
+        except ValueError:
+            # Sin bloques por un error: que se propague el error original
+            if tipo is None:
+                raise
+        return False
+    
+    def escribir(self, columnas, indice=None, nombre_indice="fecha"):
+        """Agregar filas: columnas es {nombre: arreglo} o un DataFrame
+
+        indice (opcional, p. ej. un DatetimeIndex) se escribe como primera
+        columna con nombre_indice. Entradas largas se parten en bloques de
+        filas_bloque filas.
+        """
+        if hasattr(columnas, "columns"):
+            columnas = {str(nombre): columnas[nombre].to_numpy() for nombre in columnas.columns}
+        else:
+            columnas = {str(nombre): np.asarray(getattr(valores, "values", valores))
+                        for nombre, valores in columnas.items()}
+        if indice is not None:
+            columnas = {nombre_indice: np.asarray(indice), **columnas}
+        
+        filas = {len(valores) for valores in columnas.values()}
+        if len(filas) != 1:
+            raise ValueError("Todas las columnas deben tener el mismo número de filas")
+        filas = filas.pop()
+        
+        if self.columnas is not None and list(columnas) != self.columnas:
+            raise ValueError(f"Las columnas no coinciden con el encabezado: {list(columnas)} != {self.columnas}")
+        if not self._iniciado:
+            self.columnas = list(columnas)
+            self._iniciar(columnas)
+        
+        for inicio in range(0, filas, self.filas_bloque):
+            bloque = {nombre: valores[inicio:inicio + self.filas_bloque] for nombre, valores in columnas.items()}
+            if self.formato == "parquet":
+                self._escribir_parquet(bloque)
+            else:
+                self._escribir_csv(bloque)
+            self.filas += len(next(iter(bloque.values())))
+    
+    def _iniciar(self, columnas):
+        self._iniciado = True
+        if self.formato == "csv":
+            self._archivo.write(",".join(_texto_csv(nombre) for nombre in self.columnas) + "\n")
+            numerico = "%s" if self.decimales is None else f"%.{int(self.decimales)}f"
+            self._formatos = [numerico if valores.dtype.kind == "f" else "%s" for valores in columnas.values()]
+            self._formato_fila = ",".join(self._formatos) + "\n"
+    
+    def _escribir_csv(self, bloque):
+        filas = len(next(iter(bloque.values())))
+        formatos = None
+        # Matriz de objetos fila × columna: un solo formateo % para todo el bloque
+        celdas = np.empty((filas, len(bloque)), dtype=object)
+        for j, valores in enumerate(bloque.values()):
+            if valores.dtype.kind == "M":
+                celdas[:, j] = _columna_fechas(valores)
+            elif valores.dtype.kind == "f":
+                faltantes = np.flatnonzero(np.isnan(valores))
+                if len(faltantes):
+                    # Faltantes como campo vacío (como pandas.to_csv): la columna va ya formateada
+                    textos = (valores.tolist() if self.decimales is None
+                              else np.char.mod(self._formatos[j], valores).tolist())
+                    for i in faltantes.tolist():
+                        textos[i] = ""
+                    celdas[:, j] = textos
+                    formatos = formatos or list(self._formatos)
+                    formatos[j] = "%s"
+                else:
+                    celdas[:, j] = valores.tolist()
+            elif valores.dtype.kind in "iub":
+                celdas[:, j] = valores.tolist()
+            else:
+                celdas[:, j] = [_texto_csv(valor) for valor in valores.tolist()]
+        
+        formato_fila = self._formato_fila if formatos is None else ",".join(formatos) + "\n"
+        self._archivo.write((formato_fila * filas) % tuple(celdas.ravel().tolist()))
+    
+    def _escribir_parquet(self, bloque):
+        tabla = self._pa.table({nombre: valores for nombre, valores in bloque.items()})
+        if self._escritor_parquet is None:
+            # Metadatos una sola vez, en el esquema; cada bloque es un grupo de filas
+            esquema = tabla.schema.with_metadata({CLAVE_METADATOS_PARQUET: json.dumps(
+                self._metadatos_finales(), ensure_ascii=False, default=str).encode("utf-8")})
+            self._escritor_parquet = self._pq.ParquetWriter(self.ruta, esquema, compression=self.compresion)
+        self._escritor_parquet.write_table(tabla.cast(self._escritor_parquet.schema))
+    
+    def _metadatos_finales(self):
+        return {
+            **self.metadatos,
+            "fecha_exportacion": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "columnas": self.columnas,
+        }
+    
+    def cerrar(self):
+        """Terminar el archivo; en CSV escribe el JSON de metadatos"""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if not self._iniciado:
+            if self.columnas is None:
+                # Sin bloques ni encabezado no hay archivo válido que dejar
+                if self._archivo is not None:
+                    self._archivo.close()
+                    self._archivo = None
+                    os.remove(self.ruta)
+                raise ValueError(f"No se escribió ningún bloque en {self.ruta}; "
+                                 "indique encabezado para exportar un archivo sin filas")
+            vacias = {nombre: np.empty(0) for nombre in self.columnas}
+            self._iniciar(vacias)
+            if self.formato == "parquet":
+                self._escribir_parquet(vacias)
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+            self._escritor_parquet = None
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+            with open(ruta_metadatos(self.ruta), "w", encoding="utf-8") as f:
+                json.dump({**self._metadatos_finales(), "filas": self.filas}, f, indent=2,
+                          ensure_ascii=False, default=str)
+
+
+def exportar_resultados(ruta, columnas, indice=None, metadatos=None, **opciones):
+    """Escribir resultados en una sola llamada (por bloques, ver EscritorResultados)"""
+    with EscritorResultados(ruta, metadatos, **opciones) as escritor:
+        escritor.escribir(columnas, indice)
+    return escritor.filas
+
+
+def leer_metadatos(ruta):
+    """Leer los metadatos de un archivo exportado (CSV o Parquet)"""
+    if os.path.splitext(str(ruta))[1].lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+        return json.loads(pq.read_schema(ruta).metadata[CLAVE_METADATOS_PARQUET])
+    with open(ruta_metadatos(str(ruta)), encoding="utf-8") as f:
+        return json.load(f)
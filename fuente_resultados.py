@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filas de la Tabla de Resultados ET₀ Calculadas Bajo Demanda
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+La tabla virtualizada (tabla_virtual.TablaVirtual) solo dibuja las filas
+visibles; aquí están la fuente que arma cada fila a partir de los arreglos
+de resultados y el cálculo de la ventana visible al desplazarse. No usan
+widgets, por lo que se prueban sin interfaz gráfica.
+"""
+
+
+def ventana_visible(total, inicio, filas_visibles):
+    """(inicio, fin) de las filas visibles, con inicio acotado a 0..total - filas_visibles"""
+    inicio = min(max(inicio, 0), max(total - filas_visibles, 0))
+    return inicio, min(inicio + filas_visibles, total)
+
+
+class FuenteResultadosET0:
+    """Filas de la tabla comparativa calculadas bajo demanda desde los resultados
+
+    resultados_exitosos: lista de (metodo_id, resultado), con resultado escalar
+    o serie (pd.Series / arreglo). errores: lista de (metodo_id, mensaje).
+    Con series, cada método ocupa n_dias filas consecutivas. Las pd.Series se
+    alinean por su índice (fechas): si un método no tiene algunos días (p. ej.
+    falló en algunos bloques), esos días quedan sin dato. Los arreglos de
+    distinto largo se completan con NaN al final.
+    """
+    
+    def __init__(self, resultados_exitosos, errores, nombre_metodo, categoria_metodo):
+        # Diferidos: no pesan en el arranque de la ventana
+        import numpy as np
+        import pandas as pd
+        
+        self.nombre_metodo = nombre_metodo
+        self.categoria_metodo = categoria_metodo
+        self.metodos = [metodo_id for metodo_id, _ in resultados_exitosos]
+        self.errores = list(errores)
+        
+        resultados = [resultado for _, resultado in resultados_exitosos]
+        self.fechas = None
+        if resultados and all(isinstance(resultado, pd.Series) for resultado in resultados):
+            tabla = pd.concat(resultados, axis=1, keys=range(len(resultados)))
+            if not tabla.index.is_monotonic_increasing:
+                tabla = tabla.sort_index()
+            self.matriz = tabla.to_numpy(dtype=float).T
+            if isinstance(tabla.index, pd.DatetimeIndex):
+                self.fechas = tabla.index
+        else:
+            valores = [np.atleast_1d(np.asarray(resultado, dtype=float)) for resultado in resultados]
+            self.matriz = np.full((len(valores), max(map(len, valores), default=0)), np.nan)
+            for fila, serie in zip(self.matriz, valores):
+                fila[:len(serie)] = serie
+        self.n_dias = self.matriz.shape[1]
+        
+        self.es_serie = self.n_dias > 1
+        self.columnas = ["#", "Método", "Fecha", "ET₀ (mm/día)", "Estado", "Categoría"] if self.es_serie \
+            else ["#", "Método", "ET₀ (mm/día)", "Estado", "Categoría"]
+    
+    def __len__(self):
+        return self.matriz.size + len(self.errores)
+    
+    def _nombre_corto(self, metodo_id):
+        nombre = self.nombre_metodo(metodo_id)
+        return nombre[:30] + "..." if len(nombre) > 30 else nombre
+    
+    def fila(self, i):
+        """Textos y colores de la fila i (índice 0)"""
+        if i < self.matriz.size:
+            m, d = divmod(i, self.n_dias)
+            metodo_id = self.metodos[m]
+            valor = self.matriz[m, d]
+            datos = [str(i + 1), self._nombre_corto(metodo_id)]
+            if self.es_serie:
+                datos.append(str(self.fechas[d].date()) if self.fechas is not None else str(d + 1))
+            if valor == valor:
+                datos += [f"{valor:.3f}", "✅ Exitoso", self.categoria_metodo(metodo_id)]
+                color_estado = "green"
+            else:
+                datos += ["—", "⚠️ Sin dato", self.categoria_metodo(metodo_id)]
+                color_estado = "orange"
+            colores = ["black"] * len(datos)
+            colores[-2] = color_estado
+            return datos, colores
+        
+        metodo_id, error = self.errores[i - self.matriz.size]
+        datos = [str(i + 1), self._nombre_corto(metodo_id)]
+        if self.es_serie:
+            datos.append("")
+        datos += ["Error", f"❌ {error[:20]}...", self.categoria_metodo(metodo_id)]
+        colores = ["black", "black"] + ["red"] * (len(datos) - 2)
+        return datos, colores
+    
+    def filas(self, inicio, fin):
+        """Textos y colores de las filas inicio..fin-1 (la ventana visible)"""
+        return [self.fila(i) for i in range(inicio, fin)]
+    
+    def estadisticas(self):
+        """Promedio, mínimo y máximo de todos los valores exitosos (None si no hay ninguno)"""
+        import numpy as np
+        
+        if not np.isfinite(self.matriz).any():
+            return None
+        return float(np.nanmean(self.matriz)), float(np.nanmin(self.matriz)), float(np.nanmax(self.matriz))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingesta por Bloques de Archivos de Estaciones (CSV / Parquet)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Lee archivos de estaciones en bloques de tamaño acotado, renombra las
+columnas a los nombres de "requerimientos" de METODOS_ET (t_min, t_max,
+rh_min, rh_max, rs, uz, z, lat) y entrega cada bloque al motor de ET₀.
+La precipitación, si viene, se conserva en el bloque para el balance
+hídrico.
+La memoria depende del tamaño del bloque, no del tamaño del archivo.
+Los CSV se leen como UTF-8 (con o sin BOM) o, si no lo son, como latin-1,
+la codificación habitual de las exportaciones de Excel en Windows.
+"""
+
+import codecs
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from control_calidad import depurar
+from metodos_et import METODOS_ET
+from metricas import medir
+from motor_et0 import VARIABLES_SERIE, VARIABLES_ESCALARES, calcular_et0_serie
+
+TAMANO_BLOQUE_DEFECTO = 100_000
+BYTES_REVISION_CODIFICACION = 1 << 20
+
+# Nombres habituales en archivos de estaciones -> nombres de requerimientos
+ALIAS_COLUMNAS = {
+    "t_min": ["t_min", "tmin", "temp_min", "temperatura_min", "temperatura_minima"],
+    "t_max": ["t_max", "tmax", "temp_max", "temperatura_max", "temperatura_maxima"],
+    "rh_min": ["rh_min", "rhmin", "hr_min", "humedad_min", "humedad_relativa_min"],
+    "rh_max": ["rh_max", "rhmax", "hr_max", "humedad_max", "humedad_relativa_max"],
+    "rs": ["rs", "radiacion", "radiacion_solar", "rad_solar"],
+    "uz": ["uz", "u2", "wind", "viento", "velocidad_viento"],
+    "z": ["z", "elevation", "elevacion", "altitud"],
+    "lat": ["lat", "latitud", "latitude"],
+    "precipitacion": ["precipitacion", "precip", "prcp", "lluvia", "pp"],
+    "kc": ["kc", "coef_cultivo", "coeficiente_cultivo"],
+    "fecha": ["fecha", "date", "time", "tiempo"],
+}
+
+
+def mapear_columnas(columnas, mapeo=None):
+    """Relacionar las columnas del archivo con los nombres de requerimientos
+
+    mapeo (opcional) fuerza pares {columna_archivo: requerimiento}; el resto se
+    reconoce por ALIAS_COLUMNAS sin distinguir mayúsculas. Retorna
+    {columna_archivo: requerimiento} solo con las columnas reconocidas.
+    """
+    resultado = {}
+    if mapeo:
+        resultado.update({col: nombre for col, nombre in mapeo.items() if col in columnas})
+    
+    ya_mapeados = set(resultado.values())
+    for columna in columnas:
+        if columna in resultado:
+            continue
+        clave = str(columna).strip().lower()
+        for nombre, alias in ALIAS_COLUMNAS.items():
+            if nombre not in ya_mapeados and clave in alias:
+                resultado[columna] = nombre
+                ya_mapeados.add(nombre)
+                break
+    
+    return resultado
+
+
+def _normalizar_bloque(bloque, renombrar):
+    """Renombrar columnas, usar la fecha como índice y convertir a float"""
+    bloque = bloque.rename(columns=renombrar)
+    if "fecha" in bloque:
+        bloque = bloque.set_index(pd.to_datetime(bloque.pop("fecha")))
+        bloque.index.name = "fecha"
+    return bloque.astype(float)
+
+
+def detectar_codificacion(ruta):
+    """"utf-8-sig" si el archivo es UTF-8 válido (con o sin BOM); si no, "latin-1"
+
+    Se revisa todo el archivo por partes (memoria acotada): un acento más
+    abajo, p. ej. en el nombre de la estación, también haría fallar la lectura.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    with open(ruta, "rb") as f:
+        try:
+            while True:
+                parte = f.read(BYTES_REVISION_CODIFICACION)
+                decodificador.decode(parte, final=not parte)
+                if not parte:
+                    return "utf-8-sig"
+        except UnicodeDecodeError:
+            return "latin-1"
+
+
+def leer_por_bloques(ruta, tamano_bloque=TAMANO_BLOQUE_DEFECTO, mapeo=None, codificacion=None):
+    """Leer un archivo de estación (CSV o Parquet) en bloques de DataFrames normalizados
+
+    codificacion: la del CSV; por defecto se detecta (detectar_codificacion).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    
+    if extension in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("La lectura de Parquet requiere 'pyarrow'.\n\n"
+                              "Para instalarla, ejecute en su terminal:\n"
+                              "pip install pyarrow")
+        archivo = pq.ParquetFile(ruta)
+        renombrar = mapear_columnas(archivo.schema_arrow.names, mapeo)
+        if not renombrar:
+            raise ValueError(f"Ninguna columna de {ruta} corresponde a las variables requeridas")
+        for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=list(renombrar)):
+            yield _normalizar_bloque(lote.to_pandas(), renombrar)
+        return
+    
+    # CSV (o texto delimitado): leer solo el encabezado para decidir separador y columnas
+    if codificacion is None:
+        codificacion = detectar_codificacion(ruta)
+    with open(ruta, newline="", encoding=codificacion) as f:
+        primera_linea = f.readline()
+    try:
+        separador = csv.Sniffer().sniff(primera_linea, delimiters=",;\t").delimiter
+    except csv.Error:
+        separador = ","
+    encabezado = pd.read_csv(ruta, nrows=0, sep=separador, encoding=codificacion)
+    renombrar = mapear_columnas(list(encabezado.columns), mapeo)
+    if not renombrar:
+        raise ValueError(f"Ninguna columna de {ruta} corresponde a las variables requeridas")
+    
+    lector = pd.read_csv(ruta, usecols=list(renombrar), chunksize=tamano_bloque, sep=separador,
+                         encoding=codificacion)
+    for bloque in lector:
+        yield _normalizar_bloque(bloque, renombrar)
+
+
+def escalares_del_bloque(bloque, z=None, lat=None):
+    """Obtener z y lat del bloque cuando vienen como columnas del archivo"""
+    if z is None and "z" in bloque:
+        z = float(bloque["z"].iloc[0])
+    if lat is None and "lat" in bloque:
+        lat = float(bloque["lat"].iloc[0])
+    return z, lat
+
+
+def calcular_con_almacen(datos, z, lat, metodos, almacen, estacion, **opciones):
+    """calcular_et0_serie solo para lo que no está en el almacén
+
+    Cada método se calcula solo si le faltan fechas en el almacén
+    (AlmacenResultados), sobre las fechas que le faltan a alguno de esos
+    métodos; lo calculado se guarda y el resto se lee del almacén. datos
+    debe tener índice de fechas. opciones se pasan a calcular_et0_serie.
+    """
+    if metodos is None:
+        metodos = list(METODOS_ET.keys())
+    pendientes = almacen.pendientes_por_metodo(estacion, metodos, datos.index)
+    a_calcular = [metodo_id for metodo_id in metodos if pendientes[metodo_id].any()]
+    errores = {}
+    if a_calcular:
+        filas = np.logical_or.reduce([pendientes[metodo_id] for metodo_id in a_calcular])
+        nuevos, errores = calcular_et0_serie(datos[filas], z, lat, a_calcular, **opciones)
+        almacen.guardar_et0(estacion, nuevos.index, nuevos)
+    
+    resultados = almacen.consultar_et0(estacion, metodos, datos.index.min(), datos.index.max()).reindex(datos.index)
+    # Igual que calcular_et0_serie: sin columna para los métodos que fallaron y no tienen nada guardado
+    return resultados[[m for m in metodos if m not in errores or resultados[m].notna().any()]], errores
+
+
+def procesar_archivo(ruta, z=None, lat=None, metodos=None, tamano_bloque=TAMANO_BLOQUE_DEFECTO,
+                     mapeo=None, pyet=None, backend="auto", metricas=None, almacen=None, estacion=None,
+                     cache=None, control_calidad="enmascarar", informe_calidad=None):
+    """Calcular ET₀ bloque a bloque para un archivo de estación
+
+    Genera (bloque, resultados, errores) por cada bloque leído; solo un
+    bloque vive en memoria a la vez. backend, metricas y cache se pasan a
+    calcular_et0_serie; con metricas también se registra la etapa "lectura"
+    de cada bloque.
+    
+    Con almacen (AlmacenResultados) y un archivo con columna de fechas, las
+    fechas ya guardadas para la estación no se recalculan y las nuevas se
+    guardan (ver calcular_con_almacen). estacion es por defecto el nombre
+    del archivo sin extensión.
+    
+    control_calidad ("enmascarar", "reparar" o None) decide qué pasa con las
+    filas que incumplen las reglas de control_calidad antes del cálculo
+    (etapa "validacion" en metricas); informe_calidad (InformeCalidad,
+    opcional) acumula la revisión de todos los bloques. Los bloques que se
+    generan conservan los datos originales.
+    """
+    if estacion is None:
+        estacion = os.path.splitext(os.path.basename(ruta))[0]
+    bloques = leer_por_bloques(ruta, tamano_bloque, mapeo)
+    while True:
+        inicio = time.perf_counter()
+        bloque = next(bloques, None)
+        if bloque is None:
+            return
+        if metricas is not None:
+            metricas.registrar("lectura", None, time.perf_counter() - inicio, len(bloque))
+        yield calcular_bloque(bloque, z, lat, metodos, pyet, backend, metricas, almacen, estacion, cache,
+                              control_calidad, informe_calidad)
+
+
+def calcular_bloque(bloque, z=None, lat=None, metodos=None, pyet=None, backend="auto", metricas=None,
+                    almacen=None, estacion=None, cache=None, control_calidad="enmascarar", informe_calidad=None):
+    """Control de calidad y ET₀ de un bloque leído con leer_por_bloques
+
+    Es el cálculo de cada bloque de procesar_archivo (ver sus parámetros).
+    Retorna (bloque, resultados, errores), con el bloque sin z ni lat.
+    """
+    z_bloque, lat_bloque = escalares_del_bloque(bloque, z, lat)
+    datos = bloque[[col for col in VARIABLES_SERIE if col in bloque]]
+    if control_calidad is not None:
+        with medir(metricas, "validacion", None, len(datos)):
+            datos, lat_bloque = depurar(datos, lat_bloque, control_calidad, informe_calidad)
+    if almacen is not None and isinstance(datos.index, pd.DatetimeIndex):
+        resultados, errores = calcular_con_almacen(datos, z_bloque, lat_bloque, metodos, almacen, estacion,
+                                                   pyet=pyet, backend=backend, metricas=metricas, cache=cache)
+    else:
+        resultados, errores = calcular_et0_serie(datos, z_bloque, lat_bloque, metodos, pyet,
+                                                 backend=backend, metricas=metricas, cache=cache)
+    return bloque.drop(columns=[col for col in VARIABLES_ESCALARES if col in bloque]), resultados, errores
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ingesta Concurrente de Muchos Archivos de Estaciones (asyncio)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Con cientos de archivos por corrida, leer y convertir cada archivo detiene
+el cálculo: mientras se espera al disco y al lector de CSV no se calcula
+nada. Aquí varios lectores leen archivos a la vez (leer_por_bloques, cada
+lectura en un hilo) y dejan los bloques en una cola acotada, de la que los
+trabajadores de cálculo toman los bloques listos. Cada bloque pasa por
+ingesta.calcular_bloque: el mismo control de calidad y el mismo
+calcular_et0_serie (registro de métodos y backends) que procesar_archivo
+y la calculadora.
+
+Los lectores no se adelantan a los trabajadores: cada bloque leído ocupa
+un cupo desde que se lee hasta que se entrega al consumidor, y un lector
+sin cupo espera. Nunca hay más de max_bloques bloques en memoria, sin
+importar cuántos archivos haya ni qué tan rápido se lean.
+
+Los bloques de cada archivo se entregan en el orden del archivo (el balance
+hídrico y los archivos de salida lo necesitan), aunque se calculen en
+desorden; los de archivos distintos se intercalan.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from ingesta import TAMANO_BLOQUE_DEFECTO, calcular_bloque, leer_por_bloques
+
+LECTORES_DEFECTO = 4
+TRABAJADORES_DEFECTO = 2
+MAX_BLOQUES_DEFECTO = 8
+
+
+async def procesar_archivos_concurrentes(rutas, z=None, lat=None, metodos=None, tamano_bloque=TAMANO_BLOQUE_DEFECTO,
+                                         mapeo=None, pyet=None, backend="auto", metricas=None, cache=None,
+                                         control_calidad="enmascarar", informe_calidad=None,
+                                         lectores=LECTORES_DEFECTO, trabajadores=TRABAJADORES_DEFECTO,
+                                         max_bloques=MAX_BLOQUES_DEFECTO):
+    """Calcular ET₀ de varios archivos de estación leyéndolos a la vez
+
+    Generador asíncrono: produce (ruta, bloque, resultados, errores) por cada
+    bloque, como procesar_archivo, y al terminar cada archivo
+    (ruta, None, None, error), con error None o el mensaje por el que el
+    archivo no se pudo leer o calcular (los demás archivos siguen; de un
+    archivo que falla no se entregan más bloques).
+
+    z, lat, metodos, tamano_bloque, mapeo, pyet, backend, metricas, cache y
+    control_calidad se usan como en procesar_archivo. informe_calidad es un
+    InformeCalidad para todos los archivos o un dict {ruta: InformeCalidad}.
+
+    lectores: archivos leídos a la vez; trabajadores: bloques calculados a
+    la vez (hilos); max_bloques: bloques en memoria como máximo.
+    """
+    if min(lectores, trabajadores, max_bloques) < 1:
+        raise ValueError("lectores, trabajadores y max_bloques deben ser al menos 1")
+    rutas = list(dict.fromkeys(rutas))
+    if not rutas:
+        return
+    
+    bucle = asyncio.get_running_loop()
+    cupos = asyncio.Semaphore(max_bloques)
+    cola = asyncio.Queue(maxsize=max_bloques)
+    # (ruta, numero, (bloque, resultados, errores), error) por bloque y (ruta, None, total, error) por archivo
+    listos = asyncio.Queue()
+    por_leer = iter(rutas)
+    ejecutor = ThreadPoolExecutor(max_workers=lectores + trabajadores, thread_name_prefix="ingesta")
+    
+    async def leer():
+        for ruta in por_leer:
+            numero = 0
+            error = None
+            try:
+                bloques = leer_por_bloques(ruta, tamano_bloque, mapeo)
+                while True:
+                    await cupos.acquire()
+                    inicio = time.perf_counter()
+                    try:
+                        bloque = await bucle.run_in_executor(ejecutor, next, bloques, None)
+                    except BaseException:
+                        cupos.release()
+                        raise
+                    if bloque is None:
+                        cupos.release()
+                        break
+                    if metricas is not None:
+                        metricas.registrar("lectura", None, time.perf_counter() - inicio, len(bloque))
+                    await cola.put((ruta, numero, bloque))
+                    numero += 1
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            listos.put_nowait((ruta, None, numero, error))
+    
+    async def calcular():
+        while True:
+            ruta, numero, bloque = await cola.get()
+            informe = informe_calidad.get(ruta) if isinstance(informe_calidad, dict) else informe_calidad
+            calculado = error = None
+            try:
+                calculado = await bucle.run_in_executor(ejecutor, partial(
+                    calcular_bloque, bloque, z, lat, metodos, pyet, backend, metricas, cache=cache,
+                    control_calidad=control_calidad, informe_calidad=informe))
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            listos.put_nowait((ruta, numero, calculado, error))
+    
+    tareas = ([asyncio.create_task(leer()) for _ in range(min(lectores, len(rutas)))]
+              + [asyncio.create_task(calcular()) for _ in range(trabajadores)])
+    siguiente = dict.fromkeys(rutas, 0)
+    en_espera = {ruta: {} for ruta in rutas}
+    finales = {}
+    fallidos = {}
+    terminados = 0
+    try:
+        while terminados < len(rutas):
+            ruta, numero, contenido, error = await listos.get()
+            if numero is None:
+                finales[ruta] = (contenido, error)
+            else:
+                en_espera[ruta][numero] = (contenido, error)
+            
+            # Entregar en orden lo que ya esté listo de este archivo
+            while siguiente[ruta] in en_espera[ruta]:
+                calculado, error = en_espera[ruta].pop(siguiente[ruta])
+                siguiente[ruta] += 1
+                if error is None and ruta not in fallidos:
+                    try:
+                        yield (ruta, *calculado)
+                    finally:
+                        cupos.release()
+                else:
+                    fallidos.setdefault(ruta, error)
+                    cupos.release()
+            
+            if ruta in finales and siguiente[ruta] == finales[ruta][0]:
+                _, error = finales.pop(ruta)
+                terminados += 1
+                yield ruta, None, None, fallidos.pop(ruta, error)
+    finally:
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        ejecutor.shutdown(wait=False, cancel_futures=True)
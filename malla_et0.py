@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ET₀ en Malla (tiempo × lat × lon) Fuera de Memoria
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Calcula los métodos de METODOS_ET sobre campos tipo reanálisis guardados
+como .npy mapeados en memoria o como variables NetCDF. La malla se recorre
+en bloques (días × filas × columnas): solo un bloque de cada variable y sus
+intermedios vive en memoria, y cada método escribe su resultado en un .npy
+mapeado en memoria con la misma forma que las entradas.
+
+Se usan los núcleos de nucleos_numpy sin cambios: los campos del bloque
+tienen forma (días, filas, columnas), la latitud (1, filas, 1) y el día del
+año (días, 1, 1), y NumPy los difunde. Ra y N salen del perfil anual exacto
+de cada fila de latitud (o de tabla_radiacion), igual que en calcular_et0_serie.
+
+Las variables deben estar en las unidades de la calculadora: °C, %,
+MJ/m²/día y m/s. Cada bloque pasa por el control de calidad (como en
+procesar_archivo): una celda con un valor imposible se enmascara o se
+repara en lugar de hacer fallar el método en todo el bloque.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from control_calidad import MODOS, corregir, revisar
+from metodos_et import METODOS_ET
+from metricas import medir
+from motor_et0 import VARIABLES_SERIE
+from nucleos_numpy import NUCLEOS, IntermediosNumpy, arreglos_desde_columnas, calcular_metodo_numpy
+from tablas_radiacion import perfil_anual
+
+# Tamaño de bloque (días, filas de latitud, columnas de longitud): ~12 MB por variable en float64
+BLOQUE_DEFECTO = (366, 64, 64)
+
+
+def abrir_npy(rutas):
+    """Abrir campos .npy (tiempo, lat, lon) en modo solo lectura y mapeados en memoria
+
+    rutas: {requerimiento: ruta}, con los nombres t_min, t_max, rh_min,
+    rh_max, rs y uz (los de METODOS_ET).
+    """
+    return {nombre: np.load(ruta, mmap_mode="r") for nombre, ruta in rutas.items()}
+
+
+@contextmanager
+def abrir_netcdf(ruta, mapeo=None):
+    """Abrir las variables de un NetCDF sin cargarlas en memoria
+
+    Los nombres se reconocen como en la ingesta de estaciones (ALIAS_COLUMNAS
+    de ingesta: tmax, latitude, time, elevation...); mapeo fuerza pares
+    {variable_netcdf: requerimiento}. Entrega (campos, latitudes, fechas, z):
+    campos son variables NetCDF que se leen por bloques al indexarlas, y z
+    es None si el archivo no trae altitud. El archivo se cierra al salir:
+
+        with abrir_netcdf("era5.nc") as (campos, latitudes, fechas, z):
+            calcular_et0_malla(campos, latitudes, fechas, "salida", z=z)
+    """
+    try:
+        import netCDF4
+    except ImportError:
+        raise ImportError("La lectura de NetCDF requiere 'netCDF4'.\n\n"
+                          "Para instalarla, ejecute en su terminal:\n"
+                          "pip install netCDF4")
+    from ingesta import mapear_columnas
+    
+    with netCDF4.Dataset(ruta) as conjunto:
+        variables = {nombre: conjunto.variables[columna]
+                     for columna, nombre in mapear_columnas(list(conjunto.variables), mapeo).items()}
+        if "lat" not in variables or "fecha" not in variables:
+            raise ValueError(f"{ruta} debe tener variables de latitud y de tiempo")
+        
+        tiempo = variables["fecha"]
+        fechas = pd.DatetimeIndex(netCDF4.num2date(tiempo[:], tiempo.units, getattr(tiempo, "calendar", "standard"),
+                                                   only_use_cftime_datetimes=False,
+                                                   only_use_python_datetimes=True))
+        latitudes = np.ma.filled(variables["lat"][:].astype(float), np.nan)
+        campos = {nombre: variable for nombre, variable in variables.items() if nombre in VARIABLES_SERIE}
+        yield campos, latitudes, fechas, variables.get("z")
+
+
+def _leer_bloque(campo, ventana):
+    """Leer un bloque como arreglo float contiguo (los valores enmascarados pasan a NaN)"""
+    valores = campo[ventana]
+    if np.ma.isMaskedArray(valores):
+        valores = valores.astype(float).filled(np.nan)
+    return np.ascontiguousarray(valores, dtype=float)
+
+
+def _depurar_bloque(columnas, modo, informe=None):
+    """Control de calidad de un bloque de la malla (cada celda-día es una fila de revisar)"""
+    forma = next(iter(columnas.values())).shape
+    planos = {nombre: valores.reshape(-1) for nombre, valores in columnas.items()}
+    control = revisar(planos)
+    if informe is not None:
+        informe.agregar(control)
+    if not control.banderas.any():
+        return columnas
+    # Solo los bloques con celdas malas pasan por un DataFrame (corregir copia los datos)
+    datos = corregir(pd.DataFrame(planos), control, modo)
+    return {nombre: datos[nombre].to_numpy().reshape(forma) for nombre in columnas}
+
+
+class IntermediosMalla(IntermediosNumpy):
+    """Intermedios de un bloque de la malla, con Ra y N por fila de latitud
+
+    perfiles_ra y perfiles_nn son los perfiles anuales (filas, 366) de las
+    filas del bloque; sin tabla_radiacion se indexan por día del año y se
+    difunden a lo largo de la longitud.
+    """
+    
+    def __init__(self, arreglos, perfiles_ra, perfiles_nn, tabla_radiacion=None):
+        super().__init__(arreglos, tabla_radiacion)
+        self.perfiles_ra = perfiles_ra
+        self.perfiles_nn = perfiles_nn
+    
+    def _por_fila(self, perfiles):
+        # (filas, 366) -> (días, filas, 1)
+        return perfiles[:, self.arreglos['dias'][:, 0, 0] - 1].T[:, :, None]
+    
+    def _calcular_ra(self):
+        if self.tabla_radiacion is not None:
+            return super()._calcular_ra()
+        return self._por_fila(self.perfiles_ra)
+    
+    def _calcular_nn(self):
+        if self.tabla_radiacion is not None:
+            return super()._calcular_nn()
+        return self._por_fila(self.perfiles_nn)
+    
+    def _calcular_nn_anual(self):
+        return self.perfiles_nn.sum(axis=1)[None, :, None]
+
+
+def calcular_et0_malla(campos, latitudes, fechas, directorio_salida, z=None, metodos=None,
+                       bloque=BLOQUE_DEFECTO, dtype=np.float32, tabla_radiacion=None, metricas=None,
+                       control_calidad="enmascarar", informe_calidad=None):
+    """Calcular ET₀ de varios métodos sobre una malla, bloque a bloque
+
+    campos: {requerimiento: arreglo (tiempo, lat, lon)} — .npy mapeados en
+    memoria (abrir_npy), variables NetCDF (abrir_netcdf) o arreglos.
+    latitudes: (lat,) en grados; fechas: fechas diarias de longitud tiempo.
+    z: altitud escalar o campo (lat, lon); se requiere para los métodos que
+    la usan, igual que en calcular_et0_serie.
+    bloque: (días, filas, columnas) de cada bloque; acota la memoria usada.
+
+    Cada método escribe directorio_salida/et0_<metodo>.npy (tipo dtype).
+    Retorna (salidas, errores): {metodo_id: memmap (tiempo, lat, lon)} y
+    {metodo_id: mensaje}. Los bloques sin ningún dato (por ejemplo, océano
+    enmascarado) se escriben como NaN sin calcular. Un bloque en el que un
+    método falla (p. ej. sin humedad fuera del dominio) también queda en
+    NaN y el método queda en errores con el número de bloques afectados;
+    solo si el método no dio valores en ningún bloque se elimina su
+    archivo y sale de salidas.
+
+    control_calidad ("enmascarar", "reparar" o None para omitirlo) e
+    informe_calidad (InformeCalidad, opcional) se usan como en
+    procesar_archivo; cada celda-día cuenta como una fila.
+
+    metricas (Metricas, opcional) recibe la etapa "lectura" de cada bloque,
+    la etapa "validacion" del control de calidad y la etapa "calculo" de
+    cada método en cada bloque (filas = celdas).
+    """
+    if metodos is None:
+        metodos = list(METODOS_ET.keys())
+    if not campos:
+        raise ValueError("Se requiere al menos un campo de entrada")
+    
+    formas = {nombre: tuple(campo.shape) for nombre, campo in campos.items()}
+    forma = next(iter(formas.values()))
+    if len(forma) != 3 or any(f != forma for f in formas.values()):
+        raise ValueError(f"Todos los campos deben tener la misma forma (tiempo, lat, lon); se recibió {formas}")
+    n_tiempo, n_lat, n_lon = forma
+    
+    latitudes = np.asarray(latitudes, dtype=float)
+    fechas = pd.DatetimeIndex(fechas)
+    if latitudes.shape != (n_lat,):
+        raise ValueError(f"Se esperaban {n_lat} latitudes; se recibió la forma {latitudes.shape}")
+    if len(fechas) != n_tiempo:
+        raise ValueError(f"Se esperaban {n_tiempo} fechas; se recibieron {len(fechas)}")
+    if z is not None and np.ndim(z) not in (0, 2):
+        raise ValueError("z debe ser un escalar o un campo (lat, lon)")
+    if control_calidad is not None and control_calidad not in MODOS:
+        raise ValueError(f"Modo desconocido: {control_calidad}. Use uno de {MODOS}")
+    
+    dias_anio = fechas.dayofyear.to_numpy()
+    meses = fechas.month.to_numpy()
+    
+    # Perfiles exactos de Ra y N por fila de latitud (se calculan una vez)
+    perfiles_ra = np.stack([perfil_anual(float(lat))[0] for lat in latitudes])
+    perfiles_nn = np.stack([perfil_anual(float(lat))[1] for lat in latitudes])
+    
+    os.makedirs(directorio_salida, exist_ok=True)
+    errores = {}
+    salidas = {}
+    rutas = {}
+    for metodo_id in metodos:
+        if metodo_id not in NUCLEOS:
+            errores[metodo_id] = f"El método {metodo_id} no tiene núcleo NumPy"
+            continue
+        rutas[metodo_id] = os.path.join(directorio_salida, f"et0_{metodo_id}.npy")
+        salidas[metodo_id] = np.lib.format.open_memmap(rutas[metodo_id], mode="w+", dtype=dtype, shape=forma)
+    if not salidas:
+        return salidas, errores
+    
+    # Por método: bloques calculados, bloques fallidos y el primer mensaje de falla
+    calculados = dict.fromkeys(salidas, 0)
+    fallas = {}
+    paso_t, paso_y, paso_x = bloque
+    for t0 in range(0, n_tiempo, paso_t):
+        for y0 in range(0, n_lat, paso_y):
+            for x0 in range(0, n_lon, paso_x):
+                ventana = (slice(t0, t0 + paso_t), slice(y0, y0 + paso_y), slice(x0, x0 + paso_x))
+                
+                inicio = time.perf_counter()
+                columnas = {nombre: _leer_bloque(campo, ventana) for nombre, campo in campos.items()}
+                z_bloque = z if np.ndim(z) == 0 else _leer_bloque(z, ventana[1:])[None]
+                celdas = next(iter(columnas.values())).size
+                if metricas is not None:
+                    metricas.registrar("lectura", None, time.perf_counter() - inicio, celdas)
+                
+                if control_calidad is not None:
+                    with medir(metricas, "validacion", None, celdas):
+                        columnas = _depurar_bloque(columnas, control_calidad, informe_calidad)
+                
+                if not any(np.isfinite(valores).any() for valores in columnas.values()):
+                    for salida in salidas.values():
+                        salida[ventana] = np.nan
+                    continue
+                
+                filas = slice(y0, y0 + paso_y)
+                arreglos = arreglos_desde_columnas(columnas, dias_anio[ventana[0], None, None],
+                                                   meses[ventana[0], None, None], z_bloque,
+                                                   latitudes[None, filas, None])
+                intermedios = IntermediosMalla(arreglos, perfiles_ra[filas], perfiles_nn[filas], tabla_radiacion)
+                
+                for metodo_id, salida in salidas.items():
+                    with medir(metricas, "calculo", metodo_id, celdas) as medicion:
+                        try:
+                            salida[ventana] = calcular_metodo_numpy(metodo_id, arreglos, intermedios)
+                            calculados[metodo_id] += 1
+                        except Exception as e:
+                            medicion["error"] = str(e)
+                            salida[ventana] = np.nan
+                            bloques, mensaje = fallas.get(metodo_id, (0, str(e)))
+                            fallas[metodo_id] = (bloques + 1, mensaje)
+        
+        # Bajar a disco lo escrito en este tramo de días
+        for salida in salidas.values():
+            salida.flush()
+    
+    for metodo_id, (bloques, mensaje) in fallas.items():
+        if calculados[metodo_id]:
+            errores[metodo_id] = f"{mensaje} (bloques en NaN: {bloques})"
+        else:
+            errores[metodo_id] = mensaje
+            del salidas[metodo_id]
+            os.remove(rutas[metodo_id])
+    return salidas, errores
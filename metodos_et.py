@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de Métodos ET₀ - 20 Métodos Oficiales PyET
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Metadatos de cada método (nombre, función pyet, variables requeridas).
+Este módulo no importa pandas ni pyet, para que la interfaz pueda leerlo
+al arrancar sin pagar el costo de esas librerías.
+
+La llamada a pyet de cada método se describe con datos, que
+registro_metodos compila una sola vez:
+
+    parametros_pyet: argumentos de la función pyet, con los nombres de
+        preparar_argumentos (lat se entrega en radianes)
+    constantes_pyet: argumentos fijos, p. ej. {"etype": "os"}
+    intermedios_pyet: variables de CacheIntermedios que el método acepta
+        ya calculadas (pressure, ea, rn)
+    fuentes_pyet: argumentos que se toman de otra variable, en orden de
+        preferencia, p. ej. {"tmean": ["tmax", "tmean"]}
+    respaldo_pyet: otra llamada (mismas claves) para cuando faltan
+        variables de la principal
+
+Un método nuevo se agrega con una entrada más en este diccionario.
+"""
+
+# MÉTODOS CORREGIDOS Y COMPLETOS - 20 MÉTODOS OFICIALES PyET
+METODOS_ET = {
+    # 🏆 MÉTODOS PENMAN-MONTEITH (Datos completos - máxima precisión)
+    "pm_fao56": {
+        "nombre": "FAO-56 Penman-Monteith",
+        "funcion": "pm_fao56",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
+        "descripcion": "🏆 Estándar internacional FAO-56. Máxima precisión (rs=70 s/m)",
+        "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"],
+        "intermedios_pyet": ["pressure", "ea", "rn"]
+    },
+    "penman": {
+        "nombre": "Penman Original (1948)",
+        "funcion": "penman",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
+        "descripcion": "🏆 Método Penman original clásico. Base histórica PM",
+        "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"],
+        "intermedios_pyet": ["pressure", "ea", "rn"]
+    },
+    "pm": {
+        "nombre": "Penman-Monteith Genérico",
+        "funcion": "pm",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
+        "descripcion": "🏆 PM genérico configurable. Investigación avanzada",
+        "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"],
+        "intermedios_pyet": ["pressure", "ea", "rn"]
+    },
+    "pm_asce": {
+        "nombre": "ASCE Penman-Monteith",
+        "funcion": "pm_asce",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
+        "descripcion": "🏆 ASCE estándar americano. etype='os' (pasto) / 'rs' (alfalfa)",
+        "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"],
+        "constantes_pyet": {"etype": "os"},
+        "intermedios_pyet": ["pressure", "ea", "rn"]
+    },
+    "kimberly_penman": {
+        "nombre": "Kimberly-Penman",
+        "funcion": "kimberly_penman",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
+        "descripcion": "🏆 Variante Penman con corrección estacional de viento",
+        "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"],
+        "intermedios_pyet": ["pressure", "ea", "rn"]
+    },
+    "thom_oliver": {
+        "nombre": "Thom-Oliver",
+        "funcion": "thom_oliver",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z", "lat"],
+        "descripcion": "🏆 Variante PM con resistencias superficiales variables",
+        "parametros_pyet": ["tmean", "wind", "rs", "rhmax", "rhmin", "elevation", "lat", "tmax", "tmin"],
+        "intermedios_pyet": ["pressure", "ea", "rn"]
+    },
+    
+    # ☀️ MÉTODOS BASADOS EN RADIACIÓN (Sin viento/humedad)
+    "priestley_taylor": {
+        "nombre": "Priestley-Taylor",
+        "funcion": "priestley_taylor",
+        "requerimientos": ["t_min", "t_max", "rs", "z", "lat"],
+        "descripcion": "☀️ Alpha=1.26. Ideal para zonas húmedas (humedad opcional)",
+        "parametros_pyet": ["tmean", "rs", "elevation", "lat", "tmax", "tmin", "rhmax", "rhmin"],
+        "intermedios_pyet": ["pressure", "rn"],
+        # Sin humedad: humedad relativa media supuesta de 65 %
+        "respaldo_pyet": {
+            "parametros_pyet": ["tmean", "rs", "elevation", "lat", "tmax", "tmin"],
+            "constantes_pyet": {"rh": 65.0}
+        }
+    },
+    "makkink": {
+        "nombre": "Makkink",
+        "funcion": "makkink",
+        "requerimientos": ["t_min", "t_max", "rs", "z"],
+        "descripcion": "☀️ Método holandés. Climas templados europeos",
+        "parametros_pyet": ["tmean", "rs", "elevation"],
+        "intermedios_pyet": ["pressure"]
+    },
+    "makkink_knmi": {
+        "nombre": "Makkink KNMI",
+        "funcion": "makkink_knmi",
+        "requerimientos": ["t_min", "t_max", "rs"],
+        "descripcion": "☀️ Versión oficial instituto meteorológico holandés",
+        "parametros_pyet": ["tmean", "rs"]
+    },
+    "jensen_haise": {
+        "nombre": "Jensen-Haise",
+        "funcion": "jensen_haise", 
+        "requerimientos": ["t_min", "t_max", "rs"],
+        "descripcion": "☀️ Optimizado para zonas áridas/riego. Oeste EE.UU.",
+        "parametros_pyet": ["tmean", "rs"]
+    },
+    "abtew": {
+        "nombre": "Abtew",
+        "funcion": "abtew",
+        "requerimientos": ["t_min", "t_max", "rs"],
+        "descripcion": "☀️ Simplificado para regiones tropicales. K=0.53",
+        "parametros_pyet": ["tmean", "rs"]
+    },
+    
+    # 🌡️ MÉTODOS SIMPLES (Solo temperatura)
+    "hargreaves": {
+        "nombre": "Hargreaves",
+        "funcion": "hargreaves",
+        "requerimientos": ["t_min", "t_max", "lat"],
+        "descripcion": "🌡️ Solo temperatura. Más robusto para datos limitados",
+        "parametros_pyet": ["tmean", "tmax", "tmin", "lat"]
+    },
+    "mcguinness_bordne": {
+        "nombre": "McGuinness-Bordne",
+        "funcion": "mcguinness_bordne",
+        "requerimientos": ["t_min", "t_max", "lat"],
+        "descripcion": "🌡️ Basado en temperatura y radiación extraterrestre",
+        "parametros_pyet": ["tmean", "lat"]
+    },
+    "hamon": {
+        "nombre": "Hamon",
+        "funcion": "hamon",
+        "requerimientos": ["t_min", "t_max", "lat"],
+        "descripcion": "🌡️ Muy simple. Solo temperatura y ubicación",
+        "parametros_pyet": ["tmean", "lat"]
+    },
+    "oudin": {
+        "nombre": "Oudin",
+        "funcion": "oudin",
+        "requerimientos": ["t_min", "t_max", "lat"],
+        "descripcion": "🌡️ Francés simplificado. Formula: Ra*(T+5)/(λ*100)",
+        "parametros_pyet": ["tmean", "lat"]
+    },
+    "linacre": {
+        "nombre": "Linacre",
+        "funcion": "linacre",
+        "requerimientos": ["t_min", "t_max", "z", "lat"],
+        "descripcion": "🗻 Australiano. Incluye corrección por altitud (lat en grados)",
+        "parametros_pyet": ["tmean", "tmax", "tmin", "elevation", "lat"]
+    },
+    
+    # 💧 MÉTODOS CON HUMEDAD
+    "turc": {
+        "nombre": "Turc",
+        "funcion": "turc",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs"],
+        "descripcion": "💧 Incluye corrección por humedad <50%. Regiones húmedas",
+        "parametros_pyet": ["tmean", "rs", "rh"]
+    },
+    "romanenko": {
+        "nombre": "Romanenko",
+        "funcion": "romanenko",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max"],
+        "descripcion": "💧 Fórmula rusa: 4.5*(1+T/25)²*(1-ea/es)",
+        "parametros_pyet": ["tmean", "rh", "tmax", "tmin"]
+    },
+    "haude": {
+        "nombre": "Haude",
+        "funcion": "haude",
+        "requerimientos": ["t_max", "rh_min"],
+        "descripcion": "💨 Alemán muy simple. Solo T_max y RH_min",
+        "parametros_pyet": ["tmean", "rh"],
+        "fuentes_pyet": {"tmean": ["tmax", "tmean"]}
+    },
+    
+    # 🔬 MÉTODOS ESPECIALIZADOS
+    "fao_24": {
+        "nombre": "FAO-24 Radiation",
+        "funcion": "fao_24",
+        "requerimientos": ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz", "z"],
+        "descripcion": "📊 FAO-24 con corrección radiativa y viento",
+        "parametros_pyet": ["tmean", "wind", "rs", "rh", "elevation"],
+        "intermedios_pyet": ["pressure"]
+    },
+    "blaney_criddle": {
+        "nombre": "Blaney-Criddle",
+        "funcion": "blaney_criddle",
+        "requerimientos": ["t_min", "t_max", "lat"],
+        "descripcion": "🌾 Clásico para riego. Basado en horas de luz y temperatura",
+        "parametros_pyet": ["tmean", "lat"]
+    }
+}
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Métricas de Rendimiento por Método y Etapa
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Registra tiempo de pared, filas procesadas, memoria asignada y motivo de
+falla por método y por etapa del flujo:
+
+    lectura      -> leer entradas (campos de la ventana o bloques de archivo)
+    validacion   -> validar rangos de las variables
+    calculo      -> ejecutar cada método ET₀
+    dibujo       -> mostrar resultados en la tabla
+    exportacion  -> escribir CSV
+
+Los registros quedan en memoria (Metricas.registros, Metricas.resumen()) y
+se pueden guardar como traza JSON o CSV. La memoria se mide con tracemalloc
+solo si se pide (memoria=True), porque tracemalloc hace más lento el cálculo;
+el valor es el pico de memoria asignada durante el bloque medido, y con
+varios hilos activos incluye lo que asignen los demás.
+"""
+
+import csv
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+ETAPAS = ("lectura", "validacion", "calculo", "dibujo", "exportacion")
+
+COLUMNAS_TRAZA = ["inicio_s", "etapa", "metodo", "segundos", "filas", "memoria_bytes", "exito", "error"]
+
+
+class Metricas:
+    """Registro en memoria de mediciones por etapa y método (seguro entre hilos)"""
+    
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.registros = []
+        self._origen = time.perf_counter()
+        self._candado = threading.Lock()
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    def registrar(self, etapa, metodo=None, segundos=0.0, filas=0, memoria_bytes=None, error=None, inicio_s=None):
+        """Agregar una medición ya tomada"""
+        if etapa not in ETAPAS:
+            raise ValueError(f"Etapa desconocida: {etapa}. Use una de {ETAPAS}")
+        registro = {
+            "inicio_s": round(inicio_s if inicio_s is not None else time.perf_counter() - self._origen - segundos, 6),
+            "etapa": etapa,
+            "metodo": metodo,
+            "segundos": segundos,
+            "filas": int(filas),
+            "memoria_bytes": memoria_bytes,
+            "exito": error is None,
+            "error": error,
+        }
+        with self._candado:
+            self.registros.append(registro)
+        return registro
+    
+    @contextmanager
+    def medir(self, etapa, metodo=None, filas=0):
+        """Medir el bloque with; retorna un dict donde se puede anotar 'error' o 'filas'
+
+        Si el bloque lanza una excepción se registra como falla y se propaga.
+        """
+        anotaciones = {"filas": filas, "error": None}
+        memoria_inicial = None
+        if self.memoria and tracemalloc.is_tracing():
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield anotaciones
+        except Exception as e:
+            anotaciones["error"] = anotaciones["error"] or str(e)
+            raise
+        finally:
+            segundos = time.perf_counter() - inicio
+            memoria_bytes = None
+            if memoria_inicial is not None:
+                memoria_bytes = max(tracemalloc.get_traced_memory()[1] - memoria_inicial, 0)
+            self.registrar(etapa, metodo, segundos, anotaciones["filas"], memoria_bytes,
+                           anotaciones["error"], inicio_s=inicio - self._origen)
+    
+    def extender(self, registros):
+        """Incorporar registros tomados en otro proceso (ver ejecucion_paralela)"""
+        with self._candado:
+            self.registros.extend(registros)
+    
+    def limpiar(self):
+        with self._candado:
+            self.registros.clear()
+    
+    def resumen(self):
+        """Totales por (etapa, método), ordenados del más costoso al menos costoso"""
+        grupos = {}
+        with self._candado:
+            registros = list(self.registros)
+        for registro in registros:
+            clave = (registro["etapa"], registro["metodo"])
+            grupo = grupos.setdefault(clave, {
+                "etapa": registro["etapa"], "metodo": registro["metodo"], "llamadas": 0, "fallas": 0,
+                "segundos_total": 0.0, "segundos_max": 0.0, "filas": 0, "memoria_max_bytes": None,
+                "ultimo_error": None,
+            })
+            grupo["llamadas"] += 1
+            grupo["segundos_total"] += registro["segundos"]
+            grupo["segundos_max"] = max(grupo["segundos_max"], registro["segundos"])
+            grupo["filas"] += registro["filas"]
+            if registro["memoria_bytes"] is not None:
+                grupo["memoria_max_bytes"] = max(grupo["memoria_max_bytes"] or 0, registro["memoria_bytes"])
+            if not registro["exito"]:
+                grupo["fallas"] += 1
+                grupo["ultimo_error"] = registro["error"]
+        
+        for grupo in grupos.values():
+            grupo["filas_por_segundo"] = grupo["filas"] / grupo["segundos_total"] if grupo["segundos_total"] > 0 else None
+        return sorted(grupos.values(), key=lambda g: g["segundos_total"], reverse=True)
+    
+    def metodos_mas_lentos(self, cantidad=5):
+        """Métodos con mayor tiempo total de cálculo"""
+        return [g for g in self.resumen() if g["etapa"] == "calculo" and g["metodo"] is not None][:cantidad]
+    
+    def exportar_json(self, ruta):
+        """Guardar la traza completa y el resumen como JSON"""
+        with self._candado:
+            registros = list(self.registros)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump({"registros": registros, "resumen": self.resumen()}, f, indent=2, ensure_ascii=False)
+    
+    def exportar_csv(self, ruta):
+        """Guardar la traza como CSV (un registro por fila)"""
+        with self._candado:
+            registros = list(self.registros)
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=COLUMNAS_TRAZA)
+            escritor.writeheader()
+            escritor.writerows(registros)
+    
+    def exportar(self, ruta):
+        """Guardar la traza en JSON o CSV según la extensión del archivo"""
+        if str(ruta).lower().endswith(".csv"):
+            self.exportar_csv(ruta)
+        else:
+            self.exportar_json(ruta)
+
+
+@contextmanager
+def _sin_medicion():
+    yield {"filas": 0, "error": None}
+
+
+def medir(metricas, etapa, metodo=None, filas=0):
+    """metricas.medir(...) si hay objeto de métricas; si no, un bloque sin costo"""
+    if metricas is None:
+        return _sin_medicion()
+    return metricas.medir(etapa, metodo, filas)
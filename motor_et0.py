@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de Cálculo ET₀ - Series Temporales Completas
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecuta cada método de METODOS_ET una sola vez sobre el registro completo
+de una estación (DataFrame diario con t_min, t_max, rh_min, rh_max, rs, uz
+y valores escalares de altitud z y latitud lat). La interfaz gráfica usa
+este mismo motor con un registro de una sola fila. Cada corrida elige su
+backend: los núcleos NumPy de nucleos_numpy o pyet como referencia.
+"""
+
+import math
+import pandas as pd
+
+from metodos_et import METODOS_ET
+from metricas import medir
+from nucleos_numpy import NUCLEOS, IntermediosNumpy, calcular_metodo_numpy, preparar_arreglos
+from planificador import planificar
+from registro_metodos import REGISTRO
+from tablas_radiacion import perfil_anual
+
+# Variables que llegan como series diarias y como escalares de la estación
+VARIABLES_SERIE = ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz"]
+VARIABLES_ESCALARES = ["z", "lat"]
+
+# Backends de cálculo: núcleos NumPy, pyet (referencia) o NumPy con pyet de respaldo
+BACKENDS = ("auto", "numpy", "pyet")
+
+
+def indice_temporal(datos):
+    """Obtener el índice de fechas del registro (o uno sintético si no tiene fechas)"""
+    if isinstance(datos.index, pd.DatetimeIndex):
+        return datos.index
+    return pd.date_range('2023-01-01', periods=len(datos), freq='D')
+
+
+def preparar_argumentos(datos, z=None, lat=None, nodos=None):
+    """Construir los argumentos pyet a partir del registro de una estación
+    
+    nodos (opcional, de PlanCalculo.nodos_de): solo se construyen esos
+    argumentos; sin él, todos los que permiten las columnas.
+    """
+    fecha = indice_temporal(datos)
+    argumentos = {}
+    
+    def serie(columna):
+        return pd.Series(datos[columna].to_numpy(dtype=float), index=fecha)
+    
+    def pedido(nombre):
+        return nodos is None or nombre in nodos
+    
+    # Temperatura
+    if 't_max' in datos and pedido('tmax'):
+        argumentos['tmax'] = serie('t_max')
+    if 't_min' in datos and pedido('tmin'):
+        argumentos['tmin'] = serie('t_min')
+    if 'tmax' in argumentos and 'tmin' in argumentos and pedido('tmean'):
+        argumentos['tmean'] = (argumentos['tmax'] + argumentos['tmin']) / 2
+    
+    # Humedad relativa
+    if 'rh_min' in datos and 'rh_max' in datos:
+        if pedido('rhmax'):
+            argumentos['rhmax'] = serie('rh_max')
+        if pedido('rhmin'):
+            argumentos['rhmin'] = serie('rh_min')
+        if pedido('rh'):
+            argumentos['rh'] = (argumentos['rhmax'] + argumentos['rhmin']) / 2
+    elif 'rh_min' in datos and pedido('rh'):
+        argumentos['rh'] = serie('rh_min')
+    
+    # Radiación solar
+    if 'rs' in datos and pedido('rs'):
+        argumentos['rs'] = serie('rs')
+    
+    # Viento
+    if 'uz' in datos and pedido('wind'):
+        argumentos['wind'] = serie('uz')
+    
+    # Elevación
+    if z is not None and pedido('elevation'):
+        argumentos['elevation'] = z
+    
+    # Latitud
+    if lat is not None:
+        if pedido('lat'):
+            argumentos['lat'] = lat
+        if pedido('lat_rad'):
+            argumentos['lat_rad'] = math.radians(lat)
+    
+    return argumentos
+
+
+def clave_entrada(argumentos):
+    """Clave de identidad de los argumentos de una corrida (objetos, no valores)"""
+    return tuple(sorted(
+        (nombre, id(valor) if isinstance(valor, pd.Series) else valor)
+        for nombre, valor in argumentos.items()
+    ))
+
+
+class CacheIntermedios:
+    """Variables intermedias compartidas por todos los métodos de una corrida
+    
+    Presión atmosférica, constante psicrométrica, pendiente de la curva de
+    presión de vapor, presiones de vapor (es, ea), radiación extraterrestre y
+    duración del día (de tablas_radiacion), radiación de cielo despejado y
+    radiación neta se calculan una sola vez,
+    bajo demanda, y se entregan a cada método pyet que las acepta.
+    """
+    
+    def __init__(self, argumentos, pyet, tabla_radiacion=None):
+        self.argumentos = argumentos
+        self.clave = clave_entrada(argumentos)
+        self.pyet = pyet
+        self.tabla_radiacion = tabla_radiacion
+        self._valores = {}
+    
+    def corresponde_a(self, argumentos):
+        """Verificar que el cache se construyó con estos mismos argumentos"""
+        return argumentos is self.argumentos or clave_entrada(argumentos) == self.clave
+    
+    def obtener(self, nombre):
+        """Obtener una variable intermedia (calculándola la primera vez)"""
+        if nombre not in self._valores:
+            self._valores[nombre] = getattr(self, f"_calcular_{nombre}")()
+        return self._valores[nombre]
+    
+    def _calcular_pressure(self):
+        return self.pyet.meteo_utils.calc_press(self.argumentos['elevation'])
+    
+    def _calcular_gamma(self):
+        return self.pyet.meteo_utils.calc_psy(self.obtener('pressure'))
+    
+    def _calcular_dlt(self):
+        return self.pyet.meteo_utils.calc_vpc(self.argumentos['tmean'])
+    
+    def _calcular_es(self):
+        arg = self.argumentos
+        return self.pyet.meteo_utils.calc_es(tmean=arg['tmean'], tmax=arg['tmax'], tmin=arg['tmin'])
+    
+    def _calcular_ea(self):
+        arg = self.argumentos
+        return self.pyet.meteo_utils.calc_ea(tmean=arg['tmean'], tmax=arg['tmax'], tmin=arg['tmin'],
+                                             rhmax=arg['rhmax'], rhmin=arg['rhmin'])
+    
+    def _calcular_dias(self):
+        return self.argumentos['tmean'].index.dayofyear.to_numpy()
+    
+    def _calcular_ra(self):
+        # Tabla precalculada por latitud en lugar de trigonometría por fila
+        if self.tabla_radiacion is not None:
+            ra = self.tabla_radiacion.ra(self.argumentos['lat'], self.obtener('dias'))
+        else:
+            ra = perfil_anual(self.argumentos['lat'])[0][self.obtener('dias') - 1]
+        return pd.Series(ra, index=self.argumentos['tmean'].index)
+    
+    def _calcular_nn(self):
+        if self.tabla_radiacion is not None:
+            nn = self.tabla_radiacion.n(self.argumentos['lat'], self.obtener('dias'))
+        else:
+            nn = perfil_anual(self.argumentos['lat'])[1][self.obtener('dias') - 1]
+        return pd.Series(nn, index=self.argumentos['tmean'].index)
+    
+    def _calcular_rso(self):
+        return self.pyet.rad_utils.calc_rso(self.obtener('ra'), self.argumentos['elevation'])
+    
+    def _calcular_rn(self):
+        arg = self.argumentos
+        return self.pyet.rad_utils.calc_rad_net(
+            tmean=arg['tmean'], rs=arg['rs'], lat=arg['lat_rad'],
+            tmax=arg['tmax'], tmin=arg['tmin'], rhmax=arg['rhmax'], rhmin=arg['rhmin'],
+            elevation=arg['elevation'], rso=self.obtener('rso'), ea=self.obtener('ea')
+        )
+
+
+def ejecutar_metodo(metodo_id, argumentos, pyet, intermedios=None):
+    """Ejecutar un método pyet sobre los argumentos ya preparados (serie completa)
+    
+    La llamada sale del registro de métodos (registro_metodos): qué argumentos
+    pasar, constantes y variables intermedias se describen en METODOS_ET.
+    """
+    # Variables intermedias ya calculadas en esta corrida
+    if intermedios is not None and not intermedios.corresponde_a(argumentos):
+        intermedios = None
+    return REGISTRO.ejecutar(metodo_id, argumentos, pyet, intermedios)
+
+
+def calcular_et0_serie(datos, z=None, lat=None, metodos=None, pyet=None, tabla_radiacion=None,
+                       backend="auto", metricas=None, cache=None):
+    """Calcular ET₀ de varios métodos sobre el registro completo de una estación
+    
+    Retorna (resultados, errores): un DataFrame con una columna por método
+    exitoso (mismo índice que el registro) y un diccionario metodo_id -> mensaje.
+    Con tabla_radiacion (TablaRadiacion) Ra se interpola de la malla; sin ella
+    se usa el perfil anual exacto de la latitud.
+    
+    backend: "numpy" usa solo los núcleos de nucleos_numpy (no requiere pyet),
+    "pyet" llama a pyet para todos los métodos y "auto" usa el núcleo NumPy
+    de cada método que lo tenga y pyet para el resto.
+    
+    metricas (Metricas, opcional) recibe un registro de la etapa "calculo"
+    por método (tiempo, filas, motivo de falla) y uno sin método para la
+    preparación de argumentos. Las variables intermedias compartidas se
+    cuentan en el primer método que las usa.
+    
+    cache (CacheDiscoET0, opcional): los métodos cuyo resultado ya está en
+    el caché para este mismo registro no se calculan (ni se registran en
+    metricas); los que se calculan con éxito se guardan en él.
+    
+    Los métodos a los que les faltan columnas (según el planificador) no se
+    llaman: quedan en errores con las variables que faltan, y solo se
+    derivan los argumentos que usan los demás.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend}. Use uno de {BACKENDS}")
+    if metodos is None:
+        metodos = list(METODOS_ET.keys())
+    
+    plan = planificar(datos.columns, metodos, z, lat)
+    ejecutables = plan.ejecutables
+    
+    if backend == "pyet":
+        con_pyet = list(ejecutables)
+    elif backend == "numpy":
+        con_pyet = []
+    else:
+        con_pyet = [metodo_id for metodo_id in ejecutables if metodo_id not in NUCLEOS]
+    
+    resultados = {}
+    errores = {metodo_id: plan.mensaje(metodo_id) for metodo_id in plan.omitidos}
+    filas = len(datos)
+    if metricas is not None:
+        # Falla sin costo: el método no llegó a llamarse
+        for metodo_id, error in errores.items():
+            metricas.registrar("calculo", metodo_id, error=error)
+    
+    claves = {}
+    if cache is not None:
+        from cache_et0 import huella_entrada
+        
+        huella = huella_entrada({col: datos[col].to_numpy() for col in VARIABLES_SERIE if col in datos},
+                                datos.index if isinstance(datos.index, pd.DatetimeIndex) else None,
+                                z, lat, tabla_radiacion)
+        for metodo_id in ejecutables:
+            claves[metodo_id] = cache.clave(huella, metodo_id, "pyet" if metodo_id in con_pyet else "numpy")
+            valores = cache.obtener(claves[metodo_id])
+            if valores is not None and len(valores) == filas:
+                resultados[metodo_id] = valores
+        con_pyet = [metodo_id for metodo_id in con_pyet if metodo_id not in resultados]
+    
+    con_numpy = [metodo_id for metodo_id in ejecutables if metodo_id not in con_pyet and metodo_id not in resultados]
+    if con_numpy:
+        with medir(metricas, "calculo", None, filas):
+            arreglos = preparar_arreglos(datos, indice_temporal(datos), z, lat)
+            intermedios_np = IntermediosNumpy(arreglos, tabla_radiacion)
+        for metodo_id in con_numpy:
+            with medir(metricas, "calculo", metodo_id, filas) as medicion:
+                try:
+                    if metodo_id not in NUCLEOS:
+                        raise KeyError(f"El método {metodo_id} no tiene núcleo NumPy")
+                    resultados[metodo_id] = calcular_metodo_numpy(metodo_id, arreglos, intermedios_np)
+                except Exception as e:
+                    errores[metodo_id] = medicion["error"] = str(e)
+    
+    if con_pyet:
+        if pyet is None:
+            import pyet
+        with medir(metricas, "calculo", None, filas):
+            argumentos = preparar_argumentos(datos, z, lat, plan.nodos_de(con_pyet))
+            intermedios = CacheIntermedios(argumentos, pyet, tabla_radiacion)
+        for metodo_id in con_pyet:
+            with medir(metricas, "calculo", metodo_id, filas) as medicion:
+                try:
+                    et0 = ejecutar_metodo(metodo_id, argumentos, pyet, intermedios)
+                    if et0 is None:
+                        errores[metodo_id] = medicion["error"] = "Resultado None"
+                        continue
+                    resultados[metodo_id] = pd.Series(et0).to_numpy(dtype=float)
+                except Exception as e:
+                    errores[metodo_id] = medicion["error"] = str(e)
+    
+    if cache is not None:
+        for metodo_id in con_numpy + con_pyet:
+            if metodo_id in resultados:
+                cache.guardar(claves[metodo_id], resultados[metodo_id])
+    
+    return pd.DataFrame({metodo_id: resultados[metodo_id] for metodo_id in metodos if metodo_id in resultados},
+                        index=datos.index), errores
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Núcleos NumPy de los Métodos ET₀ (sin pandas ni pyet)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Reimplementa cada método de METODOS_ET con las mismas ecuaciones y
+constantes de pyet 1.5.0, pero sobre arreglos float contiguos: no hay
+alineación de índices, validación de Series ni copias intermedias. Las
+variables compartidas (presión, es, ea, Ra, Rn...) se calculan una sola vez
+por corrida en IntermediosNumpy. La paridad con pyet se verifica en
+tests/test_paridad_numpy.py.
+"""
+
+import math
+
+import numpy as np
+
+from tablas_radiacion import perfil_anual
+
+# Cambiar al modificar las ecuaciones de un núcleo: invalida los resultados del caché en disco
+VERSION_NUCLEOS = "1"
+
+CP = 1.013 * 10**-3
+STEFAN_BOLTZMANN_DIA = 4.903 * 10**-9
+
+# Coeficientes mensuales de Haude (Schiff, 1975), como en pyet
+FACTORES_HAUDE = np.array([0.27, 0.27, 0.28, 0.39, 0.39, 0.37, 0.35, 0.33, 0.31, 0.29, 0.27, 0.27])
+
+
+def preparar_arreglos(datos, fecha, z=None, lat=None):
+    """Construir los argumentos como arreglos contiguos a partir del registro
+
+    Usa los mismos nombres que preparar_argumentos (tmax, tmin, tmean, rh...)
+    más 'dias' (día del año) y 'meses', tomados de fecha (DatetimeIndex).
+    """
+    columnas = {nombre: np.ascontiguousarray(datos[nombre].to_numpy(dtype=float))
+                for nombre in ('t_min', 't_max', 'rh_min', 'rh_max', 'rs', 'uz') if nombre in datos}
+    return arreglos_desde_columnas(columnas, fecha.dayofyear.to_numpy(), fecha.month.to_numpy(), z, lat)
+
+
+def arreglos_desde_columnas(columnas, dias, meses, z=None, lat=None):
+    """Argumentos de los núcleos a partir de arreglos con nombres de requerimientos
+
+    columnas: {t_min, t_max, rh_min, rh_max, rs, uz} -> arreglos de cualquier
+    forma compatible (series de una estación o bloques de una malla); dias,
+    meses, z y lat deben poder difundirse (broadcast) contra ellos.
+    """
+    arreglos = {}
+    
+    # Temperatura
+    if 't_max' in columnas:
+        arreglos['tmax'] = columnas['t_max']
+    if 't_min' in columnas:
+        arreglos['tmin'] = columnas['t_min']
+    if 'tmax' in arreglos and 'tmin' in arreglos:
+        arreglos['tmean'] = (arreglos['tmax'] + arreglos['tmin']) / 2
+    
+    # Humedad relativa
+    if 'rh_min' in columnas and 'rh_max' in columnas:
+        arreglos['rhmax'] = columnas['rh_max']
+        arreglos['rhmin'] = columnas['rh_min']
+        arreglos['rh'] = (arreglos['rhmax'] + arreglos['rhmin']) / 2
+    elif 'rh_min' in columnas:
+        arreglos['rh'] = columnas['rh_min']
+    
+    # Radiación solar y viento
+    if 'rs' in columnas:
+        arreglos['rs'] = columnas['rs']
+    if 'uz' in columnas:
+        arreglos['wind'] = columnas['uz']
+    
+    # Escalares de la estación (o campos de la malla)
+    if z is not None:
+        arreglos['elevation'] = z
+    if lat is not None:
+        arreglos['lat'] = lat
+        arreglos['lat_rad'] = np.radians(lat)
+    
+    arreglos['dias'] = dias
+    arreglos['meses'] = meses
+    return arreglos
+
+
+# ----------------------------------------------------------------------------
+# Utilidades (equivalentes a pyet.meteo_utils / pyet.utils)
+# ----------------------------------------------------------------------------
+
+def _e0(t):
+    """Presión de vapor de saturación [kPa]"""
+    return 0.6108 * np.exp(17.27 * t / (t + 237.3))
+
+
+def _lambda(tmean):
+    """Calor latente de vaporización [MJ/kg]"""
+    return 2.501 - 0.002361 * tmean
+
+
+def _recortar_ceros(pet):
+    """Valores negativos a cero (los NaN se conservan)"""
+    return np.where(pet < 0, 0.0, pet)
+
+
+def _verificar_rh(rh):
+    # Sin ningún valor np.nanmax advierte y el mensaje de unidades confundiría
+    if np.isnan(rh).all():
+        raise ValueError("No hay valores de humedad relativa (todos faltan)")
+    if np.nanmax(rh) > 1.0:
+        return rh
+    raise ValueError("La humedad relativa máxima es menor que 1 %. "
+                     "Ingrese la humedad relativa en porcentaje [%].")
+
+
+def _verificar_rad(rad):
+    if np.isnan(rad).all():
+        raise ValueError("No hay valores de radiación (todos faltan)")
+    if np.nanmax(rad) < 100:
+        return rad
+    raise ValueError("La radiación es mayor que 100 MJ/m²/día, lo cual no es realista. "
+                     "Convierta la radiación a MJ/m²/día.")
+
+
+def _radiacion_neta(arg, rso, ea):
+    """Radiación neta Rn [MJ/m²/día] (FAO-56, ecuaciones 38-40)"""
+    rns = (1 - 0.23) * arg['rs']
+    rso = np.where(rso != 0, rso, 0.001)
+    razon_solar = np.clip(arg['rs'] / rso, 0.3, 1)
+    tmp1 = STEFAN_BOLTZMANN_DIA * ((arg['tmax'] + 273.16) ** 4 + (arg['tmin'] + 273.16) ** 4) / 2
+    tmp2 = 0.34 - 0.14 * np.sqrt(ea)
+    tmp3 = np.clip(1.35 * razon_solar + -0.35, 0.05, 1)
+    return _verificar_rad(rns - tmp1 * tmp2 * tmp3)
+
+
+class IntermediosNumpy:
+    """Variables intermedias de una corrida, calculadas una vez y bajo demanda
+
+    Misma idea que CacheIntermedios de motor_et0, pero sobre arreglos. Ra y N
+    salen del perfil anual exacto de la latitud o de tabla_radiacion.
+    """
+    
+    def __init__(self, arreglos, tabla_radiacion=None):
+        self.arreglos = arreglos
+        self.tabla_radiacion = tabla_radiacion
+        self._valores = {}
+    
+    def obtener(self, nombre):
+        """Obtener una variable intermedia (calculándola la primera vez)"""
+        if nombre not in self._valores:
+            self._valores[nombre] = getattr(self, f"_calcular_{nombre}")()
+        return self._valores[nombre]
+    
+    def _calcular_pressure(self):
+        return 101.3 * ((293 - 0.0065 * self.arreglos['elevation']) / 293) ** 5.26
+    
+    def _calcular_gamma(self):
+        return 0.000665 * self.obtener('pressure')
+    
+    def _calcular_dlt(self):
+        tmean = self.arreglos['tmean']
+        return 4098 * _e0(tmean) / (tmean + 237.3) ** 2
+    
+    def _calcular_lambd(self):
+        return _lambda(self.arreglos['tmean'])
+    
+    def _calcular_e0_max(self):
+        return _e0(self.arreglos['tmax'])
+    
+    def _calcular_e0_min(self):
+        return _e0(self.arreglos['tmin'])
+    
+    def _calcular_es(self):
+        return (self.obtener('e0_max') + self.obtener('e0_min')) / 2
+    
+    def _calcular_ea(self):
+        arg = self.arreglos
+        rhmax = _verificar_rh(arg['rhmax'])
+        rhmin = _verificar_rh(arg['rhmin'])
+        return (self.obtener('e0_min') * rhmax / 200) + (self.obtener('e0_max') * rhmin / 200)
+    
+    def _calcular_ra(self):
+        if self.tabla_radiacion is not None:
+            return self.tabla_radiacion.ra(self.arreglos['lat'], self.arreglos['dias'])
+        return perfil_anual(self.arreglos['lat'])[0][self.arreglos['dias'] - 1]
+    
+    def _calcular_nn(self):
+        if self.tabla_radiacion is not None:
+            return self.tabla_radiacion.n(self.arreglos['lat'], self.arreglos['dias'])
+        return perfil_anual(self.arreglos['lat'])[1][self.arreglos['dias'] - 1]
+    
+    def _calcular_nn_anual(self):
+        # Horas de luz de un año bisiesto completo (exactas, también con tabla)
+        return perfil_anual(self.arreglos['lat'])[1].sum()
+    
+    def _calcular_rso(self):
+        return (0.75 + (2 * 10**-5) * self.arreglos['elevation']) * self.obtener('ra')
+    
+    def _calcular_rn(self):
+        return _radiacion_neta(self.arreglos, self.obtener('rso'), self.obtener('ea'))
+    
+    def _calcular_res_a(self):
+        # Resistencia aerodinámica (FAO-56) y de superficie para un cultivo de 0.12 m
+        wind = self.arreglos['wind']
+        return 208 / np.where(wind != 0, wind, 0.0001)
+    
+    def _calcular_res_s(self):
+        return (1 + 0.0009 * (300 - 300)) * 100 / (0.5 * 0.12 * 24)
+
+
+# ----------------------------------------------------------------------------
+# Métodos combinados (Penman-Monteith)
+# ----------------------------------------------------------------------------
+
+def _pm_fao56(arg, inter):
+    tmean, wind = arg['tmean'], arg['wind']
+    gamma, dlt = inter.obtener('gamma'), inter.obtener('dlt')
+    es, ea = inter.obtener('es'), inter.obtener('ea')
+    den = dlt + gamma * (1 + 0.34 * wind)
+    num1 = (0.408 * dlt * (inter.obtener('rn') - 0)) / den
+    num2 = (gamma * (es - ea) * 900 * wind / (tmean + 273)) / den
+    return _recortar_ceros(num1 + num2)
+
+
+def _penman(arg, inter):
+    gamma, dlt = inter.obtener('gamma'), inter.obtener('dlt')
+    fu = 1 + 0.537 * arg['wind']
+    den = dlt + gamma
+    num1 = dlt * (inter.obtener('rn') - 0) / den / inter.obtener('lambd')
+    num2 = gamma * (inter.obtener('es') - inter.obtener('ea')) * fu / den
+    return _recortar_ceros(num1 + num2)
+
+
+def _pm(arg, inter):
+    tmean = arg['tmean']
+    pressure, gamma, dlt = inter.obtener('pressure'), inter.obtener('gamma'), inter.obtener('dlt')
+    ea, res_a = inter.obtener('ea'), inter.obtener('res_a')
+    gamma1 = gamma * 1 / 1 * (1 + inter.obtener('res_s') / res_a)
+    tkv = (273.16 + tmean) * (1 - 0.378 * ea / pressure) ** -1
+    rho_a = 3.486 * pressure / tkv
+    den = inter.obtener('lambd') * (dlt + gamma1)
+    num1 = dlt * (inter.obtener('rn') - 0) / den
+    num2 = rho_a * CP * 86400 * (inter.obtener('es') - ea) * 1 / res_a / den
+    return _recortar_ceros(num1 + num2)
+
+
+def _pm_asce(arg, inter):
+    tmean, wind = arg['tmean'], arg['wind']
+    gamma, dlt = inter.obtener('gamma'), inter.obtener('dlt')
+    den = dlt + gamma * (1 + 0.34 * wind)
+    num1 = (0.408 * dlt * (inter.obtener('rn') - 0)) / den
+    num2 = gamma * 900 / (tmean + 273) * wind * (inter.obtener('es') - inter.obtener('ea')) / den
+    return _recortar_ceros(num1 + num2)
+
+
+def _kimberly_penman(arg, inter):
+    gamma, dlt = inter.obtener('gamma'), inter.obtener('dlt')
+    j = arg['dias']
+    w = arg['wind'] * (0.4 + 0.14 * np.exp(-(((j - 173) / 58) ** 2))
+                       + (0.605 + 0.345 * np.exp((j - 243) / 80) ** 2))
+    den = inter.obtener('lambd') * (dlt + gamma)
+    num1 = dlt * (inter.obtener('rn') - 0) / den
+    num2 = gamma * (inter.obtener('es') - inter.obtener('ea')) * w / den
+    return _recortar_ceros(num1 + num2)
+
+
+def _thom_oliver(arg, inter):
+    gamma, dlt = inter.obtener('gamma'), inter.obtener('dlt')
+    gamma1 = gamma * (1 + inter.obtener('res_s') / inter.obtener('res_a'))
+    w = 2.6 * (1 + 0.536 * arg['wind'])
+    den = inter.obtener('lambd') * (dlt + gamma1)
+    num1 = dlt * (inter.obtener('rn') - 0) / den
+    num2 = 2.5 * gamma * (inter.obtener('es') - inter.obtener('ea')) * w / den
+    return _recortar_ceros(num1 + num2)
+
+
+# ----------------------------------------------------------------------------
+# Métodos de radiación
+# ----------------------------------------------------------------------------
+
+def _priestley_taylor(arg, inter):
+    if 'rhmax' in arg and 'rhmin' in arg:
+        rn = inter.obtener('rn')
+    else:
+        # Sin humedad medida el motor usa RH = 65 % (como con pyet)
+        ea = 65.0 / 100 * inter.obtener('es')
+        rn = _radiacion_neta(arg, inter.obtener('rso'), ea)
+    dlt = inter.obtener('dlt')
+    pet = (1.26 * dlt * (rn - 0)) / (inter.obtener('lambd') * (dlt + inter.obtener('gamma')))
+    return _recortar_ceros(pet)
+
+
+def _makkink(arg, inter):
+    dlt = inter.obtener('dlt')
+    pet = 0.65 * dlt / (dlt + inter.obtener('gamma')) * _verificar_rad(arg['rs']) / inter.obtener('lambd')
+    return _recortar_ceros(pet)
+
+
+def _makkink_knmi(arg, inter):
+    tmean = arg['tmean']
+    pet = (
+        650
+        * (1 - (0.646 + 0.0006 * tmean)
+           / (7.5 * math.log(10) * 6.107 * 10 ** (7.5 * (1 - 1 / (1 + tmean / 237.3)))
+              / (237.3 * (1 + tmean / 237.3) * (1 + tmean / 237.3))
+              + 0.646 + 0.0006 * tmean))
+        / (2501 - 2.38 * tmean)
+        * arg['rs']
+    )
+    return _recortar_ceros(pet)
+
+
+def _jensen_haise(arg, inter):
+    pet = _verificar_rad(arg['rs']) / inter.obtener('lambd') * 0.025 * (arg['tmean'] - -3)
+    return _recortar_ceros(pet)
+
+
+def _abtew(arg, inter):
+    return _recortar_ceros(0.53 * _verificar_rad(arg['rs']) / inter.obtener('lambd'))
+
+
+def _fao_24(arg, inter):
+    wind, rh = arg['wind'], arg['rh']
+    dlt = inter.obtener('dlt')
+    w = (1.066 - 0.13 * _verificar_rh(rh) / 100 + 0.045 * wind - 0.02 * rh / 100 * wind
+         - 0.315 * (rh / 100) ** 2 - 0.0011 * wind)
+    pet = -0.3 + dlt / (dlt + inter.obtener('gamma')) * _verificar_rad(arg['rs']) * (1 - 0.23) * w \
+        / inter.obtener('lambd')
+    return _recortar_ceros(pet)
+
+
+def _turc(arg, inter):
+    tmean, rh = arg['tmean'], arg['rh']
+    c = np.where(_verificar_rh(rh) >= 50, tmean / tmean, 1 + (50 - rh) / 70)
+    pet = 0.013 * c * tmean / (tmean + 15) * (_verificar_rad(arg['rs']) * 23.88 + 50)
+    return _recortar_ceros(pet)
+
+
+# ----------------------------------------------------------------------------
+# Métodos de temperatura
+# ----------------------------------------------------------------------------
+
+def _hargreaves(arg, inter):
+    tmean = arg['tmean']
+    pet = 0.0135 / 0.0135 * 0.0023 * (tmean + 17.8) * np.sqrt(arg['tmax'] - arg['tmin']) \
+        * inter.obtener('ra') / inter.obtener('lambd')
+    return _recortar_ceros(pet)
+
+
+def _mcguinness_bordne(arg, inter):
+    pet = 0.0147 * inter.obtener('ra') * (arg['tmean'] + 5) / inter.obtener('lambd')
+    return _recortar_ceros(pet)
+
+
+def _hamon(arg, inter):
+    pet = 1 * (inter.obtener('nn') / 12) ** 2 * np.exp(arg['tmean'] / 16)
+    return _recortar_ceros(pet)
+
+
+def _oudin(arg, inter):
+    tmean = arg['tmean']
+    pet = inter.obtener('ra') * (tmean + 5) / inter.obtener('lambd') / 100
+    return _recortar_ceros(np.where((tmean + 5) >= 0, pet, 0.0))
+
+
+def _blaney_criddle(arg, inter):
+    # Porcentaje diario de horas de luz respecto al total de un año bisiesto
+    py = inter.obtener('nn') / inter.obtener('nn_anual') * 100
+    pet = -1.55 + 0.96 * (py * (0.457 * arg['tmean'] + 8.128))
+    return _recortar_ceros(pet)
+
+
+def _linacre(arg, inter):
+    lat_rad = arg['lat_rad']
+    if np.any(np.abs(lat_rad) >= 1.6):
+        raise ValueError("La latitud debe estar en radianes (entre -1.6 y 1.6)")
+    lat_grados = lat_rad / math.pi * 180
+    tmax, tmin, tmean = arg['tmax'], arg['tmin'], arg['tmean']
+    tdew = 0.52 * tmin + 0.6 * tmax - 0.009 * tmax ** 2 - 2
+    tm = tmean + 0.006 * arg['elevation']
+    pet = (500 * tm / (100 - lat_grados) + 15 * (tmean - tdew)) / (80 - tmean)
+    return _recortar_ceros(pet)
+
+
+def _romanenko(arg, inter):
+    es = inter.obtener('es')
+    ea = _verificar_rh(arg['rh']) / 100 * es
+    pet = 4.5 * (1 + arg['tmean'] / 25) ** 2 * (1 - ea / es)
+    return _recortar_ceros(pet)
+
+
+def _haude(arg, inter):
+    t = arg['tmax'] if 'tmax' in arg else arg['tmean']
+    e0 = _e0(t)
+    ea = _verificar_rh(arg['rh']) * e0 / 100
+    pet = 1 * FACTORES_HAUDE[arg['meses'] - 1] * (e0 - ea) * 10  # kPa a hPa
+    return _recortar_ceros(pet)
+
+
+# Núcleo de cada método de METODOS_ET
+NUCLEOS = {
+    "pm_fao56": _pm_fao56,
+    "penman": _penman,
+    "pm": _pm,
+    "pm_asce": _pm_asce,
+    "kimberly_penman": _kimberly_penman,
+    "thom_oliver": _thom_oliver,
+    "priestley_taylor": _priestley_taylor,
+    "makkink": _makkink,
+    "makkink_knmi": _makkink_knmi,
+    "jensen_haise": _jensen_haise,
+    "abtew": _abtew,
+    "hargreaves": _hargreaves,
+    "mcguinness_bordne": _mcguinness_bordne,
+    "hamon": _hamon,
+    "oudin": _oudin,
+    "linacre": _linacre,
+    "turc": _turc,
+    "romanenko": _romanenko,
+    "haude": _haude,
+    "fao_24": _fao_24,
+    "blaney_criddle": _blaney_criddle,
+}
+
+
+def calcular_metodo_numpy(metodo_id, arreglos, intermedios=None):
+    """Ejecutar el núcleo NumPy de un método; retorna un arreglo float por día"""
+    if intermedios is None:
+        intermedios = IntermediosNumpy(arreglos)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.asarray(NUCLEOS[metodo_id](arreglos, intermedios), dtype=float)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Planificador de Cálculo según las Variables Disponibles
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+A partir de las columnas que trae un registro (y de si hay z y lat) decide
+qué métodos de METODOS_ET pueden correr según sus requerimientos, y arma
+el grafo mínimo de cantidades derivadas que esos métodos necesitan (tmean,
+rh, lat_rad, presiones de vapor, Ra, Rn...). Cada nodo del plan se calcula
+una sola vez por bloque: los argumentos en preparar_argumentos y las
+variables intermedias en CacheIntermedios. Los métodos a los que les faltan
+entradas no se llaman.
+
+En una red de estaciones con sensores distintos, cada estación (o bloque)
+recibe su propio plan.
+"""
+
+from registro_metodos import ARGUMENTOS_DISPONIBLES, REGISTRO
+
+# Entradas de un registro: columnas diarias y escalares de la estación
+COLUMNAS_ENTRADA = ("t_min", "t_max", "rh_min", "rh_max", "rs", "uz")
+ESCALARES_ENTRADA = ("z", "lat")
+
+# Cantidades derivadas: nodo -> recetas (dependencias) en orden de preferencia.
+# Una dependencia es otro nodo o una entrada; la que tiene el mismo nombre del
+# nodo (rs, lat) es la entrada homónima.
+GRAFO_DERIVADAS = {
+    # Argumentos pyet (preparar_argumentos)
+    "tmax": [("t_max",)],
+    "tmin": [("t_min",)],
+    "tmean": [("tmax", "tmin")],
+    "rhmax": [("rh_max", "rh_min")],
+    "rhmin": [("rh_min", "rh_max")],
+    "rh": [("rhmax", "rhmin"), ("rh_min",)],
+    "rs": [("rs",)],
+    "wind": [("uz",)],
+    "elevation": [("z",)],
+    "lat": [("lat",)],
+    "lat_rad": [("lat",)],
+    # Variables intermedias (CacheIntermedios)
+    "pressure": [("elevation",)],
+    "gamma": [("pressure",)],
+    "dlt": [("tmean",)],
+    "es": [("tmean", "tmax", "tmin")],
+    "ea": [("tmean", "tmax", "tmin", "rhmax", "rhmin")],
+    "dias": [("tmean",)],
+    "ra": [("lat", "dias")],
+    "nn": [("lat", "dias")],
+    "rso": [("ra", "elevation")],
+    "rn": [("tmean", "rs", "lat_rad", "tmax", "tmin", "rhmax", "rhmin", "elevation", "rso", "ea")],
+}
+
+
+class PlanCalculo:
+    """Métodos que pueden correr y nodos derivados que hay que calcular
+
+    ejecutables: métodos en el orden pedido; omitidos: {metodo_id: variables
+    faltantes}; nodos: nodos derivados en orden topológico (cada uno después
+    de sus dependencias); nodos_por_metodo: {metodo_id: nodos que usa}.
+    """
+    
+    def __init__(self, ejecutables, omitidos, nodos, nodos_por_metodo):
+        self.ejecutables = ejecutables
+        self.omitidos = omitidos
+        self.nodos = nodos
+        self.nodos_por_metodo = nodos_por_metodo
+    
+    def nodos_de(self, metodos):
+        """Nodos (en orden topológico) que necesita un subconjunto de los métodos"""
+        necesarios = set()
+        for metodo_id in metodos:
+            necesarios.update(self.nodos_por_metodo.get(metodo_id, ()))
+        return [nodo for nodo in self.nodos if nodo in necesarios]
+    
+    def mensaje(self, metodo_id):
+        """Motivo por el que un método no se calcula"""
+        return f"Faltan variables: {', '.join(self.omitidos[metodo_id])}"
+
+
+def planificar(columnas, metodos=None, z=None, lat=None, registro=REGISTRO):
+    """Planear el cálculo de unos métodos con las columnas disponibles
+
+    columnas: nombres de las columnas del registro (p. ej. datos.columns).
+    Un método corre si están todos sus requerimientos y el registro de
+    métodos encuentra una llamada pyet con lo que se puede derivar.
+    """
+    if metodos is None:
+        metodos = list(registro.metodos)
+    entradas = {columna for columna in columnas if columna in COLUMNAS_ENTRADA}
+    entradas.update(nombre for nombre, valor in zip(ESCALARES_ENTRADA, (z, lat)) if valor is not None)
+    
+    recetas = {}
+    
+    def es_nodo(dependencia, nodo):
+        return dependencia != nodo and dependencia in GRAFO_DERIVADAS
+    
+    def resolver(nodo):
+        """Elegir la primera receta del nodo cuyas dependencias existen"""
+        if nodo not in recetas:
+            recetas[nodo] = next((dependencias for dependencias in GRAFO_DERIVADAS[nodo]
+                                  if all(resolver(d) if es_nodo(d, nodo) else d in entradas
+                                         for d in dependencias)), None)
+        return recetas[nodo] is not None
+    
+    derivables = {nodo for nodo in ARGUMENTOS_DISPONIBLES if resolver(nodo)}
+    
+    def cierre(nodo, orden):
+        """Agregar a orden el nodo y sus dependencias (antes que él)"""
+        if nodo in orden:
+            return
+        for dependencia in recetas[nodo]:
+            if es_nodo(dependencia, nodo):
+                cierre(dependencia, orden)
+        orden[nodo] = None
+    
+    ejecutables, omitidos, nodos, nodos_por_metodo = [], {}, {}, {}
+    for metodo_id in metodos:
+        info = registro.metodos.get(metodo_id)
+        if info is None or metodo_id not in registro:
+            ejecutables.append(metodo_id)  # el motor reporta el error del método desconocido
+            continue
+        faltantes = [variable for variable in info["requerimientos"] if variable not in entradas]
+        if not faltantes:
+            faltantes = registro.faltantes(metodo_id, derivables)
+        if not faltantes:
+            variante = registro.variante(metodo_id, derivables)
+            faltantes = [nombre for nombre in variante.intermedios if not resolver(nombre)]
+        if faltantes:
+            omitidos[metodo_id] = faltantes
+            continue
+        
+        orden = {}
+        for _, variable in variante.pares(derivables):
+            cierre(variable, orden)
+        for nombre in variante.intermedios:
+            cierre(nombre, orden)
+        ejecutables.append(metodo_id)
+        nodos_por_metodo[metodo_id] = list(orden)
+        for nodo in orden:
+            nodos[nodo] = None
+    
+    return PlanCalculo(ejecutables, omitidos, list(nodos), nodos_por_metodo)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de Métodos pyet con Enlaces Precompilados
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Convierte la descripción de datos de cada método en METODOS_ET
+(parametros_pyet, constantes_pyet, intermedios_pyet, fuentes_pyet,
+respaldo_pyet) en una llamada lista para pyet. La descripción se valida y
+compila una vez al importar el módulo; el enlace de un método con un
+conjunto concreto de variables disponibles (qué variante usar y de dónde
+sale cada argumento) se resuelve la primera vez y se reutiliza. Cada
+llamada solo arma los kwargs y llama a la función pyet, sin cadenas de
+if/elif por método.
+"""
+
+from metodos_et import METODOS_ET
+
+# Argumentos que produce motor_et0.preparar_argumentos
+ARGUMENTOS_DISPONIBLES = ("tmax", "tmin", "tmean", "rhmax", "rhmin", "rh", "rs", "wind",
+                          "elevation", "lat", "lat_rad")
+
+# Variables intermedias que CacheIntermedios sabe calcular y pyet acepta
+INTERMEDIOS_DISPONIBLES = ("pressure", "ea", "rn")
+
+# Argumento pyet -> variable de preparar_argumentos, cuando el nombre no coincide
+FUENTES_DEFECTO = {"lat": ("lat_rad",)}
+
+_CLAVES_VARIANTE = {"parametros_pyet", "constantes_pyet", "intermedios_pyet", "fuentes_pyet"}
+
+
+class VarianteMetodo:
+    """Una forma de llamar a la función pyet de un método (ya validada)"""
+    
+    def __init__(self, metodo_id, especificacion):
+        desconocidas = set(especificacion) - _CLAVES_VARIANTE
+        if desconocidas:
+            raise ValueError(f"{metodo_id}: claves desconocidas {sorted(desconocidas)}")
+        fuentes = especificacion.get("fuentes_pyet", {})
+        
+        # (argumento pyet, variables candidatas en orden de preferencia)
+        self.parametros = tuple(
+            (parametro, tuple(fuentes.get(parametro, FUENTES_DEFECTO.get(parametro, (parametro,)))))
+            for parametro in especificacion.get("parametros_pyet", [])
+        )
+        self.constantes = dict(especificacion.get("constantes_pyet", {}))
+        self.intermedios = tuple(especificacion.get("intermedios_pyet", []))
+        
+        for parametro, candidatas in self.parametros:
+            invalidas = [variable for variable in candidatas if variable not in ARGUMENTOS_DISPONIBLES]
+            if invalidas:
+                raise ValueError(f"{metodo_id}: '{parametro}' usa variables desconocidas {invalidas}")
+        invalidos = [nombre for nombre in self.intermedios if nombre not in INTERMEDIOS_DISPONIBLES]
+        if invalidos:
+            raise ValueError(f"{metodo_id}: intermedios desconocidos {invalidos}")
+    
+    def faltantes(self, disponibles):
+        """Argumentos pyet sin ninguna variable disponible"""
+        return [parametro for parametro, candidatas in self.parametros
+                if not any(variable in disponibles for variable in candidatas)]
+    
+    def pares(self, disponibles):
+        """(argumento pyet, variable elegida) para las variables disponibles"""
+        return tuple(
+            (parametro, next(variable for variable in candidatas if variable in disponibles))
+            for parametro, candidatas in self.parametros
+        )
+
+
+class EnlaceMetodo:
+    """Llamada a pyet ya resuelta para un método y un conjunto de variables"""
+    
+    def __init__(self, funcion, pares, constantes, intermedios):
+        self.funcion = funcion
+        self.pares = pares
+        self.constantes = constantes
+        self.intermedios = intermedios
+    
+    def __call__(self, argumentos, intermedios=None):
+        kwargs = {parametro: argumentos[variable] for parametro, variable in self.pares}
+        kwargs.update(self.constantes)
+        # Las variables intermedias se pasan solo si el cache es de estos mismos argumentos
+        if intermedios is not None:
+            for nombre in self.intermedios:
+                kwargs[nombre] = intermedios.obtener(nombre)
+        return self.funcion(**kwargs)
+
+
+class RegistroMetodos:
+    """Métodos pyet compilados a partir de sus descripciones en METODOS_ET"""
+    
+    def __init__(self, metodos=METODOS_ET):
+        self.metodos = metodos
+        self._variantes = {}
+        self._enlaces = {}
+        for metodo_id, info in metodos.items():
+            self._compilar(metodo_id, info)
+    
+    def _compilar(self, metodo_id, info):
+        if "funcion" not in info:
+            raise ValueError(f"{metodo_id}: falta 'funcion'")
+        principal = {clave: info[clave] for clave in _CLAVES_VARIANTE if clave in info}
+        variantes = [VarianteMetodo(metodo_id, principal)]
+        if "respaldo_pyet" in info:
+            variantes.append(VarianteMetodo(metodo_id, info["respaldo_pyet"]))
+        self._variantes[metodo_id] = (info["funcion"], variantes)
+    
+    def registrar(self, metodo_id, info):
+        """Agregar (o reemplazar) un método; queda también en su diccionario (METODOS_ET en REGISTRO)"""
+        self._compilar(metodo_id, info)
+        self.metodos[metodo_id] = info
+        self._enlaces = {clave: enlace for clave, enlace in self._enlaces.items() if clave[0] != metodo_id}
+    
+    def __contains__(self, metodo_id):
+        return metodo_id in self._variantes
+    
+    def faltantes(self, metodo_id, disponibles):
+        """Argumentos de la llamada principal sin variable disponible ([] si alguna variante alcanza)"""
+        _, variantes = self._variantes[metodo_id]
+        if any(not variante.faltantes(disponibles) for variante in variantes):
+            return []
+        return variantes[0].faltantes(disponibles)
+    
+    def variante(self, metodo_id, disponibles):
+        """Variante que se usa con esas variables (KeyError si a todas les falta alguna)"""
+        _, variantes = self._variantes[metodo_id]
+        variante = next((variante for variante in variantes if not variante.faltantes(disponibles)), None)
+        if variante is None:
+            raise KeyError(f"Faltan variables para {metodo_id}: {', '.join(variantes[0].faltantes(disponibles))}")
+        return variante
+    
+    def enlace(self, metodo_id, disponibles, pyet):
+        """Enlace del método para las variables disponibles (se resuelve una sola vez)"""
+        disponibles = frozenset(disponibles)
+        clave = (metodo_id, disponibles, pyet)
+        enlace = self._enlaces.get(clave)
+        if enlace is None:
+            variante = self.variante(metodo_id, disponibles)
+            enlace = EnlaceMetodo(getattr(pyet, self._variantes[metodo_id][0]), variante.pares(disponibles),
+                                  variante.constantes, variante.intermedios)
+            self._enlaces[clave] = enlace
+        return enlace
+    
+    def ejecutar(self, metodo_id, argumentos, pyet, intermedios=None):
+        """Ejecutar un método sobre los argumentos de preparar_argumentos"""
+        return self.enlace(metodo_id, argumentos, pyet)(argumentos, intermedios)
+
+
+# Registro compartido de la aplicación, compilado al importar
+REGISTRO = RegistroMetodos()
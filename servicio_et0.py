@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servicio Local JSON/HTTP de ET₀ y Balance Hídrico con Micro-lotes
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Expone por HTTP (solo en la máquina local por defecto) el mismo cálculo
+puntual de la calculadora: ET₀ de varios métodos para un día y el balance
+hídrico con su recomendación de riego.
+
+Las consultas que llegan al mismo tiempo se juntan en micro-lotes: un hilo
+espera unos milisegundos después de la primera consulta, reúne las que
+lleguen (hasta max_lote) y hace una sola llamada vectorizada al motor, en
+la que cada consulta es una fila. Luego cada consulta recibe su parte. Las
+consultas de ET₀ se agrupan por estación (z, lat) y columnas disponibles,
+porque el motor recibe z y lat escalares. Con muchas consultas puntuales
+concurrentes, el costo fijo de cada llamada al motor se reparte entre
+todas las del lote.
+
+Rutas:
+    POST /et0      {"valores": {"t_min": ..., "z": ..., "lat": ...},
+                    "metodos": [...], "fecha": "2023-01-01"}
+                   -> {"resultados": {metodo_id: et0}, "errores": {...}}
+    POST /balance  {"et0", "kc", "precipitacion", "humedad_actual", "humedad_cc",
+                    "humedad_pmp", "humedad_riego", "profundidad_radicular"}
+                   -> {"etc", "balance_diario", ..., "necesita_riego", "lamina_riego"}
+    GET  /salud    -> {"estado": "ok", "lotes": ..., "consultas": ...}
+
+ClienteLocal atiende las mismas consultas en el mismo proceso, sin socket,
+para pruebas y herramientas que importan el módulo.
+
+Uso:
+    python servicio_et0.py --puerto 8765
+"""
+
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from balance_hidrico import balance_puntual, validar_parametros_balance
+from control_calidad import REGLAS_DE_ARREGLO, revisar
+from metodos_et import METODOS_ET
+from motor_et0 import BACKENDS, VARIABLES_ESCALARES, VARIABLES_SERIE, calcular_et0_serie
+from planificador import planificar
+
+HOST_DEFECTO = "127.0.0.1"
+PUERTO_DEFECTO = 8765
+MAX_LOTE_DEFECTO = 256
+ESPERA_LOTE_S = 0.005
+
+# Fecha de las consultas sin fecha: la misma del cálculo puntual de la calculadora
+FECHA_DEFECTO = "2023-01-01"
+DECIMALES_ET0 = 3
+
+PARAMETROS_BALANCE = ("et0", "kc", "precipitacion", "humedad_actual", "humedad_cc", "humedad_pmp",
+                      "humedad_riego", "profundidad_radicular")
+
+
+class ErrorServicio(Exception):
+    """Consulta rechazada por el servicio (estado HTTP y mensaje)"""
+    
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class ProcesadorLotes:
+    """Junta consultas concurrentes en lotes y las atiende con una sola llamada
+
+    funcion_lote(consultas) retorna una lista con el resultado de cada
+    consulta, en el mismo orden (una excepción en la lista es la falla de
+    esa consulta). Cada lote sale cuando llega a max_lote consultas o
+    espera_s segundos después de su primera consulta.
+    """
+    
+    def __init__(self, funcion_lote, max_lote=MAX_LOTE_DEFECTO, espera_s=ESPERA_LOTE_S):
+        if max_lote < 1:
+            raise ValueError("max_lote debe ser al menos 1")
+        self.funcion_lote = funcion_lote
+        self.max_lote = max_lote
+        self.espera_s = espera_s
+        self.lotes = 0
+        self.consultas = 0
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._bucle, daemon=True)
+        self._hilo.start()
+    
+    def enviar(self, consulta):
+        """Encolar una consulta; retorna un Future con su resultado"""
+        futuro = Future()
+        self._cola.put((consulta, futuro))
+        return futuro
+    
+    def atender(self, consulta, tiempo_espera=None):
+        """Encolar una consulta y esperar su resultado"""
+        return self.enviar(consulta).result(tiempo_espera)
+    
+    def cerrar(self):
+        """Atender lo que ya está en cola y detener el hilo"""
+        self._cola.put(None)
+        self._hilo.join()
+    
+    def _bucle(self):
+        while True:
+            primero = self._cola.get()
+            if primero is None:
+                return
+            lote = [primero]
+            limite = time.monotonic() + self.espera_s
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                try:
+                    elemento = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if elemento is None:
+                    self._cola.put(None)  # cerrar después de este lote
+                    break
+                lote.append(elemento)
+            self._despachar(lote)
+    
+    def _despachar(self, lote):
+        self.lotes += 1
+        self.consultas += len(lote)
+        try:
+            resultados = self.funcion_lote([consulta for consulta, _ in lote])
+        except Exception as e:
+            for _, futuro in lote:
+                futuro.set_exception(e)
+            return
+        for (_, futuro), resultado in zip(lote, resultados):
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+
+
+def _numero(valor, nombre):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ErrorServicio(400, f"Valor inválido para {nombre}: {valor!r}")
+    return float(valor)
+
+
+def _falla_revision_de_arreglo(valores):
+    """Si una consulta no pasaría las revisiones de pyet sobre el arreglo completo
+
+    Son las REGLAS_DE_ARREGLO del control de calidad: en un grupo, los
+    valores de las otras consultas podrían ocultar la falla. La ruta /et0 ya
+    rechaza esas consultas; esto protege las que lleguen al lote por otra vía.
+    """
+    control = revisar(valores)
+    return any(control.columna(regla)[0] for regla in REGLAS_DE_ARREGLO)
+
+
+def _et0_json(valor):
+    """ET₀ redondeado como en la calculadora (None si no es finito)"""
+    return round(float(valor), DECIMALES_ET0) if math.isfinite(valor) else None
+
+
+class ServicioET0:
+    """Cálculo puntual de ET₀ y balance detrás de las rutas del servicio
+
+    backend se pasa a calcular_et0_serie ("pyet" por defecto, como el cálculo
+    puntual de la calculadora). metricas (Metricas, opcional) recibe la etapa
+    "calculo" de cada llamada al motor.
+    """
+    
+    def __init__(self, backend="pyet", max_lote=MAX_LOTE_DEFECTO, espera_s=ESPERA_LOTE_S, metricas=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend}. Use uno de {BACKENDS}")
+        self.backend = backend
+        self.metricas = metricas
+        self.lotes_et0 = ProcesadorLotes(self._lote_et0, max_lote, espera_s)
+        self.lotes_balance = ProcesadorLotes(self._lote_balance, max_lote, espera_s)
+        self.rutas = {
+            ("POST", "/et0"): self.et0,
+            ("POST", "/balance"): self.balance,
+            ("GET", "/salud"): self.salud,
+        }
+    
+    def cerrar(self):
+        self.lotes_et0.cerrar()
+        self.lotes_balance.cerrar()
+    
+    def atender(self, verbo, ruta, cuerpo=None):
+        """Atender una consulta ya decodificada; retorna (estado HTTP, respuesta)"""
+        manejador = self.rutas.get((verbo, ruta))
+        if manejador is None:
+            return 404, {"error": f"Ruta desconocida: {verbo} {ruta}"}
+        try:
+            if verbo == "POST" and not isinstance(cuerpo, dict):
+                raise ErrorServicio(400, "El cuerpo debe ser un objeto JSON")
+            return 200, manejador(cuerpo) if verbo == "POST" else manejador()
+        except ErrorServicio as e:
+            return e.estado, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+    
+    # ------------------------------------------------------------------
+    # ET₀
+    # ------------------------------------------------------------------
+    
+    def et0(self, cuerpo):
+        """ET₀ de un día para los métodos pedidos (todos si no se indican)"""
+        valores = cuerpo.get("valores")
+        if not isinstance(valores, dict) or not valores:
+            raise ErrorServicio(400, "Falta 'valores' con las variables del día")
+        desconocidas = [nombre for nombre in valores if nombre not in VARIABLES_SERIE + VARIABLES_ESCALARES]
+        if desconocidas:
+            raise ErrorServicio(400, f"Variables desconocidas: {desconocidas}")
+        valores = {nombre: _numero(valor, nombre) for nombre, valor in valores.items()}
+        
+        metodos = cuerpo.get("metodos") or list(METODOS_ET)
+        desconocidos = [metodo_id for metodo_id in metodos if metodo_id not in METODOS_ET]
+        if desconocidos:
+            raise ErrorServicio(400, f"Métodos desconocidos: {desconocidos}")
+        
+        # Mismas reglas que validar_valores de la calculadora
+        mensajes = revisar(valores).mensajes()
+        if mensajes:
+            raise ErrorServicio(400, mensajes[0])
+        
+        try:
+            fecha = pd.Timestamp(cuerpo.get("fecha") or FECHA_DEFECTO)
+        except ValueError:
+            raise ErrorServicio(400, f"Fecha inválida: {cuerpo.get('fecha')!r}")
+        return self.lotes_et0.atender({"valores": valores, "metodos": list(metodos), "fecha": fecha})
+    
+    def _lote_et0(self, consultas):
+        """Una llamada a calcular_et0_serie por grupo (z, lat, columnas) del lote
+
+        Cada consulta recibe lo mismo que si llegara sola. pyet y los núcleos
+        NumPy revisan la radiación y la humedad sobre todo el arreglo: una
+        consulta que no pasaría esas revisiones se calcula aparte, y los
+        métodos que fallan en un grupo se repiten consulta por consulta.
+        """
+        grupos = {}
+        for i, consulta in enumerate(consultas):
+            valores = consulta["valores"]
+            columnas = tuple(nombre for nombre in VARIABLES_SERIE if nombre in valores)
+            clave = (valores.get("z"), valores.get("lat"), columnas)
+            if _falla_revision_de_arreglo(valores):
+                clave += (i,)
+            grupos.setdefault(clave, []).append(i)
+        
+        respuestas = [None] * len(consultas)
+        for (z, lat, columnas, *_), indices in grupos.items():
+            metodos = list(dict.fromkeys(metodo_id for i in indices for metodo_id in consultas[i]["metodos"]))
+            try:
+                por_consulta = self._calcular_grupo(consultas, indices, z, lat, columnas, metodos)
+                # Los que faltan por variables fallarían igual solos
+                ejecutables = planificar(columnas, metodos, z, lat).ejecutables
+                fallidos = [metodo_id for metodo_id in ejecutables if metodo_id in por_consulta[0][1]]
+                if fallidos and len(indices) > 1:
+                    # La falla puede venir de una sola consulta del grupo: repetir cada una sola
+                    for (resultados, errores), i in zip(por_consulta, indices):
+                        pedidos = [metodo_id for metodo_id in fallidos if metodo_id in consultas[i]["metodos"]]
+                        if pedidos:
+                            solos, errores_solos = self._calcular_grupo(consultas, [i], z, lat, columnas, pedidos)[0]
+                            for metodo_id in pedidos:
+                                errores.pop(metodo_id, None)
+                            resultados.update(solos)
+                            errores.update(errores_solos)
+            except Exception as e:
+                for i in indices:
+                    respuestas[i] = ErrorServicio(500, f"{type(e).__name__}: {e}")
+                continue
+            for (resultados, errores), i in zip(por_consulta, indices):
+                pedidos = consultas[i]["metodos"]
+                respuestas[i] = {
+                    "resultados": {metodo_id: resultados[metodo_id] for metodo_id in pedidos if metodo_id in resultados},
+                    "errores": {metodo_id: errores[metodo_id] for metodo_id in pedidos if metodo_id in errores},
+                }
+        return respuestas
+    
+    def _calcular_grupo(self, consultas, indices, z, lat, columnas, metodos):
+        """Una llamada al motor para unas consultas; retorna [(resultados, errores)] por consulta"""
+        datos = pd.DataFrame({nombre: [consultas[i]["valores"][nombre] for i in indices] for nombre in columnas},
+                             index=pd.DatetimeIndex([consultas[i]["fecha"] for i in indices]))
+        resultados, errores = calcular_et0_serie(datos, z, lat, metodos, backend=self.backend,
+                                                 metricas=self.metricas)
+        columnas_resultado = {metodo_id: resultados[metodo_id].to_numpy() for metodo_id in resultados}
+        return [({metodo_id: _et0_json(valores[fila]) for metodo_id, valores in columnas_resultado.items()},
+                 dict(errores))
+                for fila in range(len(indices))]
+    
+    # ------------------------------------------------------------------
+    # Balance hídrico
+    # ------------------------------------------------------------------
+    
+    def balance(self, cuerpo):
+        """Balance de un día y recomendación de riego"""
+        faltantes = [nombre for nombre in PARAMETROS_BALANCE if nombre not in cuerpo]
+        if faltantes:
+            raise ErrorServicio(400, f"Faltan parámetros del balance: {faltantes}")
+        parametros = {nombre: _numero(cuerpo[nombre], nombre) for nombre in PARAMETROS_BALANCE}
+        mensajes = validar_parametros_balance(parametros)
+        if mensajes:
+            raise ErrorServicio(400, mensajes[0])
+        return self.lotes_balance.atender(parametros)
+    
+    def _lote_balance(self, consultas):
+        columnas = {nombre: np.array([consulta[nombre] for consulta in consultas]) for nombre in PARAMETROS_BALANCE}
+        balance = balance_puntual(**columnas)
+        return [{nombre: (bool(valores[i]) if valores.dtype == bool else float(valores[i]))
+                 for nombre, valores in balance.items()}
+                for i in range(len(consultas))]
+    
+    # ------------------------------------------------------------------
+    
+    def salud(self):
+        return {
+            "estado": "ok",
+            "backend": self.backend,
+            "metodos": list(METODOS_ET),
+            "lotes": self.lotes_et0.lotes + self.lotes_balance.lotes,
+            "consultas": self.lotes_et0.consultas + self.lotes_balance.consultas,
+        }
+
+
+class _ServidorHTTP(ThreadingHTTPServer):
+    daemon_threads = True
+    # Cola de conexiones amplia: muchas consultas puntuales llegan a la vez
+    request_queue_size = 128
+
+
+class ServidorET0:
+    """Servidor HTTP del servicio en un hilo de fondo (un hilo por conexión)
+
+    Uso:
+        with ServidorET0(puerto=0) as servidor:   # 0: puerto libre cualquiera
+            cliente = ClienteHTTP(servidor.url)
+    """
+    
+    def __init__(self, servicio=None, host=HOST_DEFECTO, puerto=PUERTO_DEFECTO):
+        self.servicio = servicio if servicio is not None else ServicioET0()
+        servicio = self.servicio
+        
+        class Manejador(BaseHTTPRequestHandler):
+            def _responder(self, verbo):
+                cuerpo = None
+                if verbo == "POST":
+                    try:
+                        largo = int(self.headers.get("Content-Length", 0))
+                        cuerpo = json.loads(self.rfile.read(largo) or b"null")
+                    except ValueError:
+                        estado, respuesta = 400, {"error": "El cuerpo no es JSON válido"}
+                    else:
+                        estado, respuesta = servicio.atender(verbo, self.path, cuerpo)
+                else:
+                    estado, respuesta = servicio.atender(verbo, self.path)
+                datos = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+            
+            def do_GET(self):
+                self._responder("GET")
+            
+            def do_POST(self):
+                self._responder("POST")
+            
+            def log_message(self, formato, *argumentos):
+                pass
+        
+        self._servidor = _ServidorHTTP((host, puerto), Manejador)
+        self._hilo = None
+    
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+    
+    def servir(self):
+        """Atender en el hilo actual hasta detener() (o Ctrl+C)"""
+        self._servidor.serve_forever()
+    
+    def iniciar(self):
+        """Atender en un hilo de fondo"""
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+    
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        if self._hilo is not None:
+            self._hilo.join()
+        self.servicio.cerrar()
+    
+    def __enter__(self):
+        return self.iniciar()
+    
+    def __exit__(self, tipo, valor, traza):
+        self.detener()
+        return False
+
+
+class ClienteHTTP:
+    """Cliente del servicio por HTTP"""
+    
+    def __init__(self, url, tiempo_espera=30.0):
+        self.url = url.rstrip("/")
+        self.tiempo_espera = tiempo_espera
+    
+    def _consultar(self, verbo, ruta, cuerpo=None):
+        datos = None if cuerpo is None else json.dumps(cuerpo).encode("utf-8")
+        solicitud = urllib.request.Request(self.url + ruta, data=datos, method=verbo,
+                                           headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(solicitud, timeout=self.tiempo_espera) as respuesta:
+                return json.loads(respuesta.read())
+        except urllib.error.HTTPError as e:
+            raise ErrorServicio(e.code, json.loads(e.read()).get("error", str(e)))
+    
+    def et0(self, valores, metodos=None, fecha=None):
+        """{"resultados": {metodo_id: et0}, "errores": {metodo_id: mensaje}}"""
+        cuerpo = {"valores": valores}
+        if metodos is not None:
+            cuerpo["metodos"] = list(metodos)
+        if fecha is not None:
+            cuerpo["fecha"] = str(fecha)
+        return self._consultar("POST", "/et0", cuerpo)
+    
+    def balance(self, **parametros):
+        return self._consultar("POST", "/balance", parametros)
+    
+    def salud(self):
+        return self._consultar("GET", "/salud")
+
+
+class ClienteLocal(ClienteHTTP):
+    """Mismo cliente atendido en el proceso (sin socket), para pruebas
+
+    Las consultas y respuestas pasan por JSON como en HTTP, de modo que lo
+    que funciona con ClienteLocal funciona igual contra el servidor.
+    """
+    
+    def __init__(self, servicio=None):
+        self.servicio = servicio if servicio is not None else ServicioET0()
+    
+    def _consultar(self, verbo, ruta, cuerpo=None):
+        if cuerpo is not None:
+            cuerpo = json.loads(json.dumps(cuerpo))
+        estado, respuesta = self.servicio.atender(verbo, ruta, cuerpo)
+        respuesta = json.loads(json.dumps(respuesta))
+        if estado != 200:
+            raise ErrorServicio(estado, respuesta.get("error", ""))
+        return respuesta
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Servicio local JSON/HTTP de ET₀ y balance hídrico")
+    parser.add_argument("--host", default=HOST_DEFECTO)
+    parser.add_argument("--puerto", type=int, default=PUERTO_DEFECTO)
+    parser.add_argument("--backend", choices=BACKENDS, default="pyet")
+    parser.add_argument("--max-lote", type=int, default=MAX_LOTE_DEFECTO, help="Consultas máximas por lote")
+    parser.add_argument("--espera-ms", type=float, default=ESPERA_LOTE_S * 1000,
+                        help="Espera para juntar consultas en un lote")
+    args = parser.parse_args(argumentos)
+    
+    servicio = ServicioET0(args.backend, args.max_lote, args.espera_ms / 1000)
+    servidor = ServidorET0(servicio, args.host, args.puerto)
+    print(f"🌐 Servicio ET₀ en {servidor.url} (Ctrl+C para detener)")
+    try:
+        servidor.servir()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.detener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabla Virtualizada de Resultados ET₀
+PyET Suite - Componente de interfaz
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+La tabla crea una sola vez un conjunto fijo de filas (las visibles) y al
+desplazarse solo cambia el texto de esas etiquetas. Los datos vienen de una
+fuente que calcula cada fila bajo demanda a partir de los arreglos de
+resultados, por lo que mostrar 200 000 filas cuesta lo mismo que mostrar 20.
+La fuente y la ventana visible están en fuente_resultados (sin widgets).
+"""
+
+import customtkinter as ctk
+
+from fuente_resultados import ventana_visible
+
+
+class TablaVirtual(ctk.CTkFrame):
+    """Tabla con un número fijo de filas dibujadas y desplazamiento sobre la fuente"""
+    
+    def __init__(self, master, filas_visibles=12, **kwargs):
+        super().__init__(master, **kwargs)
+        self.filas_visibles = filas_visibles
+        self.fuente = None
+        self.inicio = 0
+        self.columnas = []
+        
+        self.frame_encabezado = ctk.CTkFrame(self)
+        self.frame_encabezado.pack(fill="x", padx=5, pady=5)
+        
+        frame_cuerpo = ctk.CTkFrame(self)
+        frame_cuerpo.pack(fill="both", expand=True, padx=5, pady=2)
+        
+        self.frame_filas = ctk.CTkFrame(frame_cuerpo)
+        self.frame_filas.pack(side="left", fill="both", expand=True)
+        
+        self.scrollbar = ctk.CTkScrollbar(frame_cuerpo, command=self._desplazar_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.label_vacia = ctk.CTkLabel(self.frame_filas, text="No hay resultados para mostrar",
+                                        font=ctk.CTkFont(size=12))
+        self.labels_encabezado = []
+        self.labels_filas = []
+        
+        for widget in (self, self.frame_filas):
+            widget.bind("<MouseWheel>", self._rueda)
+            widget.bind("<Button-4>", lambda e: self.desplazar(-3))
+            widget.bind("<Button-5>", lambda e: self.desplazar(3))
+    
+    def _construir_columnas(self, columnas):
+        """Crear encabezado y filas fijas (solo si cambia el número de columnas)"""
+        if columnas == self.columnas:
+            return
+        for label in self.labels_encabezado:
+            label.destroy()
+        for fila in self.labels_filas:
+            for label in fila:
+                label.destroy()
+        
+        self.columnas = columnas
+        self.labels_encabezado = []
+        for i, header in enumerate(columnas):
+            label = ctk.CTkLabel(self.frame_encabezado, text=header,
+                                 font=ctk.CTkFont(size=12, weight="bold"))
+            label.grid(row=0, column=i, padx=5, pady=5, sticky="ew")
+            self.frame_encabezado.grid_columnconfigure(i, weight=1)
+            self.labels_encabezado.append(label)
+        
+        self.labels_filas = []
+        for r in range(self.filas_visibles):
+            fila = []
+            for i in range(len(columnas)):
+                label = ctk.CTkLabel(self.frame_filas, text="", font=ctk.CTkFont(size=11))
+                label.grid(row=r, column=i, padx=5, pady=3, sticky="ew")
+                label.bind("<MouseWheel>", self._rueda)
+                label.bind("<Button-4>", lambda e: self.desplazar(-3))
+                label.bind("<Button-5>", lambda e: self.desplazar(3))
+                fila.append(label)
+            self.labels_filas.append(fila)
+        for i in range(len(columnas)):
+            self.frame_filas.grid_columnconfigure(i, weight=1)
+    
+    def mostrar(self, fuente):
+        """Mostrar una fuente de filas (len(fuente), fuente.filas(inicio, fin), fuente.columnas)"""
+        self.fuente = fuente
+        self.inicio = 0
+        if not len(fuente):
+            self.limpiar()
+            return
+        self.label_vacia.grid_remove()
+        self._construir_columnas(fuente.columnas)
+        self._dibujar()
+    
+    def limpiar(self):
+        """Vaciar la tabla sin destruir las filas reutilizables"""
+        self.fuente = None
+        self.inicio = 0
+        for fila in self.labels_filas:
+            for label in fila:
+                label.configure(text="")
+        self.scrollbar.set(0, 1)
+        self.label_vacia.grid(row=0, column=0, columnspan=max(len(self.columnas), 1), pady=20)
+    
+    def desplazar(self, filas):
+        """Mover la ventana visible un número de filas"""
+        if self.fuente is None:
+            return
+        inicio, _ = ventana_visible(len(self.fuente), self.inicio + filas, self.filas_visibles)
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._dibujar()
+    
+    def _rueda(self, evento):
+        self.desplazar(-3 if evento.delta > 0 else 3)
+    
+    def _desplazar_scrollbar(self, accion, cantidad, unidad=None):
+        if self.fuente is None:
+            return
+        if accion == "moveto":
+            self.desplazar(int(float(cantidad) * len(self.fuente)) - self.inicio)
+        elif accion == "scroll":
+            paso = self.filas_visibles if unidad == "pages" else 1
+            self.desplazar(int(cantidad) * paso)
+    
+    def _dibujar(self):
+        """Actualizar solo el texto de las filas visibles"""
+        total = len(self.fuente)
+        self.inicio, fin = ventana_visible(total, self.inicio, self.filas_visibles)
+        visibles = self.fuente.filas(self.inicio, fin)
+        for r, fila in enumerate(self.labels_filas):
+            if r < len(visibles):
+                datos, colores = visibles[r]
+                for label, dato, color in zip(fila, datos, colores):
+                    label.configure(text=dato, text_color=color)
+            else:
+                for label in fila:
+                    label.configure(text="")
+        self.scrollbar.set(self.inicio / total, fin / total)
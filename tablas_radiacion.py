@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tablas Precalculadas de Radiación Extraterrestre (Ra) y Duración del Día (N)
+PyET Suite - Núcleo sin interfaz gráfica
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ra y N dependen solo de la latitud y del día del año (FAO-56, ecuaciones
+21-25 y 34), por lo que se precalculan una vez en una malla de latitudes
+× 366 días y se consultan por interpolación lineal en latitud. Para una
+latitud puntual (una estación) se usa el perfil anual exacto de 366 días.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+DIAS_ANIO = 366
+MUESTRAS_COTA = 16
+_K_RA = 118.08 / 3.141592654
+
+
+def _ra_n_exactos(lat_rad, dias):
+    """Ra [MJ/m²/día] y N [horas] exactos (mismas ecuaciones que pyet)"""
+    lat_rad = np.asarray(lat_rad, dtype=float)
+    dias = np.asarray(dias, dtype=float)
+    dr = 1 + 0.033 * np.cos(2.0 * np.pi / 365.0 * dias)
+    sol_dec = 0.409 * np.sin(2.0 * np.pi / 365.0 * dias - 1.39)
+    omega = np.arccos(np.clip(-np.tan(sol_dec) * np.tan(lat_rad), -1, 1))
+    ra = _K_RA * dr * (omega * np.sin(sol_dec) * np.sin(lat_rad)
+                       + np.cos(sol_dec) * np.cos(lat_rad) * np.sin(omega))
+    n = 24 / np.pi * omega
+    return ra, n
+
+
+def _pendiente_max_ra(dias):
+    """Cota de |dRa/dφ| [MJ/m²/día por radián] para cada día del año
+
+    dRa/dφ = K·dr·(ω·sen δ·cos φ − cos δ·sen φ·sen ω): los términos con dω/dφ
+    se anulan (sen δ·sen φ + cos δ·cos φ·cos ω = 0), y con ω en 0..π queda
+    |dRa/dφ| <= K·dr·(π·|sen δ| + cos δ) en toda latitud.
+    """
+    dias = np.asarray(dias, dtype=float)
+    dr = 1 + 0.033 * np.cos(2.0 * np.pi / 365.0 * dias)
+    sol_dec = 0.409 * np.sin(2.0 * np.pi / 365.0 * dias - 1.39)
+    return _K_RA * dr * (np.pi * np.abs(np.sin(sol_dec)) + np.cos(sol_dec))
+
+
+@lru_cache(maxsize=1024)
+def perfil_anual(lat_grados):
+    """Perfil exacto de Ra y N para una latitud (arreglos de 366 días, solo lectura)"""
+    ra, n = _ra_n_exactos(np.radians(lat_grados), np.arange(1, DIAS_ANIO + 1))
+    ra.setflags(write=False)
+    n.setflags(write=False)
+    return ra, n
+
+
+class TablaRadiacion:
+    """Tabla compacta (float32) de Ra y N en una malla de latitudes × 366 días
+
+    Al construir la tabla se calcula una cota del error de la interpolación
+    lineal en latitud (incluido el redondeo a float32), que queda en
+    cota_error_ra [MJ/m²/día] y cota_error_n [horas]: el error se evalúa en
+    muestras_cota + 1 latitudes de cada celda y entre dos muestras seguidas
+    (separadas s) se aparta de la recta que las une a lo más:
+
+        Ra: s·max|dRa/dφ| (ver _pendiente_max_ra)
+        N:  |N(φ₂) − N(φ₁)|, porque N es monótona en latitud para cada día
+
+    Cerca de los círculos polares N cambia bruscamente (día o noche polar)
+    y domina cota_error_n; restrinja lat_min/lat_max si no los necesita.
+    """
+    
+    def __init__(self, paso_grados=0.25, lat_min=-90.0, lat_max=90.0, muestras_cota=MUESTRAS_COTA):
+        if paso_grados <= 0:
+            raise ValueError("El paso de la malla de latitudes debe ser positivo")
+        if not (-90 <= lat_min < lat_max <= 90):
+            raise ValueError("El rango de latitudes debe estar entre -90 y 90 grados")
+        
+        self.paso_grados = paso_grados
+        self.lat_min = lat_min
+        self.lat_max = lat_max
+        self.latitudes = np.linspace(lat_min, lat_max, max(int(round((lat_max - lat_min) / paso_grados)), 1) + 1)
+        self.paso_grados = (lat_max - lat_min) / (len(self.latitudes) - 1)
+        
+        dias = np.arange(1, DIAS_ANIO + 1)
+        ra, n = _ra_n_exactos(np.radians(self.latitudes)[:, None], dias[None, :])
+        self.tabla_ra = ra.astype(np.float32)
+        self.tabla_n = n.astype(np.float32)
+        
+        self.cota_error_ra, self.cota_error_n = self._cotas_error(max(int(muestras_cota), 1))
+    
+    def _cotas_error(self, muestras):
+        """Cotas del error de interpolación de Ra y N (ver el docstring de la clase)"""
+        dias = np.arange(1, DIAS_ANIO + 1)
+        fracciones = np.linspace(0, 1, muestras + 1)
+        margen_ra = np.radians(self.paso_grados) / muestras * _pendiente_max_ra(dias)
+        cota_ra = cota_n = 0.0
+        # Por tramos de celdas: ~2^20 muestras (celda, latitud, día) en memoria
+        celdas_tramo = max(1, 2 ** 20 // (len(fracciones) * DIAS_ANIO))
+        for inicio in range(0, len(self.latitudes) - 1, celdas_tramo):
+            bordes = self.latitudes[inicio:inicio + celdas_tramo + 1]
+            latitudes = np.minimum(bordes[:-1, None] + np.diff(bordes)[:, None] * fracciones, self.lat_max)
+            ra, n = _ra_n_exactos(np.radians(latitudes)[:, :, None], dias)
+            error_ra = np.abs(ra - self.ra(latitudes[:, :, None], dias))
+            error_n = np.abs(n - self.n(latitudes[:, :, None], dias))
+            cota_ra = max(cota_ra, float(np.max(np.maximum(error_ra[:, :-1], error_ra[:, 1:]) + margen_ra)))
+            cota_n = max(cota_n, float(np.max(np.maximum(error_n[:, :-1], error_n[:, 1:])
+                                              + np.abs(np.diff(n, axis=1)))))
+        return cota_ra, cota_n
+    
+    @property
+    def memoria_bytes(self):
+        """Memoria ocupada por las dos tablas"""
+        return self.tabla_ra.nbytes + self.tabla_n.nbytes
+    
+    def _interpolar(self, tabla, lat_grados, dias):
+        lat_grados = np.asarray(lat_grados, dtype=float)
+        if np.any((lat_grados < self.lat_min) | (lat_grados > self.lat_max)):
+            raise ValueError(f"Latitud fuera de la tabla ({self.lat_min} a {self.lat_max} grados)")
+        
+        posicion = (lat_grados - self.lat_min) / self.paso_grados
+        fila = np.minimum(posicion.astype(np.intp), len(self.latitudes) - 2)
+        peso = posicion - fila
+        columna = np.asarray(dias, dtype=np.intp) - 1
+        
+        return (1 - peso) * tabla[fila, columna] + peso * tabla[fila + 1, columna]
+    
+    def ra(self, lat_grados, dias):
+        """Radiación extraterrestre [MJ/m²/día] para latitudes y días del año (1-366)"""
+        return self._interpolar(self.tabla_ra, lat_grados, dias)
+    
+    def n(self, lat_grados, dias):
+        """Duración máxima del día [horas] para latitudes y días del año (1-366)"""
+        return self._interpolar(self.tabla_n, lat_grados, dias)
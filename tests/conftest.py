@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configuración Común de las Pruebas
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Pone la raíz del proyecto en sys.path (los módulos del núcleo están en la
+raíz) y ofrece la fábrica de registros climáticos sintéticos que usan
+varias pruebas.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Nombres de columna habituales en archivos de estación (los reconoce ingesta.ALIAS_COLUMNAS)
+COLUMNAS_ARCHIVO = {"t_min": "tmin", "t_max": "tmax", "rh_min": "hr_min", "rh_max": "hr_max",
+                    "rs": "radiacion", "uz": "u2", "precipitacion": "lluvia"}
+
+
+def registro_sintetico(semilla, dias, inicio="2015-01-01", precipitacion=False):
+    """Registro diario con columnas de VARIABLES_SERIE e índice de fechas "fecha"
+
+    Valores plausibles de una estación de montaña; con precipitacion se
+    agrega la columna (mm/día) para el balance hídrico.
+    """
+    rng = np.random.default_rng(semilla)
+    t_min = rng.uniform(4, 12, dias)
+    columnas = {
+        "t_min": t_min, "t_max": t_min + rng.uniform(6, 12, dias),
+        "rh_min": rng.uniform(35, 55, dias), "rh_max": rng.uniform(75, 95, dias),
+        "rs": rng.uniform(10, 25, dias), "uz": rng.uniform(0.5, 4, dias),
+    }
+    if precipitacion:
+        columnas["precipitacion"] = rng.exponential(2, dias)
+    return pd.DataFrame(columnas, index=pd.date_range(inicio, periods=dias, freq="D", name="fecha"))
+
+
+@pytest.fixture
+def crear_registro():
+    """Fábrica de registros sintéticos: crear_registro(semilla, dias, inicio, precipitacion)"""
+    return registro_sintetico
+
+
+@pytest.fixture
+def crear_archivo(tmp_path):
+    """Escribir un registro sintético como CSV de estación (columnas con nombres de archivo)"""
+    def crear(nombre, semilla, dias, inicio="2015-01-01"):
+        ruta = tmp_path / f"{nombre}.csv"
+        registro = registro_sintetico(semilla, dias, inicio, precipitacion=True)
+        registro.rename(columns=COLUMNAS_ARCHIVO).to_csv(ruta)
+        return ruta
+    return crear
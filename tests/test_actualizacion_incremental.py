@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Actualización Incremental por Estación
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_actualizacion_incremental.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from actualizacion_incremental import ActualizadorIncremental
+from almacen_resultados import AlmacenResultados
+from calculadora_cli import main
+from metricas import Metricas
+
+METODOS = ["hargreaves", "pm_fao56"]
+BALANCE = {"metodo": "pm_fao56", "kc": 1.05, "humedad_actual": 0.30, "humedad_cc": 0.35,
+           "humedad_pmp": 0.15, "humedad_riego": 0.25, "profundidad_radicular": 40}
+
+
+@pytest.fixture
+def registro(crear_registro):
+    return crear_registro(semilla=24, dias=240, inicio="2021-03-01", precipitacion=True)
+
+
+@pytest.fixture
+def almacen():
+    with AlmacenResultados(":memory:") as almacen:
+        yield almacen
+
+
+def test_incrementos_igual_a_recalculo_completo(almacen, registro):
+    actualizador = ActualizadorIncremental(almacen, METODOS, BALANCE, backend="numpy")
+    actualizador.agregar("completa", registro, z=2640, lat=4.61)
+
+    # Días que llegan en tandas (la segunda repite días ya procesados)
+    actualizador.agregar("diaria", registro.iloc[:100], z=2640, lat=4.61)
+    actualizador.agregar("diaria", registro.iloc[90:101])
+    for dia in range(101, 120):
+        actualizador.agregar("diaria", registro.iloc[[dia]])
+    actualizador.agregar("diaria", registro.iloc[120:])
+
+    pd.testing.assert_frame_equal(almacen.consultar_et0("diaria"), almacen.consultar_et0("completa"))
+    pd.testing.assert_frame_equal(almacen.consultar_balance("diaria"), almacen.consultar_balance("completa"))
+    estado = actualizador.estado("diaria")
+    assert estado["ultima_fecha"] == registro.index[-1] and estado["lat"] == 4.61
+    assert estado["agotamiento"] == almacen.consultar_balance("completa")["agotamiento"].iloc[-1]
+
+
+def test_curva_de_kc_en_incrementos(almacen, registro):
+    # La curva por fechas y la columna kc de los días nuevos dan el mismo balance
+    curva = pd.Series(np.interp(np.arange(240), [0, 60, 150, 239], [0.3, 1.15, 1.15, 0.6]), index=registro.index)
+    con_curva = ActualizadorIncremental(almacen, METODOS, {**BALANCE, "kc": curva}, backend="numpy")
+    con_curva.agregar("curva", registro.iloc[:100], z=2640, lat=4.61)
+    con_curva.agregar("curva", registro.iloc[100:])
+    con_columna = ActualizadorIncremental(almacen, METODOS, BALANCE, backend="numpy")
+    con_columna.agregar("columna", registro.assign(kc=curva), z=2640, lat=4.61)
+
+    balance = almacen.consultar_balance("curva")
+    np.testing.assert_allclose(balance["kc"], curva.to_numpy())
+    pd.testing.assert_frame_equal(balance, almacen.consultar_balance("columna"))
+    assert con_curva.estado("curva")["parametros_balance"]["kc"] == "curva"
+
+    # La curva debe cubrir los días que se agregan
+    siguientes = registro.set_axis(registro.index + pd.Timedelta(days=240))
+    with pytest.raises(ValueError, match="Faltan valores de Kc"):
+        con_curva.agregar("curva", siguientes.iloc[:5])
+    with pytest.raises(ValueError, match="Kc debe ser"):
+        ActualizadorIncremental(almacen, METODOS, {**BALANCE, "kc": [1.0, 1.1]})
+
+
+def test_solo_se_calculan_los_dias_nuevos(almacen, registro):
+    metricas = Metricas()
+    actualizador = ActualizadorIncremental(almacen, METODOS, BALANCE, backend="numpy", metricas=metricas)
+    actualizador.agregar("estacion", registro.iloc[:200], z=2640, lat=4.61)
+
+    metricas.limpiar()
+    resultados, balance, errores = actualizador.agregar("estacion", registro)
+    assert len(resultados) == len(balance) == 40 and errores == {}
+    assert {r["filas"] for r in metricas.registros if r["etapa"] == "calculo"} == {40}
+
+    resultados, balance, _ = actualizador.agregar("estacion", registro)
+    assert resultados.empty and balance is None
+
+
+def test_parametros_distintos_requieren_reiniciar(almacen, registro):
+    ActualizadorIncremental(almacen, METODOS, BALANCE).agregar("estacion", registro.iloc[:10], z=2640, lat=4.61)
+    otro = ActualizadorIncremental(almacen, METODOS, {**BALANCE, "kc": 0.9})
+    with pytest.raises(ValueError, match="reiniciar"):
+        otro.agregar("estacion", registro)
+
+    otro.reiniciar("estacion")
+    assert otro.estado("estacion") is None and almacen.consultar_et0("estacion").empty
+    otro.agregar("estacion", registro, z=2640, lat=4.61)
+    assert otro.estado("estacion")["parametros_balance"]["kc"] == 0.9
+
+
+def test_linea_de_comandos_incremental(tmp_path, registro):
+    historial, salida = tmp_path / "historial.sqlite", tmp_path / "salida"
+    ruta = tmp_path / "estacion.csv"
+    argumentos = [str(ruta), "--metodos", "hargreaves", "--lat", "4.61", "--salida", str(salida),
+                  "--historial", str(historial), "--incremental"]
+
+    registro.iloc[:200].to_csv(ruta)
+    assert main(argumentos) == 0
+    registro.to_csv(ruta)
+    assert main(argumentos) == 0
+
+    nuevos = pd.read_csv(salida / "estacion_et0.csv", index_col="fecha", parse_dates=True)
+    assert list(nuevos.index) == list(registro.index[200:])
+    with AlmacenResultados(historial) as almacen:
+        assert len(almacen.consultar_et0("estacion")) == len(registro)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Almacén de Resultados en SQLite
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_almacen_resultados.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from almacen_resultados import AlmacenResultados
+from ingesta import calcular_con_almacen
+from metricas import Metricas
+from motor_et0 import calcular_et0_serie
+
+METODOS = ["pm_fao56", "hargreaves", "abtew"]
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    with AlmacenResultados(tmp_path / "resultados.sqlite") as almacen:
+        yield almacen
+
+
+@pytest.fixture
+def registro(crear_registro):
+    return crear_registro(semilla=5, dias=730)
+
+
+def test_guardar_y_consultar(almacen):
+    fechas = pd.date_range("2020-01-01", periods=10, freq="D")
+    valores = {"hamon": np.arange(10.0), "oudin": np.r_[np.nan, np.ones(9)]}
+    assert almacen.guardar_et0("bogota", fechas, valores) == 20
+
+    tabla = almacen.consultar_et0("bogota", ["oudin", "hamon"], desde="2020-01-03", hasta="2020-01-05")
+    assert list(tabla.columns) == ["oudin", "hamon"]
+    np.testing.assert_array_equal(tabla["hamon"], [2.0, 3.0, 4.0])
+    assert np.isnan(almacen.consultar_et0("bogota")["oudin"].iloc[0])
+    assert almacen.estaciones() == ["bogota"]
+
+    # Reescribir la misma clave reemplaza el valor
+    almacen.guardar_et0("bogota", fechas[:1], {"hamon": [9.5]})
+    assert almacen.consultar_et0("bogota", ["hamon"])["hamon"].iloc[0] == 9.5
+
+
+def test_rangos_y_pendientes(almacen):
+    fechas = pd.date_range("2020-01-01", periods=10, freq="D").delete([4, 5])
+    almacen.guardar_et0("bogota", fechas, {"hamon": np.ones(8)})
+    assert almacen.rangos_guardados("bogota", "hamon") == [
+        (pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-04")),
+        (pd.Timestamp("2020-01-07"), pd.Timestamp("2020-01-10")),
+    ]
+    pendientes = almacen.fechas_pendientes("bogota", ["hamon"], pd.date_range("2020-01-03", periods=10))
+    np.testing.assert_array_equal(pendientes, [False, False, True, True, False, False, False, False, True, True])
+
+
+def test_indice_de_la_clave(almacen):
+    plan = almacen._filas("EXPLAIN QUERY PLAN SELECT et0 FROM et0 WHERE estacion = ? AND metodo_id = ? "
+                          "AND fecha BETWEEN ? AND ?", ("a", "b", "2020-01-01", "2020-12-31"))
+    assert "USING PRIMARY KEY" in plan[0][-1]
+
+
+def test_recalculo_solo_de_lo_faltante(almacen, registro):
+    completo, _ = calcular_et0_serie(registro, 2640, 4.61, METODOS, backend="numpy")
+
+    # Primera corrida: solo el primer año y dos métodos
+    calcular_con_almacen(registro.iloc[:365], 2640, 4.61, METODOS[:2], almacen, "estacion", backend="numpy")
+
+    metricas = Metricas()
+    resultados, errores = calcular_con_almacen(registro, 2640, 4.61, METODOS, almacen, "estacion",
+                                               backend="numpy", metricas=metricas)
+    assert errores == {}
+    pd.testing.assert_frame_equal(resultados, completo, check_freq=False)
+
+    filas = {r["metodo"]: r["filas"] for r in metricas.registros if r["metodo"] is not None}
+    assert filas == {m: 730 for m in METODOS}  # el método nuevo fuerza las fechas de todos
+
+    # Tercera corrida: todo está guardado y no se calcula nada
+    metricas = Metricas()
+    resultados, _ = calcular_con_almacen(registro, 2640, 4.61, METODOS, almacen, "estacion",
+                                         backend="numpy", metricas=metricas)
+    assert metricas.registros == []
+    pd.testing.assert_frame_equal(resultados, completo, check_freq=False)
+
+
+def test_metodo_que_falla_no_recalcula_los_demas(almacen, registro):
+    datos = registro.drop(columns="rs")
+    calcular_con_almacen(datos, 2640, 4.61, METODOS, almacen, "estacion", backend="numpy")
+    metricas = Metricas()
+    resultados, errores = calcular_con_almacen(datos, 2640, 4.61, METODOS, almacen, "estacion",
+                                               backend="numpy", metricas=metricas)
+    assert set(errores) == {"pm_fao56", "abtew"}
+    assert list(resultados.columns) == ["hargreaves"]
+    assert "hargreaves" not in {r["metodo"] for r in metricas.registros}
+
+
+def test_balance(almacen):
+    fechas = pd.date_range("2020-01-01", periods=3, freq="D")
+    almacen.guardar_balance("finca", "pm_fao56", fechas, {"et0": [3.0, 3.5, 4.0], "kc": 1.1, "riego": [0, 25.0, 0]})
+    tabla = almacen.consultar_balance("finca")
+    np.testing.assert_allclose(tabla["kc"], 1.1)
+    np.testing.assert_array_equal(tabla["riego"], [0, 25.0, 0])
+    assert tabla["humedad"].isna().all()
+    with pytest.raises(ValueError):
+        almacen.guardar_balance("finca", "pm_fao56", fechas, {"lluvia": 1.0})
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Balance Hídrico por Temporada
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_balance_hidrico.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from balance_hidrico import balance_de_registro, laminas_suelo, simular_temporada, validar_parametros_balance
+
+
+def balance_un_campo(et0, kc, precipitacion, humedad_actual, humedad_cc, humedad_pmp, humedad_riego,
+                     profundidad_radicular):
+    """Referencia escalar: el mismo modelo de cubeta, un campo y un día a la vez"""
+    lamina_aprovechable, lamina_neta = laminas_suelo(humedad_cc, humedad_pmp, humedad_riego,
+                                                     profundidad_radicular)
+    agotamiento = min(max((humedad_cc - humedad_actual) * profundidad_radicular * 10, 0), lamina_aprovechable)
+    filas = []
+    for d in range(len(et0)):
+        riego = agotamiento if agotamiento >= lamina_neta else 0.0
+        agotamiento += kc[d] * et0[d] - precipitacion[d] - riego
+        percolacion = max(-agotamiento, 0.0)
+        agotamiento = min(max(agotamiento, 0.0), lamina_aprovechable)
+        filas.append((riego, percolacion, agotamiento))
+    return np.array(filas)
+
+
+@pytest.fixture
+def temporada():
+    rng = np.random.default_rng(1)
+    campos, dias = 50, 365
+    return {
+        "et0": rng.uniform(2, 7, dias),
+        "kc": np.interp(np.arange(dias), [0, 60, 120, 250, 365], [0.3, 0.3, 1.15, 1.15, 0.5]),
+        "precipitacion": np.where(rng.random((campos, dias)) < 0.2, rng.exponential(10, (campos, dias)), 0.0),
+        "humedad_actual": rng.uniform(0.2, 0.35, campos),
+        "humedad_cc": 0.35,
+        "humedad_pmp": 0.15,
+        "humedad_riego": 0.25,
+        "profundidad_radicular": rng.uniform(30, 100, campos),
+    }
+
+
+def test_igual_a_referencia_escalar(temporada):
+    resultado = simular_temporada(**temporada)
+    for campo in range(0, 50, 7):
+        referencia = balance_un_campo(
+            temporada["et0"], temporada["kc"], temporada["precipitacion"][campo],
+            temporada["humedad_actual"][campo], 0.35, 0.15, 0.25, temporada["profundidad_radicular"][campo])
+        np.testing.assert_allclose(resultado["riego"][campo], referencia[:, 0], atol=1e-9)
+        np.testing.assert_allclose(resultado["percolacion"][campo], referencia[:, 1], atol=1e-9)
+        np.testing.assert_allclose(resultado["agotamiento"][campo], referencia[:, 2], atol=1e-9)
+
+
+def test_conservacion_de_agua_sin_estres(temporada):
+    # Con suelo profundo y riego frecuente el agotamiento nunca llega al PMP
+    temporada["profundidad_radicular"] = 500.0
+    resultado = simular_temporada(**temporada)
+    inicial = (0.35 - temporada["humedad_actual"]) * 5000
+    entradas = resultado["riego"].sum(axis=1) + temporada["precipitacion"].sum(axis=1)
+    salidas = resultado["etc"].sum(axis=1) + resultado["percolacion"].sum(axis=1)
+    np.testing.assert_allclose(inicial + salidas - entradas, resultado["agotamiento"][:, -1], atol=1e-6)
+
+
+def test_primer_dia_como_balance_de_un_dia():
+    # Humedad en el umbral: se riega la lámina neta, como en la calculadora
+    resultado = simular_temporada(4.0, 1.0, 0.0, humedad_actual=[0.25, 0.30], humedad_cc=0.35,
+                                  humedad_pmp=0.15, humedad_riego=0.25, profundidad_radicular=60)
+    _, lamina_neta = laminas_suelo(0.35, 0.15, 0.25, 60)
+    assert resultado["riego"][0, 0] == pytest.approx(lamina_neta)
+    assert resultado["riego"][1, 0] == 0.0
+
+
+def test_sin_riego_no_pasa_del_pmp():
+    resultado = simular_temporada(np.full(100, 6.0), 1.2, 0.0, 0.3, 0.35, 0.15, 0.25, 50, regar=False)
+    assert resultado["riego"].sum() == 0.0
+    assert resultado["humedad"].min() == pytest.approx(0.15)
+
+
+def test_forma_incompatible():
+    with pytest.raises(ValueError):
+        simular_temporada(np.ones(10), np.ones(12), 0.0, 0.3, 0.35, 0.15, 0.25, 50)
+
+
+def test_tramos_encadenados_igual_a_toda_la_temporada():
+    rng = np.random.default_rng(24)
+    et0, lluvia = rng.uniform(2, 7, 120), rng.exponential(2, 120)
+    completa = simular_temporada(et0, 1.1, lluvia, 0.3, 0.35, 0.15, 0.25, 40)
+    primera = simular_temporada(et0[:50], 1.1, lluvia[:50], 0.3, 0.35, 0.15, 0.25, 40)
+    segunda = simular_temporada(et0[50:], 1.1, lluvia[50:], 0.3, 0.35, 0.15, 0.25, 40,
+                                agotamiento_inicial=primera["agotamiento"][:, -1])
+    for nombre in ("riego", "percolacion", "agotamiento"):
+        np.testing.assert_array_equal(np.hstack([primera[nombre], segunda[nombre]]), completa[nombre])
+
+
+def test_curva_de_kc_por_fechas():
+    rng = np.random.default_rng(24)
+    fechas = pd.date_range("2022-01-01", periods=90, freq="D", name="fecha")
+    et0 = pd.Series(rng.uniform(2, 7, 90), index=fechas)
+    lluvia = rng.exponential(2, 90)
+    # Curva más larga que el tramo y en otro orden: se alinea por fechas
+    curva = pd.Series(np.linspace(0.3, 1.15, 120), index=pd.date_range("2021-12-15", periods=120, freq="D"))
+    parametros = {"kc": curva.iloc[::-1], "humedad_actual": 0.3, "humedad_cc": 0.35, "humedad_pmp": 0.15,
+                  "humedad_riego": 0.25, "profundidad_radicular": 40}
+    assert validar_parametros_balance(parametros) == []
+
+    columnas, agotamiento = balance_de_registro(et0, lluvia, parametros)
+    kc = curva.reindex(fechas).to_numpy()
+    esperado = simular_temporada(et0.to_numpy(), kc, lluvia, 0.3, 0.35, 0.15, 0.25, 40)
+    np.testing.assert_array_equal(columnas["kc"], kc)
+    np.testing.assert_array_equal(columnas["agotamiento"], esperado["agotamiento"][0])
+    assert agotamiento == esperado["agotamiento"][0, -1]
+
+    # Una columna kc del registro tiene prioridad sobre parametros["kc"]
+    columnas, _ = balance_de_registro(et0, lluvia, {**parametros, "kc": 1.0}, kc=curva.reindex(fechas))
+    np.testing.assert_array_equal(columnas["agotamiento"], esperado["agotamiento"][0])
+
+    with pytest.raises(ValueError, match="Faltan valores de Kc"):
+        balance_de_registro(et0, lluvia, {**parametros, "kc": curva.iloc[30:]})
+
+
+@pytest.mark.parametrize("kc", [[1.0, 1.1], "1.05", np.ones(3), pd.Series([1.0, 1.1]), -0.2])
+def test_kc_no_valido(kc):
+    parametros = {"kc": kc, "humedad_actual": 0.3, "humedad_cc": 0.35, "humedad_pmp": 0.15, "humedad_riego": 0.25}
+    mensajes = validar_parametros_balance(parametros)
+    assert len(mensajes) == 1 and mensajes[0].startswith("Kc debe ser")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Caché en Disco de Resultados ET₀
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_cache_et0.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_et0
+from cache_et0 import CacheDiscoET0, MemoriaLRU, clave_memoria, huella_entrada
+from metodos_et import METODOS_ET
+from metricas import Metricas
+from motor_et0 import calcular_et0_serie
+
+METODOS = ["pm_fao56", "hargreaves", "abtew", "hamon", "oudin"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheDiscoET0(tmp_path / "cache")
+
+
+@pytest.fixture
+def registro(crear_registro):
+    return crear_registro(semilla=11, dias=400)
+
+
+def _calculados(metricas):
+    return {r["metodo"] for r in metricas.registros if r["metodo"] is not None}
+
+
+def test_segunda_corrida_sin_calculo(cache, registro):
+    directo, _ = calcular_et0_serie(registro, 2640, 4.61, METODOS, backend="numpy")
+    calcular_et0_serie(registro, 2640, 4.61, METODOS, backend="numpy", cache=cache)
+
+    metricas = Metricas()
+    resultados, errores = calcular_et0_serie(registro, 2640, 4.61, METODOS, backend="numpy",
+                                             metricas=metricas, cache=cache)
+    assert errores == {} and metricas.registros == []
+    assert cache.aciertos == len(METODOS)
+    pd.testing.assert_frame_equal(resultados, directo)
+
+
+def test_solo_se_recalcula_lo_que_cambia(cache, registro, monkeypatch):
+    calcular_et0_serie(registro, 2640, 4.61, METODOS, backend="numpy", cache=cache)
+
+    # Cambian los parámetros de un método: solo ese se recalcula
+    monkeypatch.setitem(METODOS_ET["hargreaves"], "parametros_pyet", ["tmean", "tmax", "tmin", "lat", "k"])
+    metricas = Metricas()
+    calcular_et0_serie(registro, 2640, 4.61, METODOS, backend="numpy", metricas=metricas, cache=cache)
+    assert _calculados(metricas) == {"hargreaves"}
+
+    # Cambia una columna de entrada o la latitud: la huella cambia y se recalcula todo
+    modificado = registro.copy()
+    modificado.iloc[0, 0] += 0.1
+    metricas = Metricas()
+    calcular_et0_serie(modificado, 2640, 4.61, METODOS, backend="numpy", metricas=metricas, cache=cache)
+    assert _calculados(metricas) == set(METODOS)
+    assert huella_entrada({"t": [1.0]}, lat=4.61) != huella_entrada({"t": [1.0]}, lat=4.62)
+
+
+def test_clave_depende_de_version_y_backend(cache, monkeypatch):
+    huella = huella_entrada({"t_min": np.arange(3.0)})
+    clave = cache.clave(huella, "hamon", "numpy")
+    assert clave != cache.clave(huella, "hamon", "pyet")
+    monkeypatch.setattr(cache_et0, "version_pyet", lambda: "99.0")
+    assert clave != cache.clave(huella, "hamon", "numpy")
+
+
+def test_desalojo_lru(tmp_path):
+    valores = np.zeros(1_000)
+    tamano = 8_128  # 8000 bytes de datos + encabezado .npy
+    cache = CacheDiscoET0(tmp_path / "cache", limite_bytes=3 * tamano)
+    for i, clave in enumerate(["aa1", "bb2", "cc3"]):
+        cache.guardar(clave, valores)
+        os.utime(cache._ruta(clave), (i, i))
+    assert cache.tamano_bytes == 3 * tamano
+
+    # Leer la más antigua la marca como reciente; al pasar del límite sale "bb2"
+    assert cache.obtener("aa1") is not None
+    cache.guardar("dd4", valores)
+    assert cache.obtener("bb2") is None
+    assert all(cache.obtener(clave) is not None for clave in ["aa1", "cc3", "dd4"])
+    assert cache.tamano_bytes == 3 * tamano
+
+    cache.limpiar()
+    assert cache.tamano_bytes == 0 and cache.obtener("aa1") is None
+
+
+def test_reemplazar_una_clave_no_suma_dos_veces(tmp_path, monkeypatch):
+    tamano = 8_128
+    cache = CacheDiscoET0(tmp_path / "cache", limite_bytes=2 * tamano)
+    cache.guardar("aa1", np.zeros(1_000))
+    cache.guardar("bb2", np.zeros(1_000))
+    # En el límite justo: reemplazar una clave no debe disparar el desalojo
+    monkeypatch.setattr(cache, "desalojar", lambda *args: pytest.fail("desalojo sin pasar del límite"))
+    for _ in range(3):
+        cache.guardar("aa1", np.ones(1_000))
+    assert cache.tamano_bytes == 2 * tamano == CacheDiscoET0(tmp_path / "cache").tamano_bytes
+    assert cache.obtener("bb2") is not None and cache.obtener("aa1")[0] == 1.0
+
+
+def test_memoria_lru():
+    memoria = MemoriaLRU(capacidad=2)
+    entradas = {"t_min": 8, "t_max": 19.0000000001, "lat": 4.61}
+    memoria.guardar(clave_memoria("hamon", entradas), 3.1)
+    memoria.guardar(clave_memoria("oudin", entradas), 2.9)
+
+    # Entradas equivalentes tras redondear (y en otro orden) dan la misma clave
+    assert memoria.obtener(clave_memoria("hamon", {"lat": 4.61, "t_max": 19, "t_min": 8.0})) == 3.1
+    assert memoria.obtener(clave_memoria("hamon", {**entradas, "t_min": 8.5})) is None
+
+    # "hamon" se usó hace poco: al pasar de la capacidad se olvida "oudin"
+    memoria.guardar(clave_memoria("turc", entradas), 3.4)
+    assert len(memoria) == 2
+    assert memoria.obtener(clave_memoria("oudin", entradas)) is None
+    assert memoria.obtener(clave_memoria("turc", entradas)) == 3.4
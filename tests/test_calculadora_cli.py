@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Calculadora en Línea de Comandos
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_calculadora_cli.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from balance_hidrico import simular_temporada
+from calculadora_cli import cargar_configuracion, main
+
+BALANCE = {"metodo": "hargreaves", "kc": 1.05, "humedad_actual": 0.30, "humedad_cc": 0.35,
+           "humedad_pmp": 0.15, "humedad_riego": 0.25, "profundidad_radicular": 40}
+
+
+@pytest.fixture
+def archivo(crear_archivo):
+    return crear_archivo("estacion", semilla=22, dias=300, inicio="2020-01-01")
+
+
+def test_configuracion(tmp_path):
+    ruta = tmp_path / "lote.json"
+    ruta.write_text(json.dumps({"metodos": ["hargreaves"], "procesos": 4, "formato": "csv"}))
+    configuracion = cargar_configuracion(str(ruta), procesos=2, formato=None)
+    assert configuracion["procesos"] == 2 and configuracion["metodos"] == ["hargreaves"]
+
+    with pytest.raises(ValueError, match="desconocidas"):
+        cargar_configuracion(hilos=2)
+    with pytest.raises(ValueError, match="Métodos desconocidos"):
+        cargar_configuracion(metodos=["no_existe"])
+    ruta.write_text(json.dumps({"backend": "cupy"}))
+    with pytest.raises(ValueError, match="Backend desconocido"):
+        cargar_configuracion(str(ruta))
+    with pytest.raises(ValueError, match="balance"):
+        cargar_configuracion(metodos=["pm_fao56"], balance=BALANCE)
+
+
+def test_balance_por_bloques_igual_a_toda_la_serie(tmp_path, archivo):
+    pytest.importorskip("pyet")
+    config = tmp_path / "lote.json"
+    config.write_text(json.dumps({"metodos": ["hargreaves", "pm_fao56"], "balance": BALANCE}))
+    salida = tmp_path / "salida"
+    assert main([str(archivo), "--config", str(config), "--tamano-bloque", "70", "--salida", str(salida),
+                 "--z", "2640", "--lat", "4.61"]) == 0
+
+    et0 = pd.read_csv(salida / "estacion_et0.csv", index_col="fecha")
+    balance = pd.read_csv(salida / "estacion_balance.csv", index_col="fecha")
+    assert len(et0) == len(balance) == 300
+    assert list(et0.columns[-2:]) == ["hargreaves", "pm_fao56"]
+
+    esperado = simular_temporada(et0["hargreaves"].to_numpy(), BALANCE["kc"], et0["precipitacion"].to_numpy(),
+                                 *(BALANCE[nombre] for nombre in ("humedad_actual", "humedad_cc", "humedad_pmp",
+                                                                  "humedad_riego", "profundidad_radicular")))
+    np.testing.assert_allclose(balance["agotamiento"], esperado["agotamiento"][0], atol=1e-9)
+    np.testing.assert_allclose(balance["riego"], esperado["riego"][0], atol=1e-9)
+
+
+def test_sin_interfaz_grafica(tmp_path, archivo):
+    codigo = (
+        "import sys, calculadora_cli\n"
+        f"codigo = calculadora_cli.main([{str(archivo)!r}, '--metodos', 'hargreaves', '--lat', '4.61',"
+        f" '--salida', {str(tmp_path)!r}])\n"
+        "graficos = [m for m in sys.modules if m.split('.')[0] in ('tkinter', '_tkinter', 'customtkinter')]\n"
+        "assert codigo == 0 and not graficos, graficos\n"
+    )
+    subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True, capture_output=True)
+    assert (tmp_path / "estacion_et0.csv").exists()
+
+
+def test_archivo_malo_no_detiene_el_lote(tmp_path, archivo, capsys):
+    pytest.importorskip("pyet")
+    codigo = main([str(tmp_path / "no_existe.csv"), str(archivo), "--metodos", "hargreaves", "--lat", "4.61",
+                   "--salida", str(tmp_path / "salida")])
+    assert codigo == 1
+    assert sorted(os.listdir(tmp_path / "salida")) == ["estacion_et0.csv", "estacion_et0.metadatos.json"]
+    assert "no_existe" in capsys.readouterr().err
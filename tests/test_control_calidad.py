@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Control de Calidad de Entradas
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_control_calidad.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from control_calidad import InformeCalidad, REGLAS, depurar, revisar
+from ingesta import procesar_archivo
+from metricas import Metricas
+from motor_et0 import calcular_et0_serie
+
+
+@pytest.fixture
+def registro():
+    # Fila 0 correcta, 1 temperatura invertida, 2 humedad fuera de rango,
+    # 3 radiación y viento negativos, 4 faltantes (no se marcan)
+    return pd.DataFrame({
+        "t_min": [10.0, 25.0, 8.0, 9.0, np.nan],
+        "t_max": [22.0, 15.0, 20.0, 21.0, 20.0],
+        "rh_min": [40.0, 45.0, -5.0, 50.0, 40.0],
+        "rh_max": [90.0, 85.0, 120.0, 80.0, np.nan],
+        "rs": [18.0, 17.0, 16.0, -3.0, 15.0],
+        "uz": [2.0, 2.5, 1.5, -1.0, np.nan],
+    }, index=pd.date_range("2020-01-01", periods=5, freq="D"))
+
+
+def test_banderas_y_resumen(registro):
+    control = revisar(registro, lat=4.61)
+    assert control.banderas.shape == (5, len(REGLAS))
+    assert control.filas_con_problemas.tolist() == [False, True, True, True, False]
+    conteos = control.conteos()
+    assert conteos["temperatura_invertida"] == 1 and conteos["humedad_fuera_de_rango"] == 1
+    assert conteos["radiacion_negativa"] == 1 and conteos["viento_negativo"] == 1
+    assert conteos["latitud_invalida"] == 0
+    assert control.resumen()["filas_con_problemas"] == 3
+
+    # Valores escalares (formulario de un solo día)
+    assert revisar({"t_min": 30.0, "t_max": 20.0}).mensajes() == [REGLAS["temperatura_invertida"][0]]
+    assert revisar({"t_min": 10.0, "t_max": 20.0, "lat": 4.61}).mensajes() == []
+
+
+def test_enmascarar(registro):
+    datos, lat = depurar(registro, 4.61)
+    assert lat == 4.61
+    assert datos.loc[datos.index[1], ["t_min", "t_max"]].isna().all()
+    assert datos.loc[datos.index[2], ["rh_min", "rh_max"]].isna().all()
+    assert datos.loc[datos.index[3], ["rs", "uz"]].isna().all()
+    assert datos.loc[datos.index[3], "t_min"] == 9.0
+    pd.testing.assert_frame_equal(datos.iloc[[0, 4]], registro.iloc[[0, 4]])
+    assert registro.loc[registro.index[1], "t_min"] == 25.0  # el original no cambia
+
+
+def test_reparar(registro):
+    datos, _ = depurar(registro, modo="reparar")
+    fila = datos.iloc[1]
+    assert (fila["t_min"], fila["t_max"]) == (15.0, 25.0)
+    assert (datos.iloc[2]["rh_min"], datos.iloc[2]["rh_max"]) == (0.0, 100.0)
+    assert (datos.iloc[3]["rs"], datos.iloc[3]["uz"]) == (0.0, 0.0)
+    assert np.isnan(datos.iloc[4]["t_min"])
+
+    with pytest.raises(ValueError, match="Modo desconocido"):
+        depurar(registro, modo="borrar")
+
+
+@pytest.mark.parametrize("backend", ["numpy", "pyet"])
+def test_una_fila_mala_no_afecta_a_los_demas_dias(crear_registro, backend):
+    if backend == "pyet":
+        pytest.importorskip("pyet")
+    # Radiación en W/m² por error y humedad en fracción: pyet rechaza el arreglo completo
+    registro = crear_registro(semilla=21, dias=1000)
+    registro.iloc[400, registro.columns.get_loc("rs")] = 250.0
+    registro.iloc[700, [registro.columns.get_loc("rh_min"), registro.columns.get_loc("rh_max")]] = [0.5, 0.9]
+    conteos = revisar(registro).conteos()
+    assert conteos["radiacion_fuera_de_rango"] == 1 and conteos["humedad_en_fraccion"] == 1
+
+    datos, lat = depurar(registro, 4.61)
+    resultados, errores = calcular_et0_serie(datos, 2640.0, lat, backend=backend)
+    assert errores == {} and resultados.shape == (1000, 21)
+    incompletos = ~np.isfinite(resultados.to_numpy()).all(axis=1)
+    assert np.flatnonzero(incompletos).tolist() == [400, 700]
+
+    # Reparar: la fracción pasa a porcentaje; la radiación no se puede adivinar
+    datos, _ = depurar(registro, modo="reparar")
+    assert datos.iloc[700][["rh_min", "rh_max"]].tolist() == [50.0, 90.0]
+    assert np.isnan(datos.iloc[400]["rs"])
+    resultados, errores = calcular_et0_serie(datos, 2640.0, 4.61, backend=backend)
+    assert errores == {} and np.flatnonzero(~np.isfinite(resultados.to_numpy()).all(axis=1)).tolist() == [400]
+
+
+def test_latitud_invalida(registro):
+    informe = InformeCalidad()
+    _, lat = depurar(registro, 123.0, informe=informe)
+    assert lat is None
+    assert informe.conteos_reglas["latitud_invalida"] == len(registro)
+
+
+def test_lote_no_se_detiene_por_filas_malas(tmp_path, registro):
+    pytest.importorskip("pyet")
+    ruta = tmp_path / "estacion.csv"
+    registro.rename_axis("fecha").to_csv(ruta)
+
+    informe, metricas = InformeCalidad(), Metricas()
+    bloques = list(procesar_archivo(str(ruta), z=2640, lat=4.61, metodos=["hargreaves", "abtew"],
+                                    tamano_bloque=3, metricas=metricas, informe_calidad=informe))
+    assert len(bloques) == 2
+    assert informe.filas == 5 and informe.filas_con_problemas == 3
+
+    resultados = pd.concat([resultados for _, resultados, _ in bloques])
+    assert np.isfinite(resultados["hargreaves"].iloc[0]) and np.isnan(resultados["hargreaves"].iloc[1])
+    assert np.isnan(resultados["abtew"].iloc[3])
+    validacion = [grupo for grupo in metricas.resumen() if grupo["etapa"] == "validacion"]
+    assert validacion[0]["llamadas"] == 2 and validacion[0]["filas"] == 5
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Ejecución Paralela por Estación o por Método
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Los resultados en varios procesos deben ser los de calcular_et0_serie en
+serie, con cualquier partición, y la memoria compartida debe liberarse
+aunque un proceso trabajador falle.
+
+Ejecución:
+    python -m pytest tests/test_ejecucion_paralela.py
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ejecucion_paralela
+from ejecucion_paralela import ArregloCompartido, calcular_estaciones_en_paralelo
+from motor_et0 import calcular_et0_serie
+
+METODOS = ["pm_fao56", "hargreaves", "makkink", "abtew", "hamon"]
+
+
+@pytest.fixture
+def estaciones(crear_registro):
+    return {
+        "bogota": (crear_registro(1, 400), 2640.0, 4.61),
+        "quito": (crear_registro(2, 250), 2850.0, -0.18),
+        # Sin radiación: los métodos que la usan fallan solo en esta estación
+        "sin_rs": (crear_registro(3, 120).drop(columns="rs"), 100.0, 10.0),
+    }
+
+
+# Con 6 procesos y 3 estaciones, "metodo" (y "auto") divide cada estación en 2 grupos de métodos
+@pytest.mark.parametrize("particion, procesos", [("estacion", 2), ("metodo", 6), ("auto", 6), ("auto", 2)])
+def test_igual_que_en_serie(estaciones, particion, procesos):
+    resultados, errores = calcular_estaciones_en_paralelo(estaciones, METODOS, procesos=procesos,
+                                                          particion=particion, backend="numpy")
+    for nombre, (datos, z, lat) in estaciones.items():
+        esperado, errores_esperados = calcular_et0_serie(datos, z, lat, METODOS, backend="numpy")
+        assert errores[nombre] == errores_esperados
+        assert list(resultados[nombre]) == list(esperado.columns)
+        for metodo_id, serie in resultados[nombre].items():
+            pd.testing.assert_index_equal(serie.index, datos.index)
+            np.testing.assert_array_equal(serie.to_numpy(), esperado[metodo_id].to_numpy(), err_msg=metodo_id)
+    assert set(errores["sin_rs"]) == {"pm_fao56", "makkink", "abtew"} and errores["bogota"] == {}
+
+
+def test_falla_del_trabajador_llega_y_libera_la_memoria(estaciones, monkeypatch):
+    creados = []
+    iniciar = ArregloCompartido.__init__
+
+    def registrar(self, forma, dtype, nombre=None):
+        iniciar(self, forma, dtype, nombre)
+        if nombre is None:
+            creados.append(self.memoria.name)
+    monkeypatch.setattr(ejecucion_paralela.ArregloCompartido, "__init__", registrar)
+
+    # El backend se valida en el proceso trabajador, dentro de calcular_et0_serie
+    with pytest.raises(ValueError, match="Backend desconocido"):
+        calcular_estaciones_en_paralelo(estaciones, METODOS, procesos=6, particion="metodo", backend="no_existe")
+
+    assert len(creados) == 3 * len(estaciones)
+    for nombre in creados:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nombre)
+
+
+def test_particion_desconocida(estaciones):
+    with pytest.raises(ValueError, match="Partición desconocida"):
+        calcular_estaciones_en_paralelo(estaciones, particion="por_dia")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Exportación por Bloques
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_exportacion.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exportacion import EscritorResultados, exportar_resultados, leer_metadatos, ruta_metadatos
+
+
+@pytest.fixture
+def resultados():
+    rng = np.random.default_rng(3)
+    tabla = pd.DataFrame(rng.uniform(0, 8, (1_000, 4)), columns=["pm_fao56", "hargreaves", "hamon", "turc"],
+                         index=pd.date_range("2001-01-01", periods=1_000, freq="D", name="fecha"))
+    tabla.iloc[[3, 500], 1] = np.nan
+    return tabla
+
+
+def test_csv_igual_a_pandas(resultados, tmp_path):
+    # Bloques pequeños que no dividen las filas exactamente
+    exportar_resultados(tmp_path / "et0.csv", resultados, resultados.index, filas_bloque=333)
+    resultados.to_csv(tmp_path / "pandas.csv")
+    assert (tmp_path / "et0.csv").read_bytes() == (tmp_path / "pandas.csv").read_bytes()
+
+
+def test_metadatos_una_vez(resultados, tmp_path):
+    ruta = str(tmp_path / "et0.csv")
+    with EscritorResultados(ruta, metadatos={"lat": 4.61, "metodos": list(resultados.columns)}) as escritor:
+        for inicio in range(0, 1_000, 250):
+            escritor.escribir(resultados.iloc[inicio:inicio + 250], resultados.index[inicio:inicio + 250])
+    metadatos = leer_metadatos(ruta)
+    assert os.path.exists(ruta_metadatos(ruta))
+    assert metadatos["lat"] == 4.61 and metadatos["filas"] == 1_000
+    assert metadatos["columnas"] == ["fecha"] + list(resultados.columns)
+    releido = pd.read_csv(ruta, index_col="fecha", parse_dates=True)
+    pd.testing.assert_frame_equal(releido, resultados, check_freq=False)
+
+
+def test_texto_y_decimales(tmp_path):
+    ruta = tmp_path / "metodos.csv"
+    exportar_resultados(ruta, {"metodo": ["pm_fao56", 'Turc, "modificado"'], "et0": [3.14159, 2.5]},
+                        decimales=2)
+    assert ruta.read_text(encoding="utf-8").splitlines() == [
+        "metodo,et0", "pm_fao56,3.14", '"Turc, ""modificado""",2.50']
+
+
+@pytest.mark.parametrize("decimales", [None, 3])
+def test_faltantes_vacios_sin_tocar_el_texto(tmp_path, decimales):
+    # Una estación de código "nan" es texto, no un valor faltante
+    tabla = pd.DataFrame({"estacion": ["nan", "bog", "nan"], "et0": [np.nan, 2.5, 3.25],
+                          "hamon": [1.0, np.nan, np.nan]})
+    exportar_resultados(tmp_path / "et0.csv", tabla, decimales=decimales)
+    tabla.to_csv(tmp_path / "pandas.csv", index=False,
+                 float_format=None if decimales is None else f"%.{decimales}f")
+    assert (tmp_path / "et0.csv").read_bytes() == (tmp_path / "pandas.csv").read_bytes()
+    assert (tmp_path / "et0.csv").read_text().splitlines()[1].startswith("nan,,")
+
+
+def test_columnas_distintas(resultados, tmp_path):
+    with EscritorResultados(tmp_path / "et0.csv") as escritor:
+        escritor.escribir(resultados)
+        with pytest.raises(ValueError):
+            escritor.escribir(resultados[["pm_fao56"]])
+
+
+def test_sin_bloques_con_encabezado(tmp_path):
+    ruta = str(tmp_path / "et0.csv")
+    with EscritorResultados(ruta, {"lat": 4.61}, encabezado=["fecha", "pm_fao56", "hamon"]):
+        pass
+    assert open(ruta, encoding="utf-8").read() == "fecha,pm_fao56,hamon\n"
+    metadatos = leer_metadatos(ruta)
+    assert metadatos["columnas"] == ["fecha", "pm_fao56", "hamon"] and metadatos["filas"] == 0
+    assert pd.read_csv(ruta).empty
+
+
+def test_sin_bloques_ni_encabezado(tmp_path):
+    ruta = tmp_path / "et0.csv"
+    with pytest.raises(ValueError, match="ningún bloque"):
+        with EscritorResultados(ruta):
+            pass
+    assert not ruta.exists() and not os.path.exists(ruta_metadatos(str(ruta)))
+
+
+def test_encabezado_distinto(resultados, tmp_path):
+    with EscritorResultados(tmp_path / "et0.csv", encabezado=["fecha", "pm_fao56"]) as escritor:
+        with pytest.raises(ValueError):
+            escritor.escribir(resultados, resultados.index)
+        escritor.escribir(resultados[["pm_fao56"]], resultados.index)
+    assert leer_metadatos(tmp_path / "et0.csv")["filas"] == 1_000
+
+
+def test_parquet_sin_bloques(tmp_path):
+    pytest.importorskip("pyarrow")
+    ruta = tmp_path / "et0.parquet"
+    EscritorResultados(ruta, {"lat": 4.61}, encabezado=["fecha", "pm_fao56"]).cerrar()
+    releido = pd.read_parquet(ruta)
+    assert list(releido.columns) == ["fecha", "pm_fao56"] and releido.empty
+    assert leer_metadatos(ruta)["columnas"] == ["fecha", "pm_fao56"]
+
+
+def test_parquet(resultados, tmp_path):
+    pytest.importorskip("pyarrow")
+    ruta = tmp_path / "et0.parquet"
+    exportar_resultados(ruta, resultados, resultados.index, metadatos={"lat": 4.61}, filas_bloque=300)
+    releido = pd.read_parquet(ruta).set_index("fecha")
+    pd.testing.assert_frame_equal(releido, resultados, check_freq=False)
+    assert leer_metadatos(ruta)["lat"] == 4.61
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Fuente de Filas de la Tabla de Resultados
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+La fuente y la ventana visible de la tabla virtualizada se prueban sin
+interfaz gráfica, con resultados escalares (un día) y series (archivo).
+
+Ejecución:
+    python -m pytest tests/test_fuente_resultados.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fuente_resultados import FuenteResultadosET0, ventana_visible
+
+
+def fuente(resultados, errores=()):
+    return FuenteResultadosET0(resultados, errores, lambda metodo_id: metodo_id.upper(),
+                               lambda metodo_id: "Combinación")
+
+
+def test_resultados_escalares():
+    tabla = fuente([("pm_fao56", 3.14159), ("hargreaves", 4.0)], [("abtew", "Falta la radiación solar rs")])
+    assert len(tabla) == 3 and not tabla.es_serie and "Fecha" not in tabla.columnas
+    assert tabla.fila(0) == (["1", "PM_FAO56", "3.142", "✅ Exitoso", "Combinación"],
+                             ["black", "black", "black", "green", "black"])
+    datos, colores = tabla.fila(2)
+    assert datos[:3] == ["3", "ABTEW", "Error"] and datos[3].startswith("❌ Falta la radiación")
+    assert colores == ["black", "black", "red", "red", "red"]
+    assert tabla.estadisticas() == pytest.approx((np.mean([3.14159, 4.0]), 3.14159, 4.0))
+
+
+def test_series_alineadas_por_fecha():
+    fechas = pd.date_range("2020-01-01", periods=5, freq="D")
+    completa = pd.Series([1.0, 2.0, 3.0, 4.0, 5.0], index=fechas)
+    # Un método sin los días de un bloque que falló, y en otro orden
+    parcial = pd.Series([30.0, 10.0], index=fechas[[2, 0]])
+    tabla = fuente([("hamon", completa), ("turc", parcial)], [("abtew", "sin rs")])
+
+    assert tabla.es_serie and tabla.n_dias == 5 and len(tabla) == 11
+    pd.testing.assert_index_equal(tabla.fechas, fechas)
+    np.testing.assert_array_equal(tabla.matriz[1], [10.0, np.nan, 30.0, np.nan, np.nan])
+    assert tabla.fila(4)[0] == ["5", "HAMON", "2020-01-05", "5.000", "✅ Exitoso", "Combinación"]
+    assert tabla.fila(5)[0][2:4] == ["2020-01-01", "10.000"]
+    datos, colores = tabla.fila(6)
+    assert datos[2:5] == ["2020-01-02", "—", "⚠️ Sin dato"] and colores[-2] == "orange"
+    assert tabla.fila(10)[0][:4] == ["11", "ABTEW", "", "Error"]
+    assert tabla.estadisticas() == pytest.approx((55 / 7, 1.0, 30.0))
+
+
+def test_series_sin_fechas_de_distinto_largo():
+    tabla = fuente([("hamon", np.array([1.0, 2.0, 3.0])), ("turc", np.array([4.0]))])
+    assert tabla.fechas is None and tabla.matriz.shape == (2, 3)
+    assert tabla.fila(1)[0][2] == "2" and tabla.fila(4)[0][3] == "—"
+
+
+def test_sin_resultados():
+    tabla = fuente([], [("abtew", "sin rs")])
+    assert len(tabla) == 1 and tabla.estadisticas() is None
+    assert fuente([("hamon", pd.Series([np.nan]))]).estadisticas() is None
+
+
+def test_ventana_visible():
+    assert ventana_visible(100, 0, 12) == (0, 12)
+    assert ventana_visible(100, -5, 12) == (0, 12)
+    assert ventana_visible(100, 95, 12) == (88, 100)
+    assert ventana_visible(5, 3, 12) == (0, 5)
+    assert ventana_visible(0, 0, 12) == (0, 0)
+
+    # Desplazarse a la mitad de 210 000 filas solo arma las 12 visibles
+    fechas = pd.date_range("2000-01-01", periods=10_000, freq="D")
+    tabla = fuente([(f"m{i}", pd.Series(np.arange(10_000) + i, index=fechas)) for i in range(21)])
+    inicio, fin = ventana_visible(len(tabla), 105_000, 12)
+    filas = tabla.filas(inicio, fin)
+    assert len(filas) == 12
+    assert [datos[0] for datos, _ in filas] == [str(i + 1) for i in range(105_000, 105_012)]
+    assert filas[0][0][1:4] == ["M10", str((fechas[0] + pd.Timedelta(days=5_000)).date()), "5010.000"]
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Ingesta por Bloques de Archivos de Estaciones
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Reconocimiento de columnas (alias y mapeo), separador, codificación y
+tamaño de los bloques de leer_por_bloques.
+
+Ejecución:
+    python -m pytest tests/test_ingesta.py
+"""
+
+import pandas as pd
+import pytest
+
+from ingesta import detectar_codificacion, leer_por_bloques, mapear_columnas
+
+
+def test_alias_sin_distinguir_mayusculas():
+    columnas = ["Fecha", " TMAX ", "tmin", "HR_Min", "hr_max", "Radiacion", "u2", "Lluvia", "Observaciones"]
+    assert mapear_columnas(columnas) == {
+        "Fecha": "fecha", " TMAX ": "t_max", "tmin": "t_min", "HR_Min": "rh_min", "hr_max": "rh_max",
+        "Radiacion": "rs", "u2": "uz", "Lluvia": "precipitacion"}
+    # Dos columnas para el mismo requerimiento: se toma la primera
+    assert mapear_columnas(["tmax", "temp_max"]) == {"tmax": "t_max"}
+
+
+def test_mapeo_tiene_prioridad():
+    columnas = ["T_alta", "tmax", "Radiación", "viento"]
+    mapeo = {"T_alta": "t_max", "Radiación": "rs", "no_existe": "uz"}
+    # tmax ya no se usa (t_max viene del mapeo); las claves del mapeo que no están se ignoran
+    assert mapear_columnas(columnas, mapeo) == {"T_alta": "t_max", "Radiación": "rs", "viento": "uz"}
+
+
+@pytest.mark.parametrize("separador", [",", ";", "\t"])
+def test_separador_detectado(tmp_path, crear_registro, separador):
+    registro = crear_registro(semilla=4, dias=30).rename(columns={"t_min": "tmin", "rs": "radiacion"})
+    ruta = tmp_path / "estacion.csv"
+    registro.to_csv(ruta, sep=separador)
+    leido = pd.concat(leer_por_bloques(str(ruta), tamano_bloque=7))
+    assert list(leido.columns) == ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz"]
+    pd.testing.assert_frame_equal(leido, crear_registro(semilla=4, dias=30), check_freq=False)
+
+
+def test_bloques_acotados(tmp_path, crear_archivo):
+    ruta = str(crear_archivo("estacion", semilla=9, dias=250))
+    bloques = list(leer_por_bloques(ruta, tamano_bloque=60))
+    assert [len(bloque) for bloque in bloques] == [60, 60, 60, 60, 10]
+    assert pd.concat(bloques).index.is_monotonic_increasing and bloques[0].index.name == "fecha"
+
+
+def test_codificacion_latin1_y_bom(tmp_path):
+    contenido = ("Fecha;Estación;Temperatura_Minima;Temperatura_Maxima;Radiación\n"
+                 "2021-01-01;Bogotá;7.5;19.0;18.2\n"
+                 "2021-01-02;Bogotá;8.0;20.5;17.9\n")
+    latin1 = tmp_path / "latin1.csv"
+    latin1.write_bytes(contenido.encode("latin-1"))
+    con_bom = tmp_path / "bom.csv"
+    con_bom.write_bytes(contenido.encode("utf-8-sig"))
+    assert detectar_codificacion(str(latin1)) == "latin-1"
+    assert detectar_codificacion(str(con_bom)) == "utf-8-sig"
+
+    mapeo = {"Radiación": "rs"}
+    for ruta in (latin1, con_bom):
+        bloque, = leer_por_bloques(str(ruta), mapeo=mapeo)
+        assert list(bloque.columns) == ["t_min", "t_max", "rs"] and bloque.index.name == "fecha"
+        assert bloque["rs"].tolist() == [18.2, 17.9]
+    # Con la codificación dada no se detecta
+    with pytest.raises(UnicodeDecodeError):
+        list(leer_por_bloques(str(latin1), mapeo=mapeo, codificacion="utf-8"))
+
+
+def test_sin_columnas_conocidas(tmp_path):
+    ruta = tmp_path / "malo.csv"
+    ruta.write_text("a,b\n1,2\n")
+    with pytest.raises(ValueError, match="Ninguna columna"):
+        list(leer_por_bloques(str(ruta)))
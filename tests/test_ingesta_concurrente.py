@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la Ingesta Concurrente de Archivos de Estaciones
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_ingesta_concurrente.py
+"""
+
+import asyncio
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from calculadora_cli import main
+from control_calidad import InformeCalidad
+from ingesta import procesar_archivo
+from ingesta_concurrente import procesar_archivos_concurrentes
+from metricas import Metricas
+
+METODOS = ["hargreaves", "pm_fao56", "makkink"]
+BALANCE = {"metodo": "hargreaves", "kc": 1.05, "humedad_actual": 0.30, "humedad_cc": 0.35,
+           "humedad_pmp": 0.15, "humedad_riego": 0.25, "profundidad_radicular": 40}
+
+
+@pytest.fixture
+def archivos(crear_archivo):
+    return [str(crear_archivo(f"estacion_{i}", semilla=25 + i, dias=dias, inicio="2021-01-01"))
+            for i, dias in enumerate([230, 95, 310, 40])]
+
+
+def recoger(rutas, consumidor=None, **opciones):
+    """Correr la ingesta y agrupar lo entregado por archivo"""
+    async def correr():
+        entregado = {}
+        async for ruta, bloque, resultados, errores in procesar_archivos_concurrentes(rutas, **opciones):
+            entregado.setdefault(ruta, []).append((bloque, resultados, errores))
+            if consumidor is not None:
+                await consumidor()
+        return entregado
+    return asyncio.run(correr())
+
+
+def test_igual_que_procesar_archivo_y_en_orden(archivos):
+    pytest.importorskip("pyet")
+    informes = {ruta: InformeCalidad() for ruta in archivos}
+    entregado = recoger(archivos, z=2640.0, lat=4.61, metodos=METODOS, tamano_bloque=60,
+                        informe_calidad=informes, lectores=3, trabajadores=3, max_bloques=4)
+
+    for ruta in archivos:
+        *bloques, fin = entregado[ruta]
+        assert fin == (None, None, None)
+        informe = InformeCalidad()
+        esperado = list(procesar_archivo(ruta, 2640.0, 4.61, METODOS, 60, informe_calidad=informe))
+        assert len(bloques) == len(esperado)
+        for (bloque, resultados, errores), (bloque_e, resultados_e, errores_e) in zip(bloques, esperado):
+            pd.testing.assert_frame_equal(bloque, bloque_e)
+            pd.testing.assert_frame_equal(resultados, resultados_e)
+            assert errores == errores_e
+        assert informes[ruta].resumen() == informe.resumen()
+
+
+def test_lectores_no_se_adelantan(archivos):
+    pytest.importorskip("pyet")
+    metricas = Metricas()
+    entregados = 0
+    vivos = []
+
+    async def consumidor_lento():
+        nonlocal entregados
+        entregados += 1
+        await asyncio.sleep(0.01)
+        # Bloques leídos y aún no soltados (el que se está entregando sigue ocupando su cupo)
+        leidos = sum(registro["etapa"] == "lectura" for registro in metricas.registros)
+        vivos.append(leidos - (entregados - 1))
+
+    entregado = recoger(archivos, lat=4.61, metodos=["hargreaves"], tamano_bloque=20, metricas=metricas,
+                        consumidor=consumidor_lento, lectores=4, trabajadores=2, max_bloques=3)
+    assert sum(len(bloques) - 1 for bloques in entregado.values()) == 35
+    assert max(vivos) <= 3
+
+
+def test_archivo_malo_no_detiene_los_demas(tmp_path, archivos):
+    pytest.importorskip("pyet")
+    malo = tmp_path / "malo.csv"
+    malo.write_text("sin;columnas;conocidas\n1;2;3\n")
+    rutas = [str(tmp_path / "no_existe.csv"), str(malo)] + archivos[:2]
+    entregado = recoger(rutas, lat=4.61, metodos=["hargreaves"], tamano_bloque=50)
+
+    assert entregado[rutas[0]][-1][2].startswith("FileNotFoundError")
+    assert "Ninguna columna" in entregado[rutas[1]][-1][2]
+    assert len(entregado[rutas[0]]) == len(entregado[rutas[1]]) == 1
+    for ruta in archivos[:2]:
+        assert entregado[ruta][-1] == (None, None, None)
+        assert sum(len(bloque) for bloque, _, _ in entregado[ruta][:-1]) == len(pd.read_csv(ruta))
+
+
+def test_calculadora_con_lectores_igual_que_sin_ellos(tmp_path, archivos):
+    pytest.importorskip("pyet")
+    config = tmp_path / "lote.json"
+    config.write_text(json.dumps({"metodos": ["hargreaves", "pm_fao56"], "balance": BALANCE}))
+    opciones = ["--config", str(config), "--tamano-bloque", "50", "--z", "2640", "--lat", "4.61"]
+    assert main(archivos + opciones + ["--salida", str(tmp_path / "secuencial")]) == 0
+    assert main(archivos + opciones + ["--salida", str(tmp_path / "concurrente"), "--lectores", "3",
+                                       "--procesos", "2"]) == 0
+
+    # El balance se encadena entre bloques: solo coincide si llegan en orden
+    for ruta in archivos:
+        estacion = os.path.splitext(os.path.basename(ruta))[0]
+        for nombre in (f"{estacion}_et0.csv", f"{estacion}_balance.csv"):
+            pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "concurrente" / nombre),
+                                          pd.read_csv(tmp_path / "secuencial" / nombre))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de ET₀ en Malla Fuera de Memoria
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Cada celda de la malla debe coincidir con calcular_et0_serie aplicado a la
+serie de esa celda, con su latitud y altitud.
+
+Ejecución:
+    python -m pytest tests/test_malla_et0.py
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from control_calidad import InformeCalidad
+from malla_et0 import abrir_netcdf, abrir_npy, calcular_et0_malla
+from metodos_et import METODOS_ET
+from metricas import Metricas
+from motor_et0 import calcular_et0_serie
+from tablas_radiacion import TablaRadiacion
+
+DIAS, FILAS, COLUMNAS = 400, 5, 4
+
+
+@pytest.fixture
+def malla(tmp_path):
+    """Campos sintéticos guardados como .npy y abiertos mapeados en memoria"""
+    rng = np.random.default_rng(7)
+    forma = (DIAS, FILAS, COLUMNAS)
+    estacional = np.sin(np.arange(DIAS) * 2 * np.pi / 365)[:, None, None]
+    t_min = 8 + 6 * estacional + rng.normal(0, 2, forma)
+    campos = {
+        "t_min": t_min,
+        "t_max": t_min + rng.uniform(5, 14, forma),
+        "rh_min": rng.uniform(25, 60, forma),
+        "rh_max": rng.uniform(65, 100, forma),
+        "rs": rng.uniform(5, 28, forma),
+        "uz": rng.uniform(0.5, 5, forma),
+    }
+    rutas = {}
+    for nombre, valores in campos.items():
+        rutas[nombre] = tmp_path / f"{nombre}.npy"
+        np.save(rutas[nombre], valores)
+    return {
+        "campos": abrir_npy(rutas),
+        "latitudes": np.linspace(-35, 48, FILAS),
+        "fechas": pd.date_range("2019-11-15", periods=DIAS, freq="D"),
+        "z": rng.uniform(0, 3000, (FILAS, COLUMNAS)),
+    }
+
+
+def serie_de_celda(malla, fila, columna):
+    datos = pd.DataFrame({nombre: np.asarray(campo[:, fila, columna]) for nombre, campo in malla["campos"].items()},
+                         index=malla["fechas"])
+    return datos, float(malla["z"][fila, columna]), float(malla["latitudes"][fila])
+
+
+@pytest.mark.parametrize("tabla", [False, True])
+def test_paridad_con_la_serie_por_celda(malla, tmp_path, tabla):
+    tabla_radiacion = TablaRadiacion() if tabla else None
+    # Bloques que no dividen la malla exactamente, para probar los bordes
+    salidas, errores = calcular_et0_malla(malla["campos"], malla["latitudes"], malla["fechas"], tmp_path / "salida",
+                                          z=malla["z"], bloque=(150, 2, 3), dtype=np.float64,
+                                          tabla_radiacion=tabla_radiacion)
+    assert errores == {}
+    assert set(salidas) == set(METODOS_ET)
+    for fila, columna in [(0, 0), (2, 3), (4, 1)]:
+        datos, z, lat = serie_de_celda(malla, fila, columna)
+        referencia, _ = calcular_et0_serie(datos, z, lat, backend="numpy", tabla_radiacion=tabla_radiacion)
+        for metodo_id in METODOS_ET:
+            np.testing.assert_allclose(salidas[metodo_id][:, fila, columna], referencia[metodo_id].to_numpy(),
+                                       rtol=1e-12, err_msg=metodo_id)
+
+
+def test_salidas_en_disco(malla, tmp_path):
+    salidas, _ = calcular_et0_malla(malla["campos"], malla["latitudes"], malla["fechas"], tmp_path,
+                                    z=1000.0, metodos=["hargreaves", "pm_fao56"])
+    releido = np.load(tmp_path / "et0_pm_fao56.npy", mmap_mode="r")
+    assert releido.dtype == np.float32 and releido.shape == (DIAS, FILAS, COLUMNAS)
+    np.testing.assert_array_equal(releido, salidas["pm_fao56"])
+
+
+def test_metodo_sin_variables_no_deja_archivo(malla, tmp_path):
+    campos = {nombre: campo for nombre, campo in malla["campos"].items() if nombre != "rs"}
+    metricas = Metricas()
+    salidas, errores = calcular_et0_malla(campos, malla["latitudes"], malla["fechas"], tmp_path,
+                                          metodos=["hamon", "abtew"], bloque=(200, 5, 4), metricas=metricas)
+    assert set(salidas) == {"hamon"} and set(errores) == {"abtew"}
+    assert not (tmp_path / "et0_abtew.npy").exists()
+    assert {r["etapa"] for r in metricas.registros} == {"lectura", "validacion", "calculo"}
+
+
+def test_bloque_sin_datos_queda_en_nan(malla, tmp_path):
+    campos = {nombre: np.array(campo) for nombre, campo in malla["campos"].items()}
+    for valores in campos.values():
+        valores[:, :2, :2] = np.nan
+    salidas, errores = calcular_et0_malla(campos, malla["latitudes"], malla["fechas"], tmp_path,
+                                          metodos=["romanenko"], bloque=(DIAS, 2, 2))
+    assert errores == {}
+    assert np.isnan(salidas["romanenko"][:, :2, :2]).all()
+    assert np.isfinite(salidas["romanenko"][:, 2:, :]).all()
+
+
+def test_bloque_que_falla_queda_en_nan(malla, tmp_path):
+    # Sin humedad en las filas 0-1 (p. ej. fuera del dominio): romanenko falla solo en esos bloques
+    campos = {nombre: np.array(campo) for nombre, campo in malla["campos"].items()}
+    for nombre in ("rh_min", "rh_max"):
+        campos[nombre][:, :2, :] = np.nan
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        salidas, errores = calcular_et0_malla(campos, malla["latitudes"], malla["fechas"], tmp_path,
+                                              metodos=["romanenko", "hargreaves"], bloque=(DIAS, 2, 4))
+    assert set(salidas) == {"romanenko", "hargreaves"} and set(errores) == {"romanenko"}
+    assert errores["romanenko"] == "No hay valores de humedad relativa (todos faltan) (bloques en NaN: 1)"
+    assert np.isnan(salidas["romanenko"][:, :2, :]).all()
+    assert np.isfinite(salidas["romanenko"][:, 2:, :]).all()
+    assert np.isfinite(salidas["hargreaves"]).all()
+
+
+def test_celda_mala_se_enmascara(malla, tmp_path):
+    # Radiación en W/m² en una celda-día: sin control de calidad el bloque entero falla
+    campos = {nombre: np.array(campo) for nombre, campo in malla["campos"].items()}
+    campos["rs"][10, 1, 2] = 150.0
+    metodos = ["pm_fao56", "makkink", "hargreaves"]
+    _, errores = calcular_et0_malla(campos, malla["latitudes"], malla["fechas"], tmp_path / "sin",
+                                    z=1000.0, metodos=metodos, control_calidad=None)
+    assert set(errores) == {"pm_fao56", "makkink"}
+
+    informe = InformeCalidad()
+    salidas, errores = calcular_et0_malla(campos, malla["latitudes"], malla["fechas"], tmp_path / "con",
+                                          z=1000.0, metodos=metodos, bloque=(DIAS, 2, 4), informe_calidad=informe)
+    assert errores == {} and set(salidas) == set(metodos)
+    assert informe.filas == DIAS * FILAS * COLUMNAS and informe.conteos_reglas["radiacion_fuera_de_rango"] == 1
+    for metodo_id in ("pm_fao56", "makkink"):
+        malas = ~np.isfinite(salidas[metodo_id])
+        assert malas.sum() == 1 and malas[10, 1, 2]
+    assert np.isfinite(salidas["hargreaves"]).all()
+
+
+def test_netcdf_se_cierra_al_salir(malla, tmp_path):
+    netCDF4 = pytest.importorskip("netCDF4")
+    ruta = str(tmp_path / "malla.nc")
+    with netCDF4.Dataset(ruta, "w") as conjunto:
+        for dimension, largo in (("time", DIAS), ("latitude", FILAS), ("longitude", COLUMNAS)):
+            conjunto.createDimension(dimension, largo)
+        tiempo = conjunto.createVariable("time", "f8", ("time",))
+        tiempo.units = "days since 2019-11-15"
+        tiempo[:] = np.arange(DIAS)
+        conjunto.createVariable("latitude", "f8", ("latitude",))[:] = malla["latitudes"]
+        for nombre, campo in malla["campos"].items():
+            conjunto.createVariable(nombre, "f8", ("time", "latitude", "longitude"))[:] = campo
+
+    with abrir_netcdf(ruta) as (campos, latitudes, fechas, z):
+        salidas, errores = calcular_et0_malla(campos, latitudes, fechas, tmp_path / "salida", z=1000.0,
+                                              metodos=["hargreaves"], dtype=np.float64)
+        conjunto = campos["t_min"].group()
+    assert not conjunto.isopen() and z is None and errores == {}
+    esperado, _ = calcular_et0_malla(malla["campos"], malla["latitudes"], malla["fechas"], tmp_path / "npy",
+                                     z=1000.0, metodos=["hargreaves"], dtype=np.float64)
+    np.testing.assert_array_equal(salidas["hargreaves"], esperado["hargreaves"])
+
+
+def test_formas_incompatibles(malla, tmp_path):
+    with pytest.raises(ValueError):
+        calcular_et0_malla(malla["campos"], malla["latitudes"][:-1], malla["fechas"], tmp_path)
+    with pytest.raises(ValueError):
+        calcular_et0_malla(malla["campos"], malla["latitudes"], malla["fechas"][:-1], tmp_path)
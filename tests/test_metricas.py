@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las Métricas por Método y Etapa
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_metricas.py
+"""
+
+import csv
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricas import Metricas
+from motor_et0 import calcular_et0_serie
+
+
+@pytest.fixture
+def registro():
+    return pd.DataFrame({
+        "t_min": np.full(100, 8.0), "t_max": np.full(100, 19.0),
+        "rh_min": np.full(100, 45.0), "rh_max": np.full(100, 85.0), "uz": np.full(100, 2.1),
+    }, index=pd.date_range("2023-01-01", periods=100, freq="D"))
+
+
+def test_motor_registra_metodos_y_fallas(registro):
+    metricas = Metricas()
+    _, errores = calcular_et0_serie(registro, 2640, 4.61, ["hargreaves", "abtew"], backend="numpy",
+                                    metricas=metricas)
+    por_metodo = {r["metodo"]: r for r in metricas.registros if r["metodo"] is not None}
+    assert set(por_metodo) == {"hargreaves", "abtew"}
+    assert por_metodo["hargreaves"]["exito"] and por_metodo["hargreaves"]["filas"] == 100
+    assert not por_metodo["abtew"]["exito"]
+    assert por_metodo["abtew"]["error"] == errores["abtew"]
+    assert all(r["etapa"] == "calculo" for r in metricas.registros)
+
+
+def test_medir_registra_excepcion_y_la_propaga():
+    metricas = Metricas()
+    with pytest.raises(ZeroDivisionError):
+        with metricas.medir("exportacion", filas=3):
+            1 / 0
+    (registro,) = metricas.registros
+    assert registro["etapa"] == "exportacion" and not registro["exito"] and registro["filas"] == 3
+
+
+def test_memoria_con_tracemalloc():
+    metricas = Metricas(memoria=True)
+    with metricas.medir("calculo", "prueba"):
+        np.ones(1_000_000)
+    assert metricas.registros[0]["memoria_bytes"] >= 8_000_000
+
+
+def test_resumen_y_trazas(tmp_path, registro):
+    metricas = Metricas()
+    for _ in range(2):
+        calcular_et0_serie(registro, 2640, 4.61, ["hargreaves", "hamon"], backend="numpy", metricas=metricas)
+    resumen = {(g["etapa"], g["metodo"]): g for g in metricas.resumen()}
+    assert resumen[("calculo", "hargreaves")]["llamadas"] == 2
+    assert resumen[("calculo", "hargreaves")]["filas"] == 200
+    assert [g["metodo"] for g in metricas.metodos_mas_lentos()] != []
+
+    metricas.exportar(tmp_path / "traza.json")
+    metricas.exportar(tmp_path / "traza.csv")
+    with open(tmp_path / "traza.json", encoding="utf-8") as f:
+        assert len(json.load(f)["registros"]) == len(metricas.registros)
+    with open(tmp_path / "traza.csv", newline="", encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == len(metricas.registros)
+
+
+def test_etapa_desconocida():
+    with pytest.raises(ValueError):
+        Metricas().registrar("dibujar_graficos")
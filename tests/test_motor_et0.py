@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Motor de Cálculo por Serie
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_motor_et0.py
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from motor_et0 import calcular_et0_serie
+
+pyet = pytest.importorskip("pyet")
+
+Z, LAT = 2640.0, 4.61
+NECESITAN_RS = ["pm_fao56", "makkink", "priestley_taylor", "turc", "abtew"]
+SIN_RS = ["hargreaves", "hamon", "oudin"]
+
+
+@pytest.fixture
+def registro(crear_registro):
+    return crear_registro(semilla=5, dias=730)
+
+
+def llamadas_directas(registro):
+    """ET₀ de cada método con llamadas a pyet escritas a mano"""
+    tmax, tmin = registro["t_max"], registro["t_min"]
+    rhmax, rhmin = registro["rh_max"], registro["rh_min"]
+    rs, wind = registro["rs"], registro["uz"]
+    tmean, rh = (tmax + tmin) / 2, (rhmax + rhmin) / 2
+    lat = math.radians(LAT)
+    return {
+        "pm_fao56": pyet.pm_fao56(tmean, wind, rs=rs, rhmax=rhmax, rhmin=rhmin, elevation=Z, lat=lat,
+                                  tmax=tmax, tmin=tmin),
+        "makkink": pyet.makkink(tmean, rs, elevation=Z),
+        "priestley_taylor": pyet.priestley_taylor(tmean, rs=rs, elevation=Z, lat=lat, tmax=tmax, tmin=tmin,
+                                                  rhmax=rhmax, rhmin=rhmin),
+        "turc": pyet.turc(tmean, rs, rh),
+        "abtew": pyet.abtew(tmean, rs),
+        "hargreaves": pyet.hargreaves(tmean, tmax, tmin, lat),
+        "hamon": pyet.hamon(tmean, lat),
+        "oudin": pyet.oudin(tmean, lat),
+    }
+
+
+@pytest.mark.parametrize("backend", ["pyet", "auto"])
+def test_serie_igual_a_pyet_directo(registro, backend):
+    metodos = NECESITAN_RS + SIN_RS
+    resultados, errores = calcular_et0_serie(registro, Z, LAT, metodos, backend=backend)
+    assert errores == {}
+    assert list(resultados.columns) == metodos and resultados.index.equals(registro.index)
+    for metodo_id, esperado in llamadas_directas(registro).items():
+        np.testing.assert_allclose(resultados[metodo_id].to_numpy(), esperado.to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-12, err_msg=metodo_id)
+
+
+@pytest.mark.parametrize("backend", ["pyet", "numpy", "auto"])
+def test_errores_de_metodos_sin_entradas(registro, backend):
+    metodos = NECESITAN_RS + SIN_RS
+    resultados, errores = calcular_et0_serie(registro.drop(columns="rs"), Z, LAT, metodos, backend=backend)
+    assert errores == {metodo_id: "Faltan variables: rs" for metodo_id in NECESITAN_RS}
+    assert list(resultados.columns) == SIN_RS and resultados.notna().all().all()
+
+    # Sin latitud fallan también los de temperatura (hargreaves, hamon, oudin)
+    _, errores = calcular_et0_serie(registro.drop(columns="rs"), Z, None, metodos, backend=backend)
+    assert set(errores) == set(metodos)
+    assert errores["hamon"] == "Faltan variables: lat" and errores["pm_fao56"] == "Faltan variables: rs, lat"
+
+
+def test_errores_de_pyet_no_detienen_la_serie(registro):
+    class PyetConFallas:
+        def __getattr__(self, nombre):
+            if nombre == "hamon":
+                def falla(*args, **kwargs):
+                    raise ValueError("hamon no disponible")
+                return falla
+            if nombre == "oudin":
+                return lambda *args, **kwargs: None
+            return getattr(pyet, nombre)
+
+    resultados, errores = calcular_et0_serie(registro, Z, LAT, SIN_RS, pyet=PyetConFallas(), backend="pyet")
+    assert errores == {"hamon": "hamon no disponible", "oudin": "Resultado None"}
+    assert list(resultados.columns) == ["hargreaves"]
+    np.testing.assert_allclose(resultados["hargreaves"].to_numpy(),
+                               llamadas_directas(registro)["hargreaves"].to_numpy(dtype=float), rtol=1e-9)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paridad de los Núcleos NumPy con PyET
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Compara cada método de METODOS_ET calculado con nucleos_numpy contra pyet
+en los 4 climas de referencia de README_TEST_SUITE.md (un día) y en una
+serie de varios años que recorre todos los días del año y todos los meses.
+
+Ejecución:
+    python -m pytest tests/test_paridad_numpy.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metodos_et import METODOS_ET
+from motor_et0 import calcular_et0_serie
+from nucleos_numpy import NUCLEOS
+
+pyet = pytest.importorskip("pyet")
+
+TOLERANCIA_RELATIVA = 1e-9
+
+# Climas de referencia (README_TEST_SUITE.md)
+CLIMAS = {
+    "tropical_humedo": {"tmin": 22, "tmax": 32, "rhmin": 70, "rhmax": 95, "rs": 19.2, "wind": 1.5,
+                        "elevation": 150, "lat": -3.13},
+    "templado_continental": {"tmin": 8, "tmax": 19, "rhmin": 45, "rhmax": 85, "rs": 18.5, "wind": 2.1,
+                             "elevation": 2640, "lat": 4.61},
+    "arido_caliente": {"tmin": 12, "tmax": 28, "rhmin": 15, "rhmax": 35, "rs": 28.3, "wind": 3.5,
+                       "elevation": 2300, "lat": -24.5},
+    "mediterraneo": {"tmin": 15, "tmax": 30, "rhmin": 40, "rhmax": 70, "rs": 22.1, "wind": 2.8,
+                     "elevation": 20, "lat": 39.47},
+}
+
+
+def registro_clima(clima, dias=1):
+    """Registro de 'dias' días con los valores del clima en todas las filas"""
+    valores = CLIMAS[clima]
+    return pd.DataFrame({
+        "t_min": valores["tmin"], "t_max": valores["tmax"],
+        "rh_min": valores["rhmin"], "rh_max": valores["rhmax"],
+        "rs": valores["rs"], "uz": valores["wind"],
+    }, index=pd.date_range("2023-01-01", periods=dias, freq="D"), dtype=float)
+
+
+def registro_variable(dias=3 * 366, semilla=0):
+    """Serie sintética con variación diaria, un NaN y un día sin viento"""
+    rng = np.random.default_rng(semilla)
+    t_min = rng.uniform(-5, 22, dias)
+    datos = pd.DataFrame({
+        "t_min": t_min,
+        "t_max": t_min + rng.uniform(2, 15, dias),
+        "rh_min": rng.uniform(10, 70, dias),
+        "rh_max": rng.uniform(70, 100, dias),
+        "rs": rng.uniform(2, 30, dias),
+        "uz": rng.uniform(0, 6, dias),
+    }, index=pd.date_range("2019-06-01", periods=dias, freq="D"))
+    datos.iloc[5, 0] = np.nan
+    datos.iloc[7, 5] = 0.0
+    return datos
+
+
+def comparar(datos, z, lat):
+    referencia, errores_ref = calcular_et0_serie(datos, z, lat, backend="pyet")
+    nucleos, errores_np = calcular_et0_serie(datos, z, lat, backend="numpy")
+    assert errores_ref == {}
+    assert errores_np == {}
+    assert list(nucleos.columns) == list(referencia.columns)
+    return referencia, nucleos
+
+
+def test_todos_los_metodos_tienen_nucleo():
+    assert set(NUCLEOS) == set(METODOS_ET)
+
+
+@pytest.mark.parametrize("clima", list(CLIMAS))
+def test_paridad_climas_de_referencia(clima):
+    valores = CLIMAS[clima]
+    referencia, nucleos = comparar(registro_clima(clima), valores["elevation"], valores["lat"])
+    for metodo_id in METODOS_ET:
+        np.testing.assert_allclose(nucleos[metodo_id], referencia[metodo_id],
+                                   rtol=TOLERANCIA_RELATIVA, err_msg=f"{clima}: {metodo_id}")
+
+
+@pytest.mark.parametrize("lat", [-24.5, 4.61, 39.47, 60.0])
+def test_paridad_serie_multianual(lat):
+    referencia, nucleos = comparar(registro_variable(), 150, lat)
+    for metodo_id in METODOS_ET:
+        np.testing.assert_allclose(nucleos[metodo_id], referencia[metodo_id],
+                                   rtol=TOLERANCIA_RELATIVA, equal_nan=True, err_msg=f"lat {lat}: {metodo_id}")
+
+
+def test_priestley_taylor_sin_humedad():
+    datos = registro_clima("mediterraneo", dias=30).drop(columns=["rh_min", "rh_max"])
+    referencia, _ = calcular_et0_serie(datos, 20, 39.47, ["priestley_taylor"], backend="pyet")
+    nucleos, _ = calcular_et0_serie(datos, 20, 39.47, ["priestley_taylor"], backend="numpy")
+    np.testing.assert_allclose(nucleos["priestley_taylor"], referencia["priestley_taylor"],
+                               rtol=TOLERANCIA_RELATIVA)
+
+
+def test_errores_por_variable_faltante():
+    datos = registro_clima("tropical_humedo").drop(columns=["rs"])
+    _, errores_ref = calcular_et0_serie(datos, 150, -3.13, ["abtew", "hargreaves"], backend="pyet")
+    resultados, errores_np = calcular_et0_serie(datos, 150, -3.13, ["abtew", "hargreaves"], backend="numpy")
+    assert set(errores_np) == set(errores_ref) == {"abtew"}
+    assert list(resultados.columns) == ["hargreaves"]
+
+
+def test_backend_desconocido():
+    with pytest.raises(ValueError):
+        calcular_et0_serie(registro_clima("tropical_humedo"), 150, -3.13, backend="fortran")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Planificador de Cálculo
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_planificador.py
+"""
+
+import pytest
+
+from metodos_et import METODOS_ET
+from motor_et0 import CacheIntermedios, calcular_et0_serie, preparar_argumentos
+from planificador import GRAFO_DERIVADAS, planificar
+
+COLUMNAS = ["t_min", "t_max", "rh_min", "rh_max", "rs", "uz"]
+SOLO_TEMPERATURA = ["hargreaves", "mcguinness_bordne", "hamon", "oudin", "blaney_criddle"]
+
+
+@pytest.fixture
+def registro(crear_registro):
+    return crear_registro(semilla=21, dias=120)
+
+
+def test_plan_completo_en_orden_topologico():
+    plan = planificar(COLUMNAS, z=2640, lat=4.61)
+    assert plan.ejecutables == list(METODOS_ET) and plan.omitidos == {}
+    posicion = {nodo: i for i, nodo in enumerate(plan.nodos)}
+    for nodo in plan.nodos:
+        for dependencia in GRAFO_DERIVADAS[nodo][0]:
+            if dependencia != nodo and dependencia in GRAFO_DERIVADAS:
+                assert posicion[dependencia] < posicion[nodo]
+
+
+def test_plan_con_entradas_parciales():
+    plan = planificar(["t_min", "t_max"], lat=4.61)
+    assert plan.ejecutables == SOLO_TEMPERATURA
+    assert plan.omitidos["linacre"] == ["z"]
+    assert plan.omitidos["pm_fao56"] == ["rh_min", "rh_max", "rs", "uz", "z"]
+    assert set(plan.nodos) == {"tmax", "tmin", "tmean", "lat", "lat_rad"}
+
+    # Sin rh_max, Priestley-Taylor corre con su llamada de respaldo (sin Rn compartida)
+    plan = planificar(["t_min", "t_max", "rh_min", "rs"], ["priestley_taylor", "haude"], z=2640, lat=4.61)
+    assert plan.ejecutables == ["priestley_taylor", "haude"]
+    assert "rn" not in plan.nodos and plan.nodos_de(["haude"]) == ["tmax", "rh"]
+
+
+def test_metodos_sin_entradas_no_se_llaman(registro):
+    pytest.importorskip("pyet")
+    import pyet
+
+    class PyetEspia:
+        def __init__(self):
+            self.funciones = []
+
+        def __getattr__(self, nombre):
+            self.funciones.append(nombre)
+            return getattr(pyet, nombre)
+
+    espia = PyetEspia()
+    datos = registro[["t_min", "t_max"]]
+    resultados, errores = calcular_et0_serie(datos, None, 4.61, backend="pyet", pyet=espia)
+    assert list(resultados.columns) == SOLO_TEMPERATURA
+    assert set(espia.funciones) == set(SOLO_TEMPERATURA)
+    assert errores["abtew"] == "Faltan variables: rs"
+
+
+def test_cada_nodo_una_vez_por_bloque(registro, monkeypatch):
+    pytest.importorskip("pyet")
+    llamadas = []
+    original = CacheIntermedios._calcular_ea
+    monkeypatch.setattr(CacheIntermedios, "_calcular_ea", lambda self: llamadas.append(1) or original(self))
+
+    metodos = ["pm_fao56", "penman", "pm", "pm_asce", "kimberly_penman", "thom_oliver"]
+    _, errores = calcular_et0_serie(registro, 2640, 4.61, metodos, backend="pyet")
+    assert errores == {} and len(llamadas) == 1
+
+
+def test_argumentos_solo_de_los_nodos_pedidos(registro):
+    plan = planificar(registro.columns, ["hamon"], lat=4.61)
+    argumentos = preparar_argumentos(registro, 2640, 4.61, plan.nodos_de(["hamon"]))
+    assert set(argumentos) == {"tmax", "tmin", "tmean", "lat", "lat_rad"}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Registro de Métodos pyet
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_registro_metodos.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pyet = pytest.importorskip("pyet")
+
+import motor_et0
+from metodos_et import METODOS_ET
+from motor_et0 import CacheIntermedios, calcular_et0_serie, ejecutar_metodo, preparar_argumentos
+from registro_metodos import REGISTRO, RegistroMetodos
+
+
+@pytest.fixture
+def registro(crear_registro):
+    return crear_registro(semilla=8, dias=200)
+
+
+def test_llamadas_iguales_a_pyet_directo(registro):
+    arg = preparar_argumentos(registro, 2640, 4.61)
+    intermedios = CacheIntermedios(arg, pyet)
+
+    esperado = pyet.pm_asce(tmean=arg["tmean"], wind=arg["wind"], rs=arg["rs"], rhmax=arg["rhmax"],
+                            rhmin=arg["rhmin"], elevation=2640, lat=arg["lat_rad"], tmax=arg["tmax"],
+                            tmin=arg["tmin"], etype="os")
+    pd.testing.assert_series_equal(ejecutar_metodo("pm_asce", arg, pyet, intermedios), esperado)
+
+    esperado = pyet.hargreaves(tmin=arg["tmin"], tmax=arg["tmax"], tmean=arg["tmean"], lat=arg["lat_rad"])
+    pd.testing.assert_series_equal(ejecutar_metodo("hargreaves", arg, pyet), esperado)
+
+
+def test_variantes_segun_variables_disponibles(registro):
+    # Sin rh_max, Priestley-Taylor usa el respaldo con humedad fija
+    arg = preparar_argumentos(registro.drop(columns="rh_max"), 2640, 4.61)
+    enlace = REGISTRO.enlace("priestley_taylor", arg, pyet)
+    assert enlace.constantes == {"rh": 65.0} and enlace.intermedios == ()
+
+    # Haude toma tmean de la temperatura máxima
+    arg = preparar_argumentos(registro[["t_max", "rh_min"]])
+    assert dict(REGISTRO.enlace("haude", arg, pyet).pares)["tmean"] == "tmax"
+
+    with pytest.raises(KeyError, match="rs"):
+        ejecutar_metodo("abtew", arg, pyet)
+
+
+def test_enlace_se_resuelve_una_vez(registro):
+    arg = preparar_argumentos(registro, 2640, 4.61)
+    assert REGISTRO.enlace("pm_fao56", arg, pyet) is REGISTRO.enlace("pm_fao56", dict(arg), pyet)
+
+
+def test_metodo_nuevo_sin_editar_el_motor(registro, monkeypatch):
+    metodos = dict(METODOS_ET)
+    registro_prueba = RegistroMetodos(metodos)
+    registro_prueba.registrar("hargreaves_k", {
+        "nombre": "Hargreaves (k doble)", "funcion": "hargreaves",
+        "requerimientos": ["t_min", "t_max", "lat"],
+        "parametros_pyet": ["tmean", "tmax", "tmin", "lat"],
+        "constantes_pyet": {"k": 0.027},
+    })
+    assert "hargreaves_k" in metodos and "hargreaves_k" not in METODOS_ET
+    monkeypatch.setattr(motor_et0, "REGISTRO", registro_prueba)
+
+    resultados, errores = calcular_et0_serie(registro, 2640, 4.61, ["hargreaves", "hargreaves_k"], backend="pyet")
+    assert errores == {}
+    np.testing.assert_allclose(resultados["hargreaves_k"], resultados["hargreaves"] * 2)
+
+
+def test_descripcion_invalida():
+    with pytest.raises(ValueError, match="intermedios"):
+        RegistroMetodos({"x": {"funcion": "abtew", "parametros_pyet": ["tmean"], "intermedios_pyet": ["g"]}})
+    with pytest.raises(ValueError, match="variables desconocidas"):
+        RegistroMetodos({"x": {"funcion": "abtew", "parametros_pyet": ["radiacion"]}})
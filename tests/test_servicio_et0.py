@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas del Servicio Local de ET₀ y Balance Hídrico
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+Ejecución:
+    python -m pytest tests/test_servicio_et0.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+pyet = pytest.importorskip("pyet")
+
+from balance_hidrico import balance_puntual
+from metodos_et import METODOS_ET
+from motor_et0 import VARIABLES_SERIE, CacheIntermedios, ejecutar_metodo, preparar_argumentos
+import servicio_et0
+from servicio_et0 import ClienteHTTP, ClienteLocal, ErrorServicio, ServicioET0, ServidorET0
+
+VALORES = {"t_min": 12.0, "t_max": 24.0, "rh_min": 45.0, "rh_max": 88.0, "rs": 18.0, "uz": 2.1,
+           "z": 2640.0, "lat": 4.61}
+BALANCE = {"et0": 4.0, "kc": 1.1, "precipitacion": 1.0, "humedad_actual": 0.22, "humedad_cc": 0.35,
+           "humedad_pmp": 0.15, "humedad_riego": 0.25, "profundidad_radicular": 40}
+
+
+@pytest.fixture
+def servicio():
+    servicio = ServicioET0(espera_s=0.05)
+    yield servicio
+    servicio.cerrar()
+
+
+def test_igual_al_calculo_puntual_de_la_calculadora(servicio):
+    # Como preparar_intermedios + calcular_metodo_individual de la ventana
+    datos = pd.DataFrame({var: [VALORES[var]] for var in VARIABLES_SERIE})
+    argumentos = preparar_argumentos(datos, VALORES["z"], VALORES["lat"])
+    intermedios = CacheIntermedios(argumentos, pyet)
+    esperado = {metodo_id: round(ejecutar_metodo(metodo_id, argumentos, pyet, intermedios).iloc[0], 3)
+                for metodo_id in METODOS_ET}
+
+    respuesta = ClienteLocal(servicio).et0(VALORES)
+    assert respuesta == {"resultados": esperado, "errores": {}}
+
+
+def test_consultas_concurrentes_en_micro_lotes(servicio):
+    cliente = ClienteLocal(servicio)
+    consultas = [({**VALORES, "t_max": 20.0 + i % 7, "lat": 4.61 if i % 2 else -12.0}, ["pm_fao56", "hargreaves"])
+                 for i in range(40)]
+    with ThreadPoolExecutor(max_workers=20) as ejecutor:
+        respuestas = list(ejecutor.map(lambda consulta: cliente.et0(*consulta), consultas))
+
+    assert servicio.lotes_et0.consultas == 40 and servicio.lotes_et0.lotes < 40
+    # Cada consulta recibe lo mismo que si llegara sola (dos estaciones en el mismo lote)
+    solo = ClienteLocal(ServicioET0(max_lote=1))
+    for consulta, respuesta in zip(consultas[:6], respuestas[:6]):
+        assert respuesta == solo.et0(*consulta)
+    assert respuestas[0]["resultados"]["hargreaves"] != respuestas[1]["resultados"]["hargreaves"]
+
+
+# Una consulta buena y una mala en el mismo lote; aislar=False desactiva el apartado previo
+# de las consultas que fallarían las revisiones de pyet sobre el arreglo completo
+@pytest.mark.parametrize("mala, metodos, aislar", [
+    ({"rs": 150.0}, ["makkink", "hargreaves"], True),
+    ({"rs": 150.0}, ["makkink", "hargreaves"], False),     # la falla del grupo se repite consulta por consulta
+    ({"rh_min": 0.3, "rh_max": 0.5}, ["pm_fao56", "hargreaves"], True),   # en grupo, la otra ocultaría la falla
+])
+def test_consulta_mala_no_afecta_a_su_lote(servicio, monkeypatch, mala, metodos, aislar):
+    # La ruta la rechaza con el mensaje del control de calidad...
+    with pytest.raises(ErrorServicio) as error:
+        ClienteLocal(servicio).et0({**VALORES, **mala}, metodos)
+    assert error.value.estado == 400
+
+    # ...y si llega a un lote por otra vía, no cambia lo que recibe la otra consulta
+    if not aislar:
+        monkeypatch.setattr(servicio_et0, "_falla_revision_de_arreglo", lambda valores: False)
+    fecha = pd.Timestamp(servicio_et0.FECHA_DEFECTO)
+    consultas = [{"valores": valores, "metodos": metodos, "fecha": fecha} for valores in (VALORES, {**VALORES, **mala})]
+    buena, respuesta_mala = servicio._lote_et0(consultas)
+    assert buena == servicio._lote_et0(consultas[:1])[0] and list(buena["resultados"]) == metodos
+    assert respuesta_mala == servicio._lote_et0(consultas[1:])[0]
+    assert list(respuesta_mala["errores"]) == metodos[:1] and list(respuesta_mala["resultados"]) == ["hargreaves"]
+
+
+def test_consultas_invalidas(servicio):
+    cliente = ClienteLocal(servicio)
+    with pytest.raises(ErrorServicio, match="temperatura mínima") as error:
+        cliente.et0({**VALORES, "t_min": 30.0})
+    assert error.value.estado == 400
+    with pytest.raises(ErrorServicio, match="Métodos desconocidos"):
+        cliente.et0(VALORES, ["no_existe"])
+    with pytest.raises(ErrorServicio, match="PMP"):
+        cliente.balance(**{**BALANCE, "humedad_pmp": 0.4})
+    assert servicio.atender("GET", "/no_existe")[0] == 404
+
+    # Sin radiación: los métodos que la necesitan quedan en errores, como en el motor
+    respuesta = cliente.et0({nombre: valor for nombre, valor in VALORES.items() if nombre != "rs"},
+                            ["hargreaves", "abtew"])
+    assert list(respuesta["resultados"]) == ["hargreaves"] and respuesta["errores"]["abtew"] == "Faltan variables: rs"
+
+
+def test_balance(servicio):
+    respuesta = ClienteLocal(servicio).balance(**BALANCE)
+    esperado = balance_puntual(**BALANCE)
+    assert respuesta["necesita_riego"] is True
+    assert respuesta["lamina_riego"] == pytest.approx(esperado["lamina_neta"]) == pytest.approx(40.0)
+    assert respuesta["etc"] == pytest.approx(4.4)
+
+
+def test_servidor_http():
+    with ServidorET0(ServicioET0(), puerto=0) as servidor:
+        cliente = ClienteHTTP(servidor.url)
+        assert cliente.salud()["estado"] == "ok"
+        assert cliente.et0(VALORES, ["hargreaves"]) == ClienteLocal(servidor.servicio).et0(VALORES, ["hargreaves"])
+        with pytest.raises(ErrorServicio) as error:
+            cliente.et0({**VALORES, "rs": -1.0})
+        assert error.value.estado == 400
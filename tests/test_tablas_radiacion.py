@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las Tablas Precalculadas de Radiación Extraterrestre
+PyET Suite - Pruebas
+
+Autor: Miguel Alejandro Bermúdez Claros
+Contacto: mibermudezc@unal.edu.co
+Institución: Universidad Nacional de Colombia
+
+La interpolación de TablaRadiacion debe seguir a las ecuaciones exactas en
+latitudes al azar (no solo en los puntos medios de la malla), y el perfil
+anual de una latitud debe ser el exacto.
+
+Ejecución:
+    python -m pytest tests/test_tablas_radiacion.py
+"""
+
+import numpy as np
+import pytest
+
+from tablas_radiacion import DIAS_ANIO, TablaRadiacion, _ra_n_exactos, perfil_anual
+
+
+@pytest.mark.parametrize("paso, lat_min, lat_max", [(0.25, -90.0, 90.0), (0.25, -60.0, 60.0), (1.0, -30.0, 30.0),
+                                                     (0.5, 10.0, 12.0)])
+def test_interpolacion_cerca_de_lo_exacto(paso, lat_min, lat_max):
+    tabla = TablaRadiacion(paso, lat_min, lat_max)
+    rng = np.random.default_rng(7)
+    latitudes = rng.uniform(lat_min, lat_max, 20_000)
+    dias = rng.integers(1, DIAS_ANIO + 1, 20_000)
+    ra, n = _ra_n_exactos(np.radians(latitudes), dias)
+
+    # Las cotas incluyen el redondeo a float32 de las tablas
+    assert np.max(np.abs(tabla.ra(latitudes, dias) - ra)) <= tabla.cota_error_ra
+    assert np.max(np.abs(tabla.n(latitudes, dias) - n)) <= tabla.cota_error_n
+    # En los nodos de la malla solo queda el redondeo a float32
+    np.testing.assert_allclose(tabla.ra(tabla.latitudes[:, None], np.arange(1, DIAS_ANIO + 1)),
+                               _ra_n_exactos(np.radians(tabla.latitudes)[:, None], np.arange(1, DIAS_ANIO + 1))[0],
+                               rtol=1e-6, atol=1e-5)
+
+
+def test_perfil_anual_exacto():
+    ra, n = perfil_anual(4.61)
+    ra_exacta, n_exacta = _ra_n_exactos(np.radians(4.61), np.arange(1, DIAS_ANIO + 1))
+    np.testing.assert_array_equal(ra, ra_exacta)
+    np.testing.assert_array_equal(n, n_exacta)
+    assert not ra.flags.writeable and perfil_anual(4.61) is perfil_anual(4.61)
+
+
+def test_latitud_fuera_de_la_tabla():
+    tabla = TablaRadiacion(1.0, -30.0, 30.0)
+    with pytest.raises(ValueError, match="fuera de la tabla"):
+        tabla.ra([10.0, 31.0], [1, 2])
+    with pytest.raises(ValueError):
+        TablaRadiacion(paso_grados=0)